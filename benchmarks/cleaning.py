@@ -0,0 +1,106 @@
+"""Бенчмарк очистки текста страниц от серверного кода.
+
+Сравнивает TextCleaner с прежним последовательным применением всех правил
+на тексте размером в несколько мегабайт: с серверным кодом и без него.
+
+Запуск:
+    python -m benchmarks.cleaning [--dump page.txt] [--size-mb 4] [--repeat 5]
+"""
+
+import argparse
+import logging
+import re
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from website_seo_scanner.cleaners import RULE_FLAGS, remove_server_code
+
+# Обычный текст страницы
+PROSE_SAMPLE = (
+    "Наша компания предлагает широкий ассортимент товаров для дома и офиса. "
+    "Доставка по всей России, гарантия качества и лучшие цены. Подробнее [в каталоге].\n"
+) * 20
+# Фрагмент выгрузки страницы с серверным кодом
+SERVER_CODE_SAMPLE = (
+    "Каталог товаров\xa0и услуг. Доставка по всей России, оплата при получении.\n"
+    "Array( [ID] => 15 [NAME] => Товар ) $arResult->GetNext() [LINK]\n"
+    "[PRICE] => 1500 руб.\n"
+    "https://example.ru/catalog/?id=1&utm_source=yandex&utm_medium=cpc\n"
+    "Наши преимущества: быстрая доставка, гарантия качества, скидки постоянным клиентам.\n"
+)
+# Короткие тексты, на которых результат обязан совпадать с прежней реализацией
+EQUIVALENCE_SAMPLES: tuple[str, ...] = (
+    "x&UTM_source=a y",
+    "x&utm_source=a y",
+    "ARRAY( [ID] => 1 ) текст",
+    "$Var->Method() [Link]",
+    "[KEY] => value\nтекст",
+    "текст\xa0без кода",
+)
+
+# Правила прежней реализации
+SEQUENTIAL_RULES = (
+    r"Array\s*\(\s*\[.*?\]\s*=>\s*[^)]+\)",
+    r"\[\w+\]\s*=>\s*[^\n\r]*",
+    r"\[[\w_]+\]",
+    r"\$[a-zA-Z_]\w*",
+    r"->\s*\w+",
+    r"&utm_[^&\s]+",
+    r"\xa0",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def remove_server_code_sequential(text: str) -> str:
+    """Прежняя реализация: отдельный проход по тексту для каждого правила"""
+    for pattern in SEQUENTIAL_RULES:
+        text = re.sub(pattern, "", text, flags=RULE_FLAGS)
+    return text.strip()
+
+
+def measure(cleaner: Callable[[str], str], text: str, repeat: int) -> float:
+    """Медианная пропускная способность очистки в МБ/с"""
+    timings: list[float] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        cleaner(text)
+        timings.append(time.perf_counter() - started_at)
+    return len(text.encode()) / 1024 / 1024 / statistics.median(timings)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Бенчмарк очистки текста")
+    parser.add_argument("--dump", type=Path, default=None, help="Текстовая выгрузка страниц")
+    parser.add_argument("--size-mb", type=float, default=4, help="Размер синтетического текста")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество замеров")
+    args = parser.parse_args()
+    if args.dump is not None:
+        texts = {args.dump.name: args.dump.read_text(encoding="utf-8")}
+    else:
+        texts = {
+            name: sample * int(args.size_mb * 1024 * 1024 / len(sample.encode()))
+            for name, sample in (
+                ("prose", PROSE_SAMPLE), ("server code", PROSE_SAMPLE + SERVER_CODE_SAMPLE)
+            )
+        }
+    for sample in EQUIVALENCE_SAMPLES:
+        if remove_server_code(sample) != remove_server_code_sequential(sample):
+            logger.warning("%r: cleaning results differ from sequential cleaning", sample)
+    for name, text in texts.items():
+        if remove_server_code(text) != remove_server_code_sequential(text):
+            logger.warning("%s: cleaning results differ from sequential cleaning", name)
+        logger.info(
+            "%s (%.1f MB): sequential %.1f MB/s, cleaner %.1f MB/s",
+            name,
+            len(text.encode()) / 1024 / 1024,
+            measure(remove_server_code_sequential, text, args.repeat),
+            measure(remove_server_code, text, args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
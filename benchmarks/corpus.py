@@ -0,0 +1,184 @@
+"""Корпус сайтов для офлайн бенчмарков.
+
+Сайт корпуса - каталог с sitemap.xml, robots.txt и HTML разметкой страниц
+в pages/<путь>/index.html. Адрес сайта в файлах заменён меткой ORIGIN_PLACEHOLDER,
+которую локальный сервер подставляет при выдаче.
+
+Запуск:
+    python -m benchmarks.corpus generate benchmarks/fixtures/synthetic [--pages 60]
+    python -m benchmarks.corpus record https://example.ru benchmarks/fixtures/example
+"""
+
+import argparse
+import logging
+import random
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import httpx
+
+# Метка адреса сайта в файлах корпуса
+ORIGIN_PLACEHOLDER = "{{origin}}"
+# Адрес, подставляемый вместо метки при чтении страниц без сервера
+OFFLINE_ORIGIN = "http://site.test"
+# Разделы синтетического сайта, часть совпадает с приоритетными сегментами дерева
+SECTIONS: tuple[str, ...] = (
+    "catalog", "services", "blog", "news", "about", "contacts", "price", "cases", "docs",
+)
+WORDS: tuple[str, ...] = (
+    "доставка", "диван", "кресло", "мебель", "гарантия", "качество", "каталог", "цена",
+    "заказ", "скидка", "материал", "ткань", "кожа", "дерево", "производство", "мастерская",
+    "дизайн", "интерьер", "комната", "гостиная", "спальня", "кухня", "офис", "клиент",
+    "консультация", "сборка", "монтаж", "подбор", "размер", "цвет", "модель", "коллекция",
+    "наличие", "склад", "магазин", "оплата", "рассрочка", "возврат", "отзыв", "проект",
+)
+# Сегменты URL адресов вложенных страниц
+SLUGS: tuple[str, ...] = (
+    "sofa", "chair", "table", "delivery", "warranty", "design", "office", "kitchen", "sale",
+)
+RANDOM_SEED = 42
+# Доля изображений без атрибута alt
+MISSING_ALT_RATE = 0.3
+
+logger = logging.getLogger(__name__)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(6, 14))
+    return " ".join(words).capitalize() + "."
+
+
+def _render_page(rng: random.Random, path: str, links: list[str]) -> str:
+    title = " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize()
+    navigation = "".join(
+        f'<li><a href="{ORIGIN_PLACEHOLDER}/{link}/">{link}</a></li>' for link in links
+    )
+    sections = []
+    for _ in range(rng.randint(2, 5)):
+        paragraphs = "".join(
+            f"<p>{' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))}</p>"
+            for _ in range(rng.randint(1, 4))
+        )
+        items = "".join(f"<li>{_sentence(rng)}</li>" for _ in range(rng.randint(0, 5)))
+        image_alt = f' alt="{rng.choice(WORDS)}"' if rng.random() > MISSING_ALT_RATE else ""
+        sections.append(
+            f"<section><h2>{_sentence(rng)}</h2>{paragraphs}<ul>{items}</ul>"
+            f'<img src="/images/{rng.randint(1, 99)}.jpg"{image_alt}></section>'
+        )
+    return (
+        '<!DOCTYPE html><html lang="ru"><head><meta charset="utf-8">'
+        f"<title>{title}</title>"
+        f'<meta name="description" content="{_sentence(rng)} {_sentence(rng)}">'
+        "<script>window.dataLayer = window.dataLayer || [];</script>"
+        "<style>body { font-family: sans-serif; }</style></head><body>"
+        f"<header><nav><ul>{navigation}</ul></nav></header>"
+        f"<main><article><h1>{title}</h1>{''.join(sections)}</article></main>"
+        f"<footer><p>© {path or 'index'}. Все права защищены.</p></footer>"
+        "</body></html>"
+    )
+
+
+def _write_site(site_dir: Path, pages: dict[str, str]) -> None:
+    """Записывает страницы и sitemap.xml сайта в каталог корпуса"""
+    for path, html in pages.items():
+        page_file = site_dir / "pages" / path / "index.html"
+        page_file.parent.mkdir(parents=True, exist_ok=True)
+        page_file.write_text(html, encoding="utf-8")
+    urls = "".join(
+        f"<url><loc>{escape(f'{ORIGIN_PLACEHOLDER}/{path}/'.replace('//', '/'))}</loc></url>"
+        for path in pages
+    )
+    (site_dir / "sitemap.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>',
+        encoding="utf-8",
+    )
+    (site_dir / "robots.txt").write_text(
+        f"User-agent: *\nAllow: /\nSitemap: {ORIGIN_PLACEHOLDER}/sitemap.xml\n", encoding="utf-8"
+    )
+
+
+def generate_site(site_dir: Path, pages: int = 60, seed: int = RANDOM_SEED) -> Path:
+    """Генерирует детерминированный синтетический сайт с разделами и вложенными страницами.
+
+    :param site_dir: Каталог сайта корпуса.
+    :param pages: Количество страниц.
+    :param seed: Зерно генератора случайных чисел.
+    :return Каталог сайта.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    paths = [""]
+    while len(paths) < pages:
+        section = rng.choice(SECTIONS)
+        depth = rng.randint(1, 3)
+        paths.append("/".join([section, *(rng.choice(SLUGS) for _ in range(depth - 1))]))
+        paths[-1] += f"-{len(paths)}" if depth > 1 else ""
+    paths = list(dict.fromkeys(paths))
+    _write_site(site_dir, {path: _render_page(rng, path, list(SECTIONS)) for path in paths})
+    return site_dir
+
+
+def record_site(url: str, site_dir: Path, max_pages: int = 100) -> Path:
+    """Записывает страницы живого сайта из его sitemap.xml в корпус.
+
+    :param url: URL адрес сайта.
+    :param site_dir: Каталог сайта корпуса.
+    :param max_pages: Максимальное количество записываемых страниц.
+    :return Каталог сайта.
+    """
+    from pydantic import HttpUrl  # noqa: PLC0415
+
+    from website_seo_scanner.tree import build_site_tree  # noqa: PLC0415
+
+    origin = url.rstrip("/")
+    tree = build_site_tree(HttpUrl(url))
+    pages: dict[str, str] = {}
+    with httpx.Client(follow_redirects=True, timeout=30) as client:
+        for node in tree.iter_nodes():
+            if len(pages) >= max_pages:
+                break
+            page_url = str(node.url)
+            if not page_url.startswith(origin):
+                continue
+            response = client.get(page_url)
+            if response.is_success and "html" in response.headers.get("content-type", ""):
+                path = page_url.removeprefix(origin).strip("/")
+                pages[path] = response.text.replace(origin, ORIGIN_PLACEHOLDER)
+    _write_site(site_dir, pages)
+    logger.info("Recorded %s pages of %s", len(pages), url)
+    return site_dir
+
+
+def load_pages(site_dir: Path, origin: str = OFFLINE_ORIGIN) -> dict[str, str]:
+    """Читает HTML разметку страниц сайта корпуса.
+
+    :return Маппинг URL адреса страницы и её разметки.
+    """
+    pages: dict[str, str] = {}
+    for page_file in sorted((site_dir / "pages").rglob("index.html")):
+        path = page_file.parent.relative_to(site_dir / "pages").as_posix()
+        url = f"{origin}/" if path == "." else f"{origin}/{path}/"
+        pages[url] = page_file.read_text(encoding="utf-8").replace(ORIGIN_PLACEHOLDER, origin)
+    return pages
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Корпус сайтов для бенчмарков")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate_parser = commands.add_parser("generate", help="Сгенерировать синтетический сайт")
+    generate_parser.add_argument("site_dir", type=Path)
+    generate_parser.add_argument("--pages", type=int, default=60)
+    record_parser = commands.add_parser("record", help="Записать живой сайт")
+    record_parser.add_argument("url")
+    record_parser.add_argument("site_dir", type=Path)
+    record_parser.add_argument("--max-pages", type=int, default=100)
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate_site(args.site_dir, args.pages)
+    else:
+        record_site(args.url, args.site_dir, args.max_pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Детерминированный сервис эмбеддингов для офлайн бенчмарков"""
+
+import hashlib
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from unittest import mock
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Размерность векторов, как у небольших моделей sentence-transformers
+DIMENSIONS = 384
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Эмбеддинги по хэшам слов: близкие по словам тексты получают близкие векторы.
+    Не требует модели и сети, время векторизации пропорционально длине текстов.
+    """
+
+    def __init__(self, dimensions: int = DIMENSIONS) -> None:
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in WORD_PATTERN.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest())
+            vector[digest % self.dimensions] += 1 if digest >> 63 else -1
+        return vector.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+@contextmanager
+def mock_embeddings(embeddings: Embeddings | None = None) -> Iterator[Embeddings]:
+    """Подменяет сервис эмбеддингов NLP модуля на время блока"""
+    embeddings = embeddings or HashingEmbeddings()
+    with mock.patch("website_seo_scanner.nlp.get_embeddings", return_value=embeddings):
+        yield embeddings
@@ -0,0 +1,63 @@
+"""Бенчмарк пакетной предобработки текстов выбранным в настройках лемматизатором.
+
+Корпус - тексты страниц из NDJSON потока сканирования (записи типа "page"),
+например полученного командой `python example.py > scan.ndjson`.
+
+Запуск:
+    python -m benchmarks.preprocessing scan.ndjson [--repeat 5]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from website_seo_scanner.lemmatizers import get_lemmatizer
+from website_seo_scanner.nlp import preprocess_texts
+
+logger = logging.getLogger(__name__)
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Загружает тексты страниц из NDJSON потока сканирования"""
+    texts: list[str] = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if record.get("type") == "page":
+                texts.append(record["data"]["content"]["text"])
+    return texts
+
+
+def measure(texts: list[str]) -> tuple[float, int]:
+    """Выполняет предобработку корпуса.
+
+    :return Время обработки в секундах и количество исходных токенов.
+    """
+    started_at = time.perf_counter()
+    preprocess_texts(texts)
+    return time.perf_counter() - started_at, sum(len(text.split()) for text in texts)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Бенчмарк предобработки текстов")
+    parser.add_argument("corpus", type=Path, help="NDJSON поток сканирования")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество замеров")
+    args = parser.parse_args()
+    texts = load_corpus(args.corpus)
+    started_at = time.perf_counter()
+    lemmatizer = get_lemmatizer()
+    logger.info("Lemmatizer %s loaded in %.2fs", type(lemmatizer).__name__,
+                time.perf_counter() - started_at)
+    cold_elapsed, tokens = measure(texts)
+    warm_elapsed = statistics.median(measure(texts)[0] for _ in range(args.repeat))
+    logger.info("Corpus: %s pages, %s tokens", len(texts), tokens)
+    logger.info("First run: %.0f tokens/sec", tokens / cold_elapsed)
+    logger.info("Warm runs: %.0f tokens/sec", tokens / warm_elapsed)
+
+
+if __name__ == "__main__":
+    main()
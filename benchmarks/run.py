@@ -0,0 +1,132 @@
+"""Офлайн бенчмарки горячих путей сканера с сохранёнными базовыми замерами.
+
+Сайт корпуса отдаётся локальным HTTP сервером, эмбеддинги вычисляются
+детерминированной заглушкой, поэтому сеть не нужна. Результаты сравниваются
+с базовыми замерами, замедление больше допуска считается регрессией.
+
+Запуск:
+    python -m benchmarks.run [--corpus benchmarks/fixtures/example] [--suite LintSuite]
+        [--repeat 5] [--baseline benchmarks/baselines/<host>.json] [--save]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .corpus import generate_site
+from .mocks import mock_embeddings
+from .server import serve_site
+from .suites import SUITES, BenchmarkContext
+
+# Каталог базовых замеров, по файлу на машину
+BASELINES_DIR = Path(__file__).parent / "baselines"
+# Допустимое замедление относительно базового замера
+DEFAULT_TOLERANCE = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+def measure(benchmark: Callable[[], int | None], repeat: int) -> float:
+    """Медианное время выполнения в секундах на единицу после прогревочного запуска"""
+    benchmark()
+    timings: list[float] = []
+    units = 1
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        units = benchmark() or 1
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) / units
+
+
+def run_suites(context: BenchmarkContext, names: list[str], repeat: int) -> dict[str, float]:
+    """Выполняет наборы бенчмарков.
+
+    :param context: Общие данные бенчмарков.
+    :param names: Имена наборов, все наборы если пусто.
+    :param repeat: Количество замеров каждого бенчмарка.
+    :return Маппинг имени бенчмарка и времени на единицу в секундах.
+    """
+    results: dict[str, float] = {}
+    for suite_class in SUITES:
+        if names and suite_class.__name__ not in names:
+            continue
+        suite = suite_class()
+        try:
+            suite.setup(context)
+        except (ImportError, LookupError) as e:
+            logger.warning("%s skipped: %s", suite_class.__name__, e)
+            continue
+        try:
+            for attribute in sorted(dir(suite)):
+                if not attribute.startswith("time_"):
+                    continue
+                name = f"{suite_class.__name__}.{attribute}"
+                results[name] = measure(getattr(suite, attribute), repeat)
+                logger.info("%-45s %10.3f ms", name, results[name] * 1000)
+        finally:
+            if hasattr(suite, "teardown"):
+                suite.teardown()
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Сравнивает замеры с базовыми и возвращает имена бенчмарков с регрессией"""
+    regressions: list[str] = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            logger.warning("%-45s regression x%.2f", name, ratio)
+        else:
+            logger.info("%-45s x%.2f", name, ratio)
+    return regressions
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Парсер sitemap и HTTP клиент логируют каждый запрос
+    logging.getLogger("usp").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Офлайн бенчмарки сканера")
+    parser.add_argument("--corpus", type=Path, default=None, help="Каталог сайта корпуса")
+    parser.add_argument("--pages", type=int, default=60, help="Страниц синтетического сайта")
+    parser.add_argument("--suite", action="append", default=[], help="Имя набора")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество замеров")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINES_DIR / f"{platform.node() or 'default'}.json",
+        help="Файл базовых замеров",
+    )
+    parser.add_argument("--save", action="store_true", help="Сохранить замеры как базовые")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        site_dir = args.corpus or generate_site(Path(temp_dir), args.pages)
+        with serve_site(site_dir) as origin, mock_embeddings():
+            results = run_suites(BenchmarkContext(site_dir, origin), args.suite, args.repeat)
+    regressions: list[str] = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["benchmarks"]
+        regressions = compare(results, baseline, args.tolerance)
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(), "benchmarks": results
+        }, indent=2), encoding="utf-8")
+        logger.info("Baseline saved to %s", args.baseline)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
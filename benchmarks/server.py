@@ -0,0 +1,63 @@
+"""Локальный HTTP сервер сайтов корпуса для офлайн бенчмарков"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from .corpus import ORIGIN_PLACEHOLDER
+
+# Типы содержимого служебных файлов сайта
+CONTENT_TYPES: dict[str, str] = {
+    "robots.txt": "text/plain; charset=utf-8",
+    "sitemap.xml": "application/xml; charset=utf-8",
+}
+
+
+class SiteRequestHandler(BaseHTTPRequestHandler):
+    """Отдаёт файлы сайта корпуса, подставляя адрес сервера вместо метки"""
+    site_dir: Path
+    origin: str
+
+    def do_GET(self) -> None:
+        path = unquote(urlparse(self.path).path).strip("/")
+        if path in CONTENT_TYPES:
+            file, content_type = self.site_dir / path, CONTENT_TYPES[path]
+        else:
+            file = self.site_dir / "pages" / path / "index.html"
+            content_type = "text/html; charset=utf-8"
+        if ".." in path or not file.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        body = file.read_text(encoding="utf-8").replace(ORIGIN_PLACEHOLDER, self.origin).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Запросы бенчмарков не логируются"""
+
+
+@contextmanager
+def serve_site(site_dir: Path) -> Iterator[str]:
+    """Запускает локальный сервер сайта корпуса на свободном порту.
+
+    :param site_dir: Каталог сайта корпуса.
+    :return Адрес сервера вида http://127.0.0.1:<port>.
+    """
+    handler = type("Handler", (SiteRequestHandler,), {"site_dir": site_dir})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    handler.origin = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield handler.origin
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,102 @@
+"""Бенчмарк времени импорта модулей сканера.
+
+Каждый модуль импортируется в чистом интерпретаторе. Бенчмарк завершается
+с ошибкой, если медианное время импорта превышает бюджет или модуль
+загружает тяжёлые NLP/ML зависимости, которые должны загружаться лениво.
+
+Запуск:
+    python -m benchmarks.startup [--repeat 5]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess  # noqa: S404
+import sys
+
+# Зависимости, которые не должны загружаться при импорте лёгких модулей
+HEAVY_MODULES: tuple[str, ...] = (
+    "nltk",
+    "sklearn",
+    "polars",
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "spacy",
+    "langchain_text_splitters",
+    "embeddings_service",
+)
+# Бюджет времени импорта модуля в секундах
+IMPORT_BUDGETS: dict[str, float] = {
+    "website_seo_scanner.tree": 1.0,
+    "website_seo_scanner.linting": 1.5,
+    "website_seo_scanner.fetching": 1.5,
+    "website_seo_scanner.services": 3.0,
+    "website_seo_scanner.api": 4.0,
+    "website_seo_scanner.mcp": 4.0,
+}
+# Скрипт, выполняемый в чистом интерпретаторе
+MEASURE_SCRIPT = """
+import importlib, json, sys, time
+started_at = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started_at
+heavy = sorted(name for name in sys.argv[2:] if name in sys.modules)
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """Импортирует модуль в отдельном процессе.
+
+    :param module: Полное имя модуля.
+    :return Время импорта в секундах и загруженные тяжёлые зависимости.
+    """
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", MEASURE_SCRIPT, module, *HEAVY_MODULES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["elapsed"], result["heavy"]
+
+
+def run(repeat: int) -> bool:
+    """Измеряет время импорта всех модулей.
+
+    :param repeat: Количество замеров каждого модуля.
+    :return True если все модули уложились в бюджет.
+    """
+    passed = True
+    for module, budget in IMPORT_BUDGETS.items():
+        measurements = [measure_import(module) for _ in range(repeat)]
+        elapsed = statistics.median(elapsed for elapsed, _ in measurements)
+        heavy = measurements[0][1]
+        ok = elapsed <= budget and not heavy
+        passed &= ok
+        logger.info(
+            "%s %-35s %.3fs (budget %.1fs)%s",
+            "OK  " if ok else "FAIL",
+            module,
+            elapsed,
+            budget,
+            f", heavy modules: {', '.join(heavy)}" if heavy else "",
+        )
+    return passed
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта модулей")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество замеров")
+    args = parser.parse_args()
+    if not run(args.repeat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
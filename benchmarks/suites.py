@@ -0,0 +1,128 @@
+"""Наборы бенчмарков горячих путей сканера в стиле asv.
+
+Набор - класс с методом setup(context), необязательным teardown() и методами time_*.
+Метод time_* может вернуть количество обработанных единиц (страниц),
+тогда время приводится к одной единице.
+Тяжёлые модули сканера импортируются в setup, поэтому набор с недоступными
+зависимостями пропускается, не мешая остальным.
+"""
+
+# ruff: noqa: PLC0415
+
+import asyncio
+from pathlib import Path
+
+from .corpus import load_pages
+
+
+class BenchmarkContext:
+    """Общие данные бенчмарков: сайт корпуса, адрес его сервера и страницы"""
+
+    def __init__(self, site_dir: Path, origin: str) -> None:
+        self.site_dir = site_dir
+        self.origin = origin
+        self.pages = load_pages(site_dir, origin)
+
+
+class TreeSuite:
+    """Построение дерева сайта по sitemap.xml и выбор ключевых страниц"""
+
+    def setup(self, context: BenchmarkContext) -> None:
+        from pydantic import HttpUrl
+
+        from website_seo_scanner.tree import build_site_tree
+
+        self.url = HttpUrl(f"{context.origin}/")
+        self.tree = build_site_tree(self.url)
+
+    def time_build_site_tree(self) -> None:
+        from website_seo_scanner.tree import build_site_tree
+
+        build_site_tree(self.url)
+
+    def time_extract_key_pages(self) -> None:
+        from website_seo_scanner.tree import PRIORITY_KEYWORDS, extract_key_pages
+
+        extract_key_pages(self.tree, list(PRIORITY_KEYWORDS), max_result=15)
+
+
+class ExtractionSuite:
+    """Извлечение основного текста из HTML разметки страниц"""
+
+    def setup(self, context: BenchmarkContext) -> None:
+        from website_seo_scanner.extraction import clear_extraction_cache, extract_content
+
+        self.clear_extraction_cache, self.extract_content = clear_extraction_cache, extract_content
+        self.pages = list(context.pages.values())
+
+    def time_extract_content(self) -> int:
+        self.clear_extraction_cache()
+        for html in self.pages:
+            self.extract_content(html)
+        return len(self.pages)
+
+
+class LintSuite:
+    """SEO линтинг HTML разметки страниц"""
+
+    def setup(self, context: BenchmarkContext) -> None:
+        from website_seo_scanner.extraction import clear_extraction_cache
+        from website_seo_scanner.linting import lint_html
+
+        self.clear_extraction_cache, self.lint_html = clear_extraction_cache, lint_html
+        self.pages = list(context.pages.values())
+
+    def time_lint_page(self) -> int:
+        self.clear_extraction_cache()
+        for html in self.pages:
+            self.lint_html(html)
+        return len(self.pages)
+
+
+class KeywordSuite:
+    """Извлечение ключевых слов и фраз из текстов страниц"""
+
+    def setup(self, context: BenchmarkContext) -> None:
+        from website_seo_scanner import nlp
+        from website_seo_scanner.extraction import extract_content
+
+        self.nlp = nlp
+        self.texts = [extract_content(html).text for html in context.pages.values()]
+        nlp.extract_keywords(self.texts[0])
+
+    def time_extract_keywords(self) -> int:
+        for text in self.texts:
+            self.nlp.extract_keywords(text)
+        return len(self.texts)
+
+    def time_extract_keyphrases(self) -> int:
+        for text in self.texts:
+            self.nlp.extract_keyphrases(text)
+        return len(self.texts)
+
+
+class ScanSuite:
+    """Сканирование сайта целиком без браузера: дерево, загрузка, линтинг и тексты"""
+
+    def setup(self, context: BenchmarkContext) -> None:
+        from pydantic import HttpUrl
+
+        from website_seo_scanner.services import get_site_pages
+
+        self.get_site_pages = get_site_pages
+        self.url = HttpUrl(f"{context.origin}/")
+        # Все замеры выполняются в одном цикле: планировщик хостов привязан к циклу
+        self.loop = asyncio.new_event_loop()
+
+    def teardown(self) -> None:
+        self.loop.close()
+
+    def time_site_scan(self) -> int:
+        from website_seo_scanner.extraction import clear_extraction_cache
+        from website_seo_scanner.fetching import FetchMode
+
+        clear_extraction_cache()
+        return len(self.loop.run_until_complete(self.get_site_pages(self.url, FetchMode.HTTP)))
+
+
+SUITES: tuple[type, ...] = (TreeSuite, ExtractionSuite, LintSuite, KeywordSuite, ScanSuite)
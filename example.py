@@ -1,14 +1,13 @@
 import asyncio
+import sys
 
-from website_seo_scanner.services import get_site_pages
+from website_seo_scanner.streaming import stream_site_scan, write_ndjson
 
 url = "https://tyumen-soft.ru/"
 
 
 async def main() -> None:
-    site_pages = await get_site_pages(url)
-    for site_page in site_pages:
-        print(site_page)
+    await write_ndjson(stream_site_scan(url), sys.stdout)
 
 
 asyncio.run(main())
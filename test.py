@@ -1,3 +1,3 @@
-from website_seo_scanner.depends import embeddings
+from website_seo_scanner.depends import get_embeddings
 
-print(embeddings.embed_documents(["Тестовые данные"]))
+print(get_embeddings().embed_documents(["Тестовые данные"]))
@@ -0,0 +1,28 @@
+import pytest
+
+from website_seo_scanner.crawler import extract_links, normalize_url
+
+PAGE_URL = "https://example.ru/catalog/"
+
+
+@pytest.mark.parametrize(
+    "href", ["http://[bad/", "http://example.ru:abc/", "http://example.ru:70000/"]
+)
+def test_normalize_url_skips_malformed_href(href: str) -> None:
+    assert normalize_url(href, PAGE_URL) is None
+
+
+def test_normalize_url_drops_default_port_and_tracking() -> None:
+    assert normalize_url(
+        "https://example.ru:443/page/?b=2&utm_source=x&a=1#top", PAGE_URL
+    ) == "https://example.ru/page/?a=1&b=2"
+
+
+def test_extract_links_skips_malformed_href() -> None:
+    html = """
+    <base href="http://[bad/">
+    <a href="http://[bad/">bad</a>
+    <a href="http://example.ru:abc/">bad port</a>
+    <a href="item/">item</a>
+    """
+    assert extract_links(html, PAGE_URL) == ["https://example.ru/catalog/item/"]
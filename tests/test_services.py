@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+from pydantic import HttpUrl
+
+from website_seo_scanner import network, services
+from website_seo_scanner.fetching import FetchedPage
+from website_seo_scanner.network import RESOURCE_SCHEMA
+from website_seo_scanner.performance import PageRenderingInfo
+from website_seo_scanner.schemas import PageMeta
+
+PAGE_URL = "https://example.ru/catalog/"
+PAGE_HTML = "<html><head><title>Каталог</title></head><body><p>Товары</p></body></html>"
+
+
+@pytest.fixture
+def rendered_page(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Playwright страница, загрузка DOM которой заняла 250 мс"""
+
+    @asynccontextmanager
+    async def capture_resources(page: SimpleNamespace):  # noqa: ARG001, RUF029
+        yield SimpleNamespace(resources=pl.DataFrame(schema=RESOURCE_SCHEMA))
+
+    async def measure(page: SimpleNamespace, url: str) -> PageRenderingInfo:  # noqa: ARG001, RUF029
+        return PageRenderingInfo(dom_content_loaded=250)
+
+    async def lint(page: SimpleNamespace, duplicates: object = None) -> list:  # noqa: ARG001, RUF029
+        return []
+
+    async def extract_meta(page: SimpleNamespace) -> PageMeta:  # noqa: ARG001, RUF029
+        return PageMeta(title="Каталог", description="")
+
+    async def extract_text(page: SimpleNamespace) -> str:  # noqa: ARG001, RUF029
+        return "Товары"
+
+    async def content() -> str:  # noqa: RUF029
+        return PAGE_HTML
+
+    monkeypatch.setattr(network, "ResourceCapture", capture_resources)
+    monkeypatch.setattr(services, "measure_page_rendering_time", measure)
+    monkeypatch.setattr(services, "lint_page", lint)
+    monkeypatch.setattr(services, "extract_page_meta", extract_meta)
+    monkeypatch.setattr(services, "extract_page_text", extract_text)
+    return SimpleNamespace(url=PAGE_URL, content=content)
+
+
+def test_rendering_time_is_in_seconds_for_static_and_rendered_pages(
+        rendered_page: SimpleNamespace,
+) -> None:
+    static_page = services.form_static_site_page(
+        FetchedPage(url=HttpUrl(PAGE_URL), status=200, html=PAGE_HTML, elapsed=0.25)
+    )
+    site_page = asyncio.run(services.form_rendered_site_page(rendered_page, PAGE_URL))
+    assert static_page.rendering_time == pytest.approx(0.25)
+    assert site_page.rendering_time == pytest.approx(static_page.rendering_time)
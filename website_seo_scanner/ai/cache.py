@@ -0,0 +1,100 @@
+"""Постоянный кэш ответов LLM"""
+
+from typing import Any
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime, timedelta
+from functools import cache
+
+from sqlalchemy import JSON, DateTime, String, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ResponseModel(Base):
+    __tablename__ = "llm_responses"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    response: Mapped[dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+def make_cache_key(prompt: str, model: str, inputs: Mapping[str, Any]) -> str:
+    """Ключ ответа LLM - хэш шаблона промпта, параметров модели и входных данных"""
+    payload = json.dumps(
+        {"prompt": prompt, "model": model, "inputs": inputs},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Ответы LLM в SQLite, таблица создаётся при первом обращении.
+
+    :param path: Путь до файла базы данных.
+    :param ttl: Время жизни ответа в секундах, None - без ограничения.
+    """
+
+    def __init__(self, path: str, ttl: float | None = None) -> None:
+        self._engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        self._ttl = timedelta(seconds=ttl) if ttl is not None else None
+        self._is_ready = False
+        self._setup_lock = asyncio.Lock()
+
+    async def _setup(self) -> None:
+        async with self._setup_lock:
+            if self._is_ready:
+                return
+            async with self._engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            self._is_ready = True
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Сохранённые и не устаревшие ответы по ключам"""
+        await self._setup()
+        stmt = select(ResponseModel).where(ResponseModel.key.in_(list(keys)))
+        if self._ttl is not None:
+            stmt = stmt.where(ResponseModel.created_at >= datetime.now(UTC) - self._ttl)
+        async with self._sessionmaker() as session:
+            results = (await session.scalars(stmt)).all()
+        return {model.key: model.response for model in results}
+
+    async def set_many(self, responses: Mapping[str, dict[str, Any]]) -> None:
+        """Сохраняет ответы, заменяя ранее сохранённые"""
+        if not responses:
+            return
+        await self._setup()
+        created_at = datetime.now(UTC)
+        stmt = insert(ResponseModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResponseModel.key],
+            set_={"response": stmt.excluded.response, "created_at": stmt.excluded.created_at},
+        )
+        async with self._sessionmaker() as session:
+            await session.execute(stmt, [
+                {"key": key, "response": response, "created_at": created_at}
+                for key, response in responses.items()
+            ])
+            await session.commit()
+
+
+@cache
+def get_response_cache() -> ResponseCache | None:
+    """Кэш ответов LLM из настроек или None, если кэширование выключено"""
+    if not settings.llm.cache_enabled:
+        return None
+    return ResponseCache(str(settings.llm.cache_path), settings.llm.cache_ttl)
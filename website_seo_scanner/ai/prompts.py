@@ -1,2 +1,16 @@
 SEARCH_QUERIES_GENERATION_PROMPT = """
 """
+
+KEY_SECTIONS_GENERATION_PROMPT = """
+Ты - SEO специалист. По адресу и названию сайта определи разделы сайта,
+которые важнее всего проверить при SEO анализе: каталог товаров, услуги, цены,
+акции, блог, контакты и другие разделы, приносящие поисковый трафик.
+
+Адрес сайта: {url}
+Название сайта: {title}
+
+Верни не более {max_results} разделов. Раздел - сегмент URL адреса латиницей
+в нижнем регистре, например: catalog, services, price, blog.
+
+{format_instructions}
+"""
@@ -1,14 +1,28 @@
+from typing import Any
+
+import asyncio
+import functools
+import logging
+from collections.abc import Sequence
+from functools import cache
+
+from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableSerializable
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..depends import llm
 from ..schemas import AboutSite
-from .prompts import SEARCH_QUERIES_GENERATION_PROMPT
+from ..settings import settings
+from .cache import ResponseCache, get_response_cache, make_cache_key
+from .prompts import KEY_SECTIONS_GENERATION_PROMPT, SEARCH_QUERIES_GENERATION_PROMPT
 
 DEFAULT_MAX_RESULTS = 15
 
+logger = logging.getLogger(__name__)
+
 
 class SearchQueriesResponse(BaseModel):
     search_queries: list[str] = Field(
@@ -22,6 +36,155 @@ class KeySectionsResponse(BaseModel):
     )
 
 
+class CachedChain[T: BaseModel]:
+    """Цепочка промпт | LLM | парсер ответа, собираемая один раз.
+    Ответы сохраняются в постоянный кэш, одинаковые одновременные запросы
+    объединяются в один вызов LLM, а пачки входных данных выполняются через abatch.
+
+    Пример использования:
+        chain = CachedChain(KEY_SECTIONS_GENERATION_PROMPT, KeySectionsResponse)
+        responses = await chain.abatch([{"url": url, "title": title, "max_results": 15}])
+    """
+
+    def __init__(
+            self,
+            system_prompt: str,
+            response_model: type[T],
+            model: BaseChatModel = llm,
+            response_cache: ResponseCache | None = None,
+    ) -> None:
+        parser = PydanticOutputParser(pydantic_object=response_model)
+        format_instructions = parser.get_format_instructions()
+        prompt = (
+            ChatPromptTemplate
+            .from_messages([("system", system_prompt)])
+            .partial(format_instructions=format_instructions)
+        )
+        self._chain: RunnableSerializable[dict[str, Any], T] = prompt | model | parser
+        self._response_model = response_model
+        self._prompt_key = system_prompt + format_instructions
+        self._model_key = model._get_llm_string()  # noqa: SLF001
+        self._cache = response_cache
+        self._in_flight: dict[str, asyncio.Future[T]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _make_key(self, inputs: dict[str, Any]) -> str:
+        return make_cache_key(self._prompt_key, self._model_key, inputs)
+
+    async def _get_cached(self, keys: list[str]) -> dict[str, T]:
+        if self._cache is None:
+            return {}
+        try:
+            responses = await self._cache.get_many(keys)
+        except SQLAlchemyError:
+            logger.warning("LLM response cache is unavailable", exc_info=True)
+            return {}
+        cached: dict[str, T] = {}
+        for key, response in responses.items():
+            try:
+                cached[key] = self._response_model.model_validate(response)
+            except ValidationError:
+                # Ответ сохранён прежней версией схемы и запрашивается заново
+                logger.warning("Stale LLM response in cache: %s", key)
+        return cached
+
+    async def _set_cached(self, responses: dict[str, T]) -> None:
+        if self._cache is None:
+            return
+        try:
+            await self._cache.set_many({
+                key: response.model_dump(mode="json") for key, response in responses.items()
+            })
+        except SQLAlchemyError:
+            logger.warning("LLM response cache is unavailable", exc_info=True)
+
+    async def _resolve(
+            self, pending: dict[str, dict[str, Any]], futures: dict[str, asyncio.Future[T]]
+    ) -> None:
+        """Заполняет ожидающие ответы из кэша, а отсутствующие - одной пачкой вызовов LLM"""
+        cached = await self._get_cached(list(pending))
+        missing = [key for key in pending if key not in cached]
+        responses = await self._chain.abatch(
+            [pending[key] for key in missing],
+            config={"max_concurrency": settings.llm.max_concurrency},
+            return_exceptions=True,
+        ) if missing else []
+        generated = {
+            key: response for key, response in zip(missing, responses, strict=True)
+            if not isinstance(response, Exception)
+        }
+        await self._set_cached(generated)
+        for key, response in zip(missing, responses, strict=True):
+            if isinstance(response, Exception):
+                futures[key].set_exception(response)
+        for key, response in (cached | generated).items():
+            futures[key].set_result(response)
+
+    def _on_resolved(
+            self, task: asyncio.Task[None], futures: dict[str, asyncio.Future[T]]
+    ) -> None:
+        """Освобождает ключи и передаёт ошибку разрешения всем ожидающим ответа"""
+        self._tasks.discard(task)
+        error = None if task.cancelled() else task.exception()
+        for key, future in futures.items():
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def abatch(self, inputs: Sequence[dict[str, Any]]) -> list[T]:
+        """Ответы LLM для пачки входных данных в исходном порядке.
+
+        :param inputs: Значения переменных промпта.
+        :return Разобранные ответы модели.
+        """
+        loop = asyncio.get_running_loop()
+        keys = [self._make_key(item) for item in inputs]
+        futures: dict[str, asyncio.Future[T]] = {}
+        pending: dict[str, dict[str, Any]] = {}
+        for key, item in zip(keys, inputs, strict=True):
+            if key in futures:
+                continue
+            if key not in self._in_flight:
+                self._in_flight[key] = loop.create_future()
+                pending[key] = item
+            futures[key] = self._in_flight[key]
+        if pending:
+            # Ответы разрешаются в отдельной задаче: отмена вызывающего лишь отключает
+            # его от ожидания и не отменяет запрос для объединённых с ним вызовов
+            resolving = {key: futures[key] for key in pending}
+            task = asyncio.create_task(self._resolve(pending, resolving))
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._on_resolved, futures=resolving))
+        return list(await asyncio.gather(*(asyncio.shield(futures[key]) for key in keys)))
+
+    async def ainvoke(self, inputs: dict[str, Any]) -> T:
+        """Ответ LLM для одних входных данных"""
+        return (await self.abatch([inputs]))[0]
+
+
+@cache
+def get_search_queries_chain() -> CachedChain[SearchQueriesResponse]:
+    return CachedChain(
+        SEARCH_QUERIES_GENERATION_PROMPT,
+        SearchQueriesResponse,
+        response_cache=get_response_cache(),
+    )
+
+
+@cache
+def get_key_sections_chain() -> CachedChain[KeySectionsResponse]:
+    return CachedChain(
+        KEY_SECTIONS_GENERATION_PROMPT,
+        KeySectionsResponse,
+        response_cache=get_response_cache(),
+    )
+
+
 async def generate_search_queries(
         about_site: AboutSite, max_results: int = DEFAULT_MAX_RESULTS
 ) -> list[str]:
@@ -31,19 +194,22 @@ async def generate_search_queries(
     :param max_results: Максимальное количество сгенерированных поисковых запросов.
     :return Список потенциальных поисковых запросов.
     """
-    parser = PydanticOutputParser(pydantic_object=SearchQueriesResponse)
-    prompt = (
-        ChatPromptTemplate
-        .from_messages([("system", SEARCH_QUERIES_GENERATION_PROMPT)])
-        .partial(format_instructions=parser.get_format_instructions())
-    )
-    chain: RunnableSerializable[dict[str, str | int], SearchQueriesResponse] = (
-        prompt
-        | llm
-        | parser
-    )
-    response = await chain.ainvoke({**about_site.model_dump(), "max_result": max_results})
-    return response.search_queries[::max_results]
+    return (await generate_search_queries_batch([about_site], max_results))[0]
+
+
+async def generate_search_queries_batch(
+        about_sites: Sequence[AboutSite], max_results: int = DEFAULT_MAX_RESULTS
+) -> list[list[str]]:
+    """Генерирует поисковые запросы сразу для нескольких сайтов
+
+    :param about_sites: Информация о сайтах.
+    :param max_results: Максимальное количество поисковых запросов одного сайта.
+    :return Списки поисковых запросов в порядке сайтов.
+    """
+    responses = await get_search_queries_chain().abatch([
+        {**about_site.model_dump(), "max_result": max_results} for about_site in about_sites
+    ])
+    return [response.search_queries[:max_results] for response in responses]
 
 
 async def generate_key_sections(
@@ -57,12 +223,19 @@ async def generate_key_sections(
     :param max_results: Максимальное количество генерируемых разделов.
     :return список ключевых разделов сайта.
     """
-    parser = PydanticOutputParser(pydantic_object=KeySectionsResponse)
-    prompt = (
-        ChatPromptTemplate
-        .from_messages([("system", ...)])
-        .partial(format_instructions=parser.get_format_instructions())
-    )
-    chain: RunnableSerializable[dict[str, str], KeySectionsResponse] = prompt | llm | parser
-    response = await chain.ainvoke({"url": url, "title": title, "max_results": max_results})
-    return response.key_sections[::max_results]
+    return (await generate_key_sections_batch([(url, title)], max_results))[0]
+
+
+async def generate_key_sections_batch(
+        sites: Sequence[tuple[HttpUrl, str]], max_results: int = DEFAULT_MAX_RESULTS
+) -> list[list[str]]:
+    """Генерирует ключевые разделы сразу для нескольких сайтов
+
+    :param sites: Пары URL адреса и названия сайта.
+    :param max_results: Максимальное количество разделов одного сайта.
+    :return Списки ключевых разделов в порядке сайтов.
+    """
+    responses = await get_key_sections_chain().abatch([
+        {"url": str(url), "title": title, "max_results": max_results} for url, title in sites
+    ])
+    return [response.key_sections[:max_results] for response in responses]
@@ -0,0 +1,8 @@
+__all__ = (
+    "JobQueue",
+    "ScanJob",
+    "create_app",
+)
+
+from .app import create_app
+from .jobs import JobQueue, ScanJob
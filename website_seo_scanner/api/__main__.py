@@ -0,0 +1,5 @@
+import uvicorn
+
+from .app import create_app
+
+uvicorn.run(create_app(), host="0.0.0.0", port=8080)  # noqa: S104
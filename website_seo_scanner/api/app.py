@@ -0,0 +1,99 @@
+from typing import Annotated, Literal
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, HttpUrl
+
+from ..browser import BrowserPool
+from ..depends import create_scan_repository
+from ..fetching import FetchMode
+from ..settings import settings
+from ..storage import ScanRepository
+from ..streaming import to_ndjson_line, to_sse_event
+from ..tracing import render_metrics
+from .jobs import JobQueue, ScanJob
+
+# Клиент по умолчанию для запросов без заголовка X-Tenant-ID
+DEFAULT_TENANT = "default"
+# Тип содержимого текстового формата экспозиции Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ScanRequest(BaseModel):
+    """Запрос на сканирование сайта"""
+    url: HttpUrl
+    fetch_mode: FetchMode | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    repository: ScanRepository | None = None
+    if settings.storage.enabled:
+        repository = create_scan_repository()
+        await repository.setup()
+    async with BrowserPool() as browser_pool:
+        app.state.job_queue = JobQueue(browser_pool, repository)
+        yield
+        await app.state.job_queue.shutdown()
+    if repository is not None:
+        await repository.close()
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    return request.app.state.job_queue
+
+
+def get_job(job_id: str, job_queue: Annotated[JobQueue, Depends(get_job_queue)]) -> ScanJob:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scan job not found")
+    return job
+
+
+def create_app() -> FastAPI:
+    """Создаёт HTTP сервис сканирования сайтов"""
+    app = FastAPI(title="Website SEO scanner", lifespan=lifespan)
+
+    @app.post("/scans", status_code=status.HTTP_202_ACCEPTED)
+    async def create_scan(
+            scan_request: ScanRequest,
+            job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+            x_tenant_id: Annotated[str, Header()] = DEFAULT_TENANT,
+    ) -> ScanJob:
+        return job_queue.submit(x_tenant_id, scan_request.url, scan_request.fetch_mode)
+
+    @app.get("/scans/{job_id}")
+    async def get_scan(job: Annotated[ScanJob, Depends(get_job)]) -> ScanJob:
+        return job
+
+    @app.get("/scans/{job_id}/results")
+    async def stream_scan_results(
+            job: Annotated[ScanJob, Depends(get_job)],
+            job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+            format: Literal["ndjson", "sse"] = "ndjson",  # noqa: A002
+    ) -> StreamingResponse:
+        serialize = to_sse_event if format == "sse" else to_ndjson_line
+        # Итератор создаётся сразу: он регистрирует читателя, поэтому страницы
+        # завершившейся задачи не отбрасываются до начала выдачи
+        records = job_queue.iter_records(job.id)
+        if records is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scan job not found")
+
+        async def iter_lines() -> AsyncIterator[str]:
+            try:
+                async for record in records:
+                    yield serialize(record)
+            finally:
+                await records.aclose()
+
+        media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+        return StreamingResponse(iter_lines(), media_type=media_type)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def get_metrics() -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return app
@@ -0,0 +1,242 @@
+"""Асинхронная очередь задач сканирования с ограничениями для клиентов"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from datetime import UTC, datetime
+from enum import StrEnum
+from uuid import uuid4
+
+from pydantic import BaseModel, Field, HttpUrl, NonNegativeInt
+
+from ..browser import BrowserPool
+from ..fetching import FetchMode
+from ..report import ScanSummary
+from ..schemas import SitePage
+from ..settings import settings
+from ..storage import ScanRepository
+from ..streaming import stream_site_scan
+
+# Максимальное количество хранимых в памяти завершённых задач
+MAX_FINISHED_JOBS = 100
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(StrEnum):
+    """Статусы задачи сканирования"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ScanJob(BaseModel):
+    """Задача сканирования сайта
+
+    Attributes:
+        id: Идентификатор задачи.
+        tenant: Клиент, создавший задачу.
+        url: URL адрес сайта.
+        fetch_mode: Режим загрузки страниц.
+        status: Текущий статус задачи.
+        pages: Количество уже просканированных страниц.
+        error: Сообщение об ошибке для упавшей задачи.
+        summary: Итоговая сводка для завершённой задачи.
+    """
+    id: str = Field(default_factory=lambda: uuid4().hex)
+    tenant: str
+    url: HttpUrl
+    fetch_mode: FetchMode | None = None
+    status: JobStatus = JobStatus.PENDING
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    pages: NonNegativeInt = 0
+    error: str | None = None
+    summary: ScanSummary | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {JobStatus.COMPLETED, JobStatus.FAILED}
+
+
+class _JobState:
+    """Задача и накопленные результаты для потоковой выдачи.
+    После завершения задачи и отключения всех читателей страницы отбрасываются
+    и остаётся только итоговая сводка: сохранённые страницы доступны в хранилище.
+    """
+
+    def __init__(self, job: ScanJob) -> None:
+        self.job = job
+        self.records: list[SitePage | ScanSummary] = []
+        # Количество отброшенных записей перед records
+        self.offset = 0
+        self.readers = 0
+        self.changed = asyncio.Condition()
+
+    def compact(self) -> None:
+        if not self.job.is_finished or self.readers:
+            return
+        summaries = [record for record in self.records if isinstance(record, ScanSummary)]
+        self.offset += len(self.records) - len(summaries)
+        self.records = summaries
+
+    async def append(self, record: SitePage | ScanSummary) -> None:
+        async with self.changed:
+            self.records.append(record)
+            self.changed.notify_all()
+
+    async def finish(self, status: JobStatus, error: str | None = None) -> None:
+        async with self.changed:
+            self.job.status = status
+            self.job.error = error
+            self.job.finished_at = datetime.now(UTC)
+            self.changed.notify_all()
+        self.compact()
+
+
+class _RecordStream:
+    """Читатель результатов задачи. Регистрируется при создании, поэтому страницы
+    завершившейся до первого чтения задачи не отбрасываются. Освобождается
+    после выдачи сводки, при закрытии или удалении.
+    """
+
+    def __init__(self, state: _JobState) -> None:
+        self._state = state
+        self._index = state.offset
+        self._closed = False
+        state.readers += 1
+
+    def __aiter__(self) -> _RecordStream:
+        return self
+
+    async def __anext__(self) -> SitePage | ScanSummary:
+        state = self._state
+        if self._closed:
+            raise StopAsyncIteration
+        async with state.changed:
+            await state.changed.wait_for(
+                lambda: state.offset + len(state.records) > self._index or state.job.is_finished
+            )
+            is_read = state.offset + len(state.records) <= self._index
+            record = None if is_read else state.records[self._index - state.offset]
+        if record is None:
+            self._release()
+            raise StopAsyncIteration
+        self._index += 1
+        return record
+
+    async def aclose(self) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._state.readers -= 1
+        self._state.compact()
+
+    def __del__(self) -> None:
+        self._release()
+
+
+class JobQueue:
+    """Очередь задач сканирования поверх общего пула браузера.
+    Ограничивает общее количество одновременных сканирований
+    и количество одновременных сканирований одного клиента.
+    """
+
+    def __init__(
+            self,
+            browser_pool: BrowserPool,
+            repository: ScanRepository | None = None,
+            max_concurrency: int | None = None,
+            tenant_concurrency: int | None = None,
+    ) -> None:
+        self._browser_pool = browser_pool
+        self._repository = repository
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.jobs.max_concurrency)
+        self._tenant_concurrency = tenant_concurrency or settings.jobs.tenant_concurrency
+        # Семафоры есть только у клиентов с незавершёнными задачами: идентификатор
+        # клиента приходит из заголовка запроса и не должен накапливаться
+        self._tenant_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._tenant_jobs: Counter[str] = Counter()
+        self._states: OrderedDict[str, _JobState] = OrderedDict()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def submit(self, tenant: str, url: HttpUrl, fetch_mode: FetchMode | None = None) -> ScanJob:
+        """Ставит сканирование сайта в очередь.
+
+        :param tenant: Идентификатор клиента.
+        :param url: URL адрес сайта.
+        :param fetch_mode: Режим загрузки страниц.
+        :return Созданная задача.
+        """
+        state = _JobState(ScanJob(tenant=tenant, url=url, fetch_mode=fetch_mode))
+        self._states[state.job.id] = state
+        self._evict_finished()
+        task = asyncio.create_task(self._run(state))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return state.job
+
+    def get(self, job_id: str) -> ScanJob | None:
+        """Получает задачу по идентификатору"""
+        state = self._states.get(job_id)
+        return None if state is None else state.job
+
+    def iter_records(self, job_id: str) -> _RecordStream | None:
+        """Отдаёт уже готовые результаты задачи, а затем новые по мере появления.
+        Для завершённой задачи, страницы которой уже отброшены, отдаётся только сводка.
+        Страницы сохраняются для итератора с момента его создания.
+
+        :param job_id: Идентификатор задачи.
+        :return Итератор страниц сайта и итоговой сводки или None, если задачи нет.
+        """
+        state = self._states.get(job_id)
+        return None if state is None else _RecordStream(state)
+
+    async def shutdown(self) -> None:
+        """Отменяет выполняющиеся задачи"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, state: _JobState) -> None:
+        tenant = state.job.tenant
+        if tenant not in self._tenant_semaphores:
+            self._tenant_semaphores[tenant] = asyncio.Semaphore(self._tenant_concurrency)
+        self._tenant_jobs[tenant] += 1
+        try:
+            async with self._tenant_semaphores[tenant], self._semaphore:
+                await self._run_job(state)
+        finally:
+            self._tenant_jobs[tenant] -= 1
+            if not self._tenant_jobs[tenant]:
+                del self._tenant_jobs[tenant], self._tenant_semaphores[tenant]
+
+    async def _run_job(self, state: _JobState) -> None:
+        job = state.job
+        job.status, job.started_at = JobStatus.RUNNING, datetime.now(UTC)
+        try:
+            async for record in stream_site_scan(
+                job.url, job.fetch_mode, self._repository, self._browser_pool
+            ):
+                if isinstance(record, ScanSummary):
+                    job.summary = record
+                else:
+                    job.pages += 1
+                await state.append(record)
+        except Exception as e:
+            logger.exception("Scan job %s of %s failed", job.id, job.url)
+            await state.finish(JobStatus.FAILED, str(e))
+            return
+        await state.finish(JobStatus.COMPLETED)
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, state in self._states.items() if state.job.is_finished]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._states[job_id]
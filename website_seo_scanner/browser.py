@@ -0,0 +1,77 @@
+"""Общий пул браузера для одновременных сканирований"""
+
+from typing import Self
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import TracebackType
+
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+
+from .settings import settings
+from .stealth import create_new_stealth_context
+
+
+class BrowserPool:
+    """Один запущенный Chromium, из которого выдаются изолированные stealth страницы.
+    Количество одновременно открытых контекстов ограничено.
+
+    Пример использования:
+        async with BrowserPool() as pool, pool.page() as page:
+            await navigate(page, url)
+    """
+
+    def __init__(self, max_contexts: int | None = None, headless: bool | None = None) -> None:
+        self._max_contexts = max_contexts or settings.browser.max_contexts
+        self._headless = settings.browser.headless if headless is None else headless
+        self._semaphore = asyncio.Semaphore(self._max_contexts)
+        self._lock = asyncio.Lock()
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Запускает браузер, если он ещё не запущен"""
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self._headless)
+
+    async def stop(self) -> None:
+        """Закрывает браузер"""
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Выдаёт новую страницу в отдельном stealth контексте.
+        Контекст закрывается при выходе.
+        """
+        async with self._semaphore:
+            await self.start()
+            if self._browser is None:
+                raise RuntimeError("Browser is not started")
+            context = await create_new_stealth_context(self._browser)
+            try:
+                yield await context.new_page()
+            finally:
+                await context.close()
@@ -1,4 +1,92 @@
+"""Очистка текста страниц от серверного кода и служебных фрагментов"""
+
+from typing import Final, Self
+
 import re
+from collections.abc import Iterable
+
+from pydantic import BaseModel, ConfigDict
+
+# Флаги регулярных выражений правил очистки
+RULE_FLAGS: Final[re.RegexFlag] = re.IGNORECASE | re.MULTILINE
+
+
+class CleaningRule(BaseModel):
+    """Правило очистки текста
+
+    Attributes:
+        pattern: Регулярное выражение удаляемого фрагмента.
+        trigger: Подстрока, которая обязательно есть в любом совпадении.
+            Ищется без учёта регистра, как и само правило.
+            Если её нет в тексте, правило не применяется.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    pattern: str
+    trigger: str | None = None
+
+
+# Правила удаления PHP массивов и серверного кода, порядок задаёт приоритет
+SERVER_CODE_RULES: tuple[CleaningRule, ...] = (
+    # PHP массивы: Array( [key] => value )
+    CleaningRule(pattern=r"Array\s*\(\s*\[.*?\]\s*=>\s*[^)]+\)", trigger="=>"),
+    # Отдельные элементы массивов: [KEY] => VALUE и квадратные скобки с текстом: [TEXT], [LINK]
+    CleaningRule(pattern=r"\[(?:\w+\]\s*=>\s*[^\n\r]*|[\w_]+\])", trigger="]"),
+    # PHP переменные: $variable
+    CleaningRule(pattern=r"\$[a-zA-Z_]\w*", trigger="$"),
+    # PHP методы: ->method
+    CleaningRule(pattern=r"->\s*\w+", trigger="->"),
+    # URL с utm-метками
+    CleaningRule(pattern=r"&utm_[^&\s]+", trigger="&utm_"),
+    # Специальные символы
+    CleaningRule(pattern=r"\xa0", trigger="\xa0"),  # неразрывный пробел
+)
+
+
+def _compile_trigger(trigger: str | None) -> str | re.Pattern[str] | None:
+    """Триггер без букв ищется как подстрока, а с буквами - без учёта регистра,
+    как и правило, без приведения всего текста к нижнему регистру.
+    """
+    if trigger is None or trigger.lower() == trigger.upper():
+        return trigger
+    return re.compile(re.escape(trigger), flags=re.IGNORECASE)
+
+
+class TextCleaner:
+    """Удаляет из текста фрагменты, совпадающие с правилами.
+    Правила компилируются один раз, а проход правила выполняется только если
+    его подстрока-триггер есть в тексте, поэтому текст без серверного кода
+    не сканируется регулярными выражениями.
+
+    Пример использования:
+        cleaner = server_code_cleaner.with_rules(
+            CleaningRule(pattern=r"<!--.*?-->", trigger="<!--")
+        )
+        text = cleaner.clean(text)
+    """
+
+    def __init__(self, rules: Iterable[CleaningRule]) -> None:
+        self.rules: tuple[CleaningRule, ...] = tuple(rules)
+        self._passes: list[tuple[str | re.Pattern[str] | None, re.Pattern[str]]] = [
+            (_compile_trigger(rule.trigger), re.compile(rule.pattern, flags=RULE_FLAGS))
+            for rule in self.rules
+        ]
+
+    def with_rules(self, *rules: CleaningRule) -> Self:
+        """Создаёт очиститель с дополнительными правилами, применяемыми после текущих"""
+        return type(self)((*self.rules, *rules))
+
+    def clean(self, text: str) -> str:
+        """Удаляет совпадения всех правил и крайние пробелы"""
+        for trigger, pattern in self._passes:
+            if trigger is None or (
+                trigger in text if isinstance(trigger, str) else trigger.search(text)
+            ):
+                text = pattern.sub("", text)
+        return text.strip()
+
+
+server_code_cleaner: Final[TextCleaner] = TextCleaner(SERVER_CODE_RULES)
 
 
 def clean(text: str) -> str:
@@ -7,23 +95,4 @@ def clean(text: str) -> str:
 
 def remove_server_code(text: str) -> str:
     """Удаляет PHP массивы и серверный код из текста"""
-    patterns = [
-        # PHP массивы: Array( [key] => value )
-        r"Array\s*\(\s*\[.*?\]\s*=>\s*[^)]+\)",
-        # Отдельные элементы массивов: [KEY] => VALUE
-        r"\[\w+\]\s*=>\s*[^\n\r]*",
-        # Квадратные скобки с текстом: [TEXT], [LINK]
-        r"\[[\w_]+\]",
-        # PHP переменные: $variable
-        r"\$[a-zA-Z_]\w*",
-        # PHP методы: ->method
-        r"->\s*\w+",
-        # URL с utm-метками
-        r"&utm_[^&\s]+",
-        # Специальные символы
-        r"\xa0",  # неразрывный пробел
-    ]
-    cleaned_text = text
-    for pattern in patterns:
-        cleaned_text = re.sub(pattern, "", cleaned_text, flags=re.IGNORECASE | re.MULTILINE)
-    return cleaned_text.strip()
+    return server_code_cleaner.clean(text)
@@ -0,0 +1,245 @@
+"""Масштабируемая кластеризация векторов текстов"""
+
+from typing import Literal, Self
+
+from collections.abc import Callable, Iterable, Sequence
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.decomposition import PCA
+from sklearn.random_projection import GaussianRandomProjection
+
+from .schemas import ThematicCluster
+
+RANDOM_STATE = 42
+# Количество текстов в одном запросе к модели эмбеддингов
+EMBEDDING_BATCH_SIZE = 256
+# Количество хэш-таблиц и гиперплоскостей в каждой таблице LSH индекса
+LSH_TABLES, LSH_HYPERPLANES = 8, 12
+# Максимальный размер корзины LSH, большие корзины просматриваются частично
+MAX_BUCKET_SIZE = 512
+# Количество соседей в графе
+NEIGHBORS = 15
+# Минимальная косинусная близость соседей, связывающая тексты в один кластер
+LINK_SIMILARITY = 0.75
+# Количество векторов в пачке при поиске соседей и назначении кластеров
+SEARCH_BATCH_SIZE = 1024
+# Метка текстов вне кластеров
+NOISE_LABEL = -1
+
+
+def normalize_vectors(vectors: np.ndarray | Sequence[Sequence[float]]) -> np.ndarray:
+    """Приводит векторы к float32 и единичной длине"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    return matrix
+
+
+def embed_texts(
+        embed_documents: Callable[[list[str]], list[list[float]]],
+        texts: Sequence[str],
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> np.ndarray:
+    """Векторизует тексты пачками в заранее выделенную float32 матрицу
+    нормированных векторов, не удерживая списки float всех текстов.
+    """
+    matrix: np.ndarray | None = None
+    for start in range(0, len(texts), batch_size):
+        batch = normalize_vectors(embed_documents(list(texts[start:start + batch_size])))
+        if matrix is None:
+            matrix = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+        matrix[start:start + len(batch)] = batch
+    return np.empty((0, 0), dtype=np.float32) if matrix is None else matrix
+
+
+def reduce_dimensions(
+        vectors: np.ndarray, method: Literal["pca", "random"], n_components: int
+) -> np.ndarray:
+    """Снижает размерность нормированных векторов и повторно нормирует их.
+
+    :param vectors: Нормированные векторы.
+    :param method: 'pca' - рандомизированный PCA, 'random' - гауссова случайная проекция.
+    :param n_components: Размерность результата.
+    :return Нормированные векторы меньшей размерности.
+    """
+    n_components = min(n_components, *vectors.shape)
+    if method == "pca":
+        reducer = PCA(
+            n_components=n_components, svd_solver="randomized", random_state=RANDOM_STATE
+        )
+    else:
+        reducer = GaussianRandomProjection(n_components=n_components, random_state=RANDOM_STATE)
+    return normalize_vectors(reducer.fit_transform(vectors))
+
+
+class LSHIndex:
+    """Приближённый поиск ближайших соседей по косинусной близости.
+    Векторы раскладываются по корзинам знаками проекций на случайные гиперплоскости
+    в нескольких таблицах, точная близость считается только внутри общих корзин.
+    """
+
+    def __init__(
+            self, vectors: np.ndarray, tables: int = LSH_TABLES, hyperplanes: int = LSH_HYPERPLANES
+    ) -> None:
+        self._vectors = vectors
+        rng = np.random.default_rng(RANDOM_STATE)
+        self._planes = rng.standard_normal((tables, vectors.shape[1], hyperplanes)).astype(
+            np.float32
+        )
+        self._powers = 1 << np.arange(hyperplanes, dtype=np.int64)
+        self._buckets: list[dict[int, np.ndarray]] = []
+        for table_codes in self._hash(vectors).T:
+            order = np.argsort(table_codes, kind="stable")
+            codes, starts = np.unique(table_codes[order], return_index=True)
+            self._buckets.append(dict(zip(
+                codes.tolist(), np.split(order, starts[1:]), strict=True
+            )))
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Коды корзин векторов во всех таблицах, форма (векторы, таблицы)"""
+        projections = np.einsum("nd,tdh->nth", vectors, self._planes)
+        return (projections > 0).astype(np.int64) @ self._powers
+
+    def kneighbors(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Находит приближённых ближайших соседей.
+
+        :param queries: Нормированные векторы запросов.
+        :param k: Количество соседей.
+        :return Индексы соседей и их косинусная близость, -1 и -inf если соседей меньше k.
+        """
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        similarities = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for row, codes in enumerate(self._hash(queries)):
+            candidates = np.unique(np.concatenate([
+                buckets.get(code, np.empty(0, dtype=np.int64))[:MAX_BUCKET_SIZE]
+                for buckets, code in zip(self._buckets, codes.tolist(), strict=True)
+            ]))
+            if not len(candidates):
+                continue
+            scores = self._vectors[candidates] @ queries[row]
+            top = np.argsort(-scores)[:k]
+            indices[row, :len(top)] = candidates[top]
+            similarities[row, :len(top)] = scores[top]
+        return indices, similarities
+
+
+def build_neighbor_graph(
+        vectors: np.ndarray, k: int = NEIGHBORS, min_similarity: float = LINK_SIMILARITY
+) -> sparse.csr_matrix:
+    """Строит разреженный граф k ближайших соседей по LSH индексу.
+    Рёбра с близостью ниже min_similarity отбрасываются.
+    """
+    index = LSHIndex(vectors)
+    rows: list[np.ndarray] = []
+    columns: list[np.ndarray] = []
+    weights: list[np.ndarray] = []
+    for start in range(0, len(vectors), SEARCH_BATCH_SIZE):
+        indices, similarities = index.kneighbors(vectors[start:start + SEARCH_BATCH_SIZE], k + 1)
+        mask = (indices >= 0) & (similarities >= min_similarity)
+        batch_rows = np.broadcast_to(
+            np.arange(start, start + len(indices))[:, None], indices.shape
+        )
+        mask &= indices != batch_rows
+        rows.append(batch_rows[mask])
+        columns.append(indices[mask])
+        weights.append(similarities[mask])
+    graph = sparse.csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(len(vectors), len(vectors)),
+    )
+    return graph.maximum(graph.T).tocsr()
+
+
+def cluster_neighbor_graph(graph: sparse.csr_matrix, min_cluster_size: int) -> np.ndarray:
+    """Кластеры - связные компоненты графа соседей не меньше min_cluster_size.
+
+    :return Метки кластеров, NOISE_LABEL для текстов вне кластеров.
+    """
+    _, components = connected_components(graph, directed=False)
+    sizes = np.bincount(components)
+    large = np.flatnonzero(sizes >= min_cluster_size)
+    remap = np.full(len(sizes), NOISE_LABEL, dtype=np.int64)
+    remap[large] = np.arange(len(large))
+    return remap[components]
+
+
+class ClusterCentroids:
+    """Центроиды кластеров для потокового назначения новых текстов.
+    Центроиды обновляются скользящим средним по мере назначения (mini-batch).
+    """
+
+    def __init__(self, names: list[str], centroids: np.ndarray, counts: np.ndarray) -> None:
+        self.names = names
+        self._sums = centroids * counts[:, None]
+        self._counts = counts.astype(np.float32)
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Нормированные центроиды кластеров"""
+        return normalize_vectors(self._sums)
+
+    @classmethod
+    def from_labels(cls, vectors: np.ndarray, labels: np.ndarray) -> Self:
+        """Центроиды по векторам и меткам кластеров (шум не учитывается)"""
+        clusters = np.unique(labels[labels != NOISE_LABEL])
+        counts = np.array([(labels == label).sum() for label in clusters], dtype=np.float32)
+        centroids = np.stack([
+            vectors[labels == label].mean(axis=0) for label in clusters
+        ]) if len(clusters) else np.empty((0, vectors.shape[1]), dtype=np.float32)
+        return cls([str(label) for label in clusters], normalize_vectors(centroids), counts)
+
+    @classmethod
+    def from_thematic_clusters(
+            cls,
+            clusters: Iterable[ThematicCluster],
+            embed_documents: Callable[[list[str]], list[list[float]]],
+    ) -> Self:
+        """Центроиды тематических кластеров по эмбеддингам их ключевых слов и фраз.
+        Для пустого списка кластеров - пустой набор центроидов, не назначающий тексты.
+        """
+        clusters = list(clusters)
+        if not clusters:
+            return cls([], np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32))
+        names: list[str] = []
+        centroids: list[np.ndarray] = []
+        counts: list[float] = []
+        for cluster in clusters:
+            terms = [*cluster.keywords, *cluster.keyphrases] or [cluster.name]
+            names.append(cluster.name)
+            centroids.append(embed_texts(embed_documents, terms).mean(axis=0))
+            counts.append(max(len(cluster.pages), 1))
+        return cls(
+            names, normalize_vectors(np.stack(centroids)), np.asarray(counts, dtype=np.float32)
+        )
+
+    def assign(
+            self,
+            vectors: np.ndarray,
+            min_similarity: float = LINK_SIMILARITY,
+            update: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Назначает векторы ближайшим кластерам пачками.
+
+        :param vectors: Нормированные векторы новых текстов.
+        :param min_similarity: Минимальная близость к центроиду, иначе NOISE_LABEL.
+        :param update: Обновлять центроиды назначенными векторами.
+        :return Индексы кластеров и близость к их центроидам.
+        """
+        labels = np.full(len(vectors), NOISE_LABEL, dtype=np.int64)
+        similarities = np.zeros(len(vectors), dtype=np.float32)
+        if not self.names:
+            return labels, similarities
+        for start in range(0, len(vectors), SEARCH_BATCH_SIZE):
+            batch = vectors[start:start + SEARCH_BATCH_SIZE]
+            scores = batch @ self.centroids.T
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(batch)), best]
+            assigned = best_scores >= min_similarity
+            labels[start:start + len(batch)] = np.where(assigned, best, NOISE_LABEL)
+            similarities[start:start + len(batch)] = best_scores
+            if update and assigned.any():
+                np.add.at(self._sums, best[assigned], batch[assigned])
+                np.add.at(self._counts, best[assigned], 1)
+        return labels, similarities
@@ -0,0 +1,89 @@
+"""Корпуса NLTK и модели spaCy, необходимые для обработки текстов.
+
+Корпуса и модели скачиваются отдельным шагом установки, а не при импорте модулей:
+    python -m website_seo_scanner.corpora [--data-dir PATH]
+После этого обработка текстов работает без доступа к сети.
+"""
+
+import argparse
+import logging
+from functools import cache
+
+import nltk
+
+from .settings import settings
+
+# Корпус NLTK и путь ресурса для проверки его наличия
+REQUIRED_CORPORA: dict[str, str] = {
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusNotFoundError(LookupError):
+    """Корпус NLTK не установлен"""
+
+
+@cache
+def _configure_data_path() -> None:
+    if settings.nlp.data_dir is not None:
+        nltk.data.path.insert(0, str(settings.nlp.data_dir))
+
+
+def ensure_corpus(name: str) -> None:
+    """Проверяет, что корпус установлен, не обращаясь к сети.
+
+    :param name: Название корпуса NLTK.
+    :raises CorpusNotFoundError: Корпус не найден в каталогах NLTK.
+    """
+    _configure_data_path()
+    try:
+        nltk.data.find(REQUIRED_CORPORA[name])
+    except LookupError as exc:
+        raise CorpusNotFoundError(
+            f"NLTK corpus '{name}' is not installed, "
+            "run 'python -m website_seo_scanner.corpora' to download it"
+        ) from exc
+
+
+def download_spacy_model(model: str) -> None:
+    """Скачивает модель spaCy, если она не установлена"""
+    import spacy  # noqa: PLC0415
+
+    if spacy.util.is_package(model):
+        return
+    logger.info("Downloading spaCy model %s", model)
+    spacy.cli.download(model)
+
+
+def download_corpora(data_dir: str | None = None) -> None:
+    """Скачивает недостающие корпуса NLTK и модель spaCy выбранного лемматизатора.
+
+    :param data_dir: Каталог для корпусов, по умолчанию из settings или стандартный.
+    """
+    data_dir = data_dir or (str(settings.nlp.data_dir) if settings.nlp.data_dir else None)
+    if data_dir is not None:
+        nltk.data.path.insert(0, data_dir)
+    for name, resource in REQUIRED_CORPORA.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            logger.info("Downloading NLTK corpus %s", name)
+            if not nltk.download(name, download_dir=data_dir, quiet=True):
+                raise CorpusNotFoundError(f"Failed to download NLTK corpus '{name}'") from None
+    if settings.nlp.lemmatizer == "spacy":
+        download_spacy_model(settings.nlp.spacy_model)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Установка корпусов NLTK и моделей spaCy")
+    parser.add_argument("--data-dir", default=None, help="Каталог для корпусов")
+    args = parser.parse_args()
+    download_corpora(args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
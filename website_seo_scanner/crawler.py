@@ -0,0 +1,273 @@
+"""Построение дерева сайта обходом внутренних ссылок, если sitemap.xml недоступен"""
+
+from typing import Protocol
+
+import asyncio
+import contextlib
+import hashlib
+import heapq
+import logging
+import math
+from decimal import Decimal
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import httpx
+from bs4 import BeautifulSoup
+from pydantic import HttpUrl
+from usp.objects.page import SitemapPage
+
+from .fetching import FetchedPage, create_http_client, fetch_html
+from .link_graph import LinkGraphBuilder, find_orphan_pages
+from .politeness import SitemapWebClient, get_host_scheduler
+from .settings import settings
+from .tracing import span, traced
+from .tree import (
+    DENIED_EXTENSIONS,
+    PRIORITY_KEYWORDS,
+    TreeNode,
+    add_page_to_tree,
+    build_site_tree,
+    get_root_name,
+    parse_url_path,
+)
+
+# Порты по умолчанию, не влияющие на адрес страницы
+DEFAULT_PORTS: dict[str, int] = {"http": 80, "https": 443}
+# Параметры запроса, не меняющие контент страницы
+TRACKING_PARAMETERS: tuple[str, ...] = ("utm_", "yclid", "gclid", "fbclid", "_openstat")
+# Приоритет страницы в дереве уменьшается с глубиной перехода
+PRIORITY_DEPTH_STEP = Decimal("0.2")
+MIN_PAGE_PRIORITY = Decimal("0.1")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(href: str, base_url: str) -> str | None:
+    """Приводит ссылку к каноническому абсолютному URL адресу.
+    Убирает фрагмент, порт по умолчанию и рекламные параметры,
+    сортирует параметры запроса.
+
+    :param href: Значение атрибута href.
+    :param base_url: URL адрес страницы со ссылкой.
+    :return Нормализованный URL адрес или None для некорректных ссылок
+        и ссылок не на HTTP страницы.
+    """
+    try:
+        parts = urlsplit(urljoin(base_url, href.strip()))
+        port = parts.port
+    except ValueError:
+        # Некорректный IPv6 адрес или порт в ссылке
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    netloc = parts.hostname
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETERS)
+    ))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def _get_site_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").removeprefix("www.")
+
+
+def _is_page_url(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return not path.endswith(DENIED_EXTENSIONS)
+
+
+def extract_links(html: str, page_url: str) -> list[str]:
+    """Извлекает нормализованные ссылки на страницы того же сайта.
+
+    :param html: HTML разметка страницы.
+    :param page_url: URL адрес страницы.
+    :return Уникальные внутренние ссылки в порядке появления.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    base = soup.find("base", href=True)
+    base_url = page_url
+    if base is not None:
+        with contextlib.suppress(ValueError):
+            base_url = urljoin(page_url, base["href"])
+    host = _get_site_host(page_url)
+    links: dict[str, None] = {}
+    for anchor in soup.find_all("a", href=True):
+        url = normalize_url(anchor["href"], base_url)
+        if url is not None and _get_site_host(url) == host and _is_page_url(url):
+            links[url] = None
+    return list(links)
+
+
+class SeenUrls(Protocol):
+    """Множество посещённых URL адресов"""
+
+    def add(self, url: str) -> None: ...
+
+    def __contains__(self, url: object) -> bool: ...
+
+
+class BloomFilter:
+    """Фильтр Блума для множества URL адресов огромных сайтов.
+    Память не зависит от длины URL, ложные срабатывания лишь пропускают страницу.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, url: str) -> list[int]:
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, url: str) -> None:
+        for position in self._positions(url):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(url)
+        )
+
+
+def _create_seen_urls() -> SeenUrls:
+    if settings.crawl.bloom_filter:
+        return BloomFilter(settings.crawl.bloom_capacity, settings.crawl.bloom_error_rate)
+    return set()
+
+
+def _get_link_priority(url: str) -> int:
+    """0 для ссылок с приоритетными сегментами, чтобы они обходились первыми"""
+    segments = parse_url_path(url)
+    return 0 if any(keyword in segments for keyword in PRIORITY_KEYWORDS) else 1
+
+
+class LinkCrawler:
+    """Обход внутренних ссылок сайта в ширину.
+    На каждой глубине первыми загружаются ссылки с приоритетными сегментами,
+    страницы загружаются параллельно с соблюдением ограничений хоста.
+
+    Пример использования:
+        tree = await LinkCrawler(client, max_pages=100).crawl(url)
+    """
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            max_pages: int | None = None,
+            max_depth: int | None = None,
+            max_concurrency: int | None = None,
+    ) -> None:
+        self.client = client
+        self.max_pages = max_pages or settings.crawl.max_pages
+        self.max_depth = max_depth if max_depth is not None else settings.crawl.max_depth
+        self.max_concurrency = max_concurrency or settings.fetch.max_concurrency
+
+    async def _fetch(self, url: str, depth: int) -> tuple[str, int, FetchedPage | None]:
+        return url, depth, await fetch_html(self.client, HttpUrl(url))
+
+    @traced("tree.crawl")
+    async def crawl(self, url: HttpUrl, graph: LinkGraphBuilder | None = None) -> TreeNode:  # noqa: C901
+        """Обходит сайт и строит дерево из загруженных HTML страниц.
+
+        :param url: URL адрес главной страницы.
+        :param graph: Граф, в который записываются ссылки загруженных страниц.
+            Граф помечается полным, если обход не остановлен ограничениями.
+        :return Дерево структуры сайта.
+        """
+        root = TreeNode(name=get_root_name(url), url=url)
+        start_url = normalize_url(str(url), str(url))
+        if start_url is None:
+            return root
+        seen_urls = _create_seen_urls()
+        seen_urls.add(start_url)
+        frontier: list[tuple[int, int, int, str]] = [(0, 0, 0, start_url)]
+        sequence = 1
+        in_flight: set[asyncio.Task[tuple[str, int, FetchedPage | None]]] = set()
+        fetched_pages = 0
+        truncated = False
+        while frontier or in_flight:
+            while frontier and len(in_flight) < self.max_concurrency and (
+                    fetched_pages + len(in_flight) < self.max_pages
+            ):
+                depth, _, _, page_url = heapq.heappop(frontier)
+                in_flight.add(asyncio.create_task(self._fetch(page_url, depth)))
+            if not in_flight:
+                break
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page_url, depth, fetched_page = task.result()
+                if fetched_page is None or fetched_page.status >= httpx.codes.BAD_REQUEST:
+                    continue
+                fetched_pages += 1
+                priority = max(Decimal(1) - PRIORITY_DEPTH_STEP * depth, MIN_PAGE_PRIORITY)
+                add_page_to_tree(
+                    url, root, SitemapPage(url=page_url, priority=priority),
+                    parse_url_path(page_url),
+                )
+                links = (
+                    extract_links(fetched_page.html, page_url)
+                    if graph is not None or depth < self.max_depth else []
+                )
+                if graph is not None:
+                    graph.add_links(page_url, links)
+                for link in links:
+                    if link in seen_urls:
+                        continue
+                    if depth >= self.max_depth:
+                        # Часть страниц сайта осталась за пределом глубины обхода
+                        truncated = True
+                        break
+                    seen_urls.add(link)
+                    heapq.heappush(
+                        frontier, (depth + 1, _get_link_priority(link), sequence, link)
+                    )
+                    sequence += 1
+        if graph is not None:
+            graph.complete = not frontier and not truncated
+        logger.info("Crawled %s pages of %s", fetched_pages, url)
+        return root
+
+
+async def discover_site_tree(url: HttpUrl, client: httpx.AsyncClient | None = None) -> TreeNode:
+    """Строит дерево сайта по sitemap.xml, а если в нём нет страниц - обходом ссылок.
+    Узлы дерева размечаются показателями графа внутренних ссылок. При обходе ссылок
+    граф собирается из уже загруженных страниц, а для сайтов с sitemap.xml
+    строится ограниченным обходом, по умолчанию - только по ссылкам главной страницы.
+
+    :param url: URL адрес сайта.
+    :param client: HTTP клиент, по умолчанию создаётся собственный.
+    :return Дерево структуры сайта.
+    """
+    if client is None:
+        async with create_http_client() as own_client:
+            return await discover_site_tree(url, own_client)
+    host_scheduler = get_host_scheduler()
+    # Загрузка robots.txt до sitemap.xml, чтобы запросы sitemap соблюдали Crawl-delay
+    await host_scheduler.get_crawl_delay(str(url), client)
+    # Парсер sitemap.xml блокирующий, поэтому выполняется в отдельном потоке
+    tree = await asyncio.to_thread(
+        build_site_tree, url, SitemapWebClient(client, host_scheduler)
+    )
+    graph = LinkGraphBuilder() if settings.link_graph.enabled else None
+    if tree.is_leaf and settings.crawl.enabled:
+        logger.info("Sitemap of %s has no pages, crawling links", url)
+        tree = await LinkCrawler(client).crawl(url, graph)
+    elif graph is not None and settings.link_graph.max_pages > 0:
+        await LinkCrawler(
+            client, settings.link_graph.max_pages, settings.link_graph.max_depth
+        ).crawl(url, graph)
+    else:
+        graph = None
+    if graph is not None:
+        with span("tree.link_graph"):
+            graph.build().annotate_tree(tree)
+            orphan_pages = find_orphan_pages(tree)
+        if orphan_pages:
+            logger.info("Found %s orphan pages of %s", len(orphan_pages), url)
+    return tree
@@ -1,13 +1,56 @@
-from typing import Final
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from functools import cache
 
-from embeddings_service.langchain import RemoteHTTPEmbeddings
 from langchain_core.embeddings import Embeddings
 from langchain_core.language_models import BaseChatModel
 
+from .embeddings import CachedEmbeddings, LocalEmbeddings
 from .settings import settings
 
-embeddings: Final[Embeddings] = RemoteHTTPEmbeddings(
-    base_url=settings.embeddings.base_url, timeout=240
-)
+if TYPE_CHECKING:
+    from .scheduler import TaskQueue
+    from .storage import ScanRepository
 
 llm: Final[BaseChatModel] = ...
+
+
+def _create_embeddings() -> Embeddings:
+    if settings.embeddings.backend == "local":
+        return LocalEmbeddings(
+            settings.embeddings.model,
+            device=settings.embeddings.device,
+            batch_size=settings.embeddings.batch_size,
+            threads=settings.embeddings.threads,
+            backend=settings.embeddings.runtime,
+            onnx_file=settings.embeddings.onnx_file,
+        )
+    from embeddings_service.langchain import RemoteHTTPEmbeddings  # noqa: PLC0415
+
+    return RemoteHTTPEmbeddings(base_url=settings.embeddings.base_url, timeout=240)
+
+
+@cache
+def get_embeddings() -> Embeddings:
+    """Создаёт выбранную в настройках модель эмбеддингов при первом обращении"""
+    return CachedEmbeddings(_create_embeddings(), max_size=settings.embeddings.cache_size)
+
+
+def create_scan_repository() -> ScanRepository:
+    """Создаёт хранилище результатов сканирования, выбранное в настройках"""
+    from .storage import MongoScanRepository, SQLiteScanRepository  # noqa: PLC0415
+
+    if settings.storage.backend == "sqlite":
+        return SQLiteScanRepository(str(settings.storage.sqlite_path))
+    return MongoScanRepository(settings.mongo.url, settings.mongo.database)
+
+
+def create_task_queue() -> TaskQueue:
+    """Создаёт очередь задач сканирования, выбранную в настройках"""
+    from .scheduler import MongoTaskQueue, SQLiteTaskQueue  # noqa: PLC0415
+
+    if settings.scheduler.backend == "mongo":
+        return MongoTaskQueue(settings.mongo.url, settings.mongo.database)
+    return SQLiteTaskQueue(str(settings.scheduler.sqlite_path))
@@ -0,0 +1,170 @@
+"""Поиск страниц с почти одинаковым контентом по MinHash сигнатурам текста"""
+
+from typing import Final
+
+import zlib
+from collections.abc import Iterable
+
+import numpy as np
+from pydantic import BaseModel
+
+from .schemas import FindingLevel, PageFinding
+
+# Количество слов в шингле
+SHINGLE_SIZE = 5
+# Количество хэш-функций MinHash сигнатуры
+NUM_PERMUTATIONS = 128
+# Количество полос LSH, в каждой NUM_PERMUTATIONS // LSH_BANDS значений сигнатуры
+LSH_BANDS = 16
+# Минимальная оценка коэффициента Жаккара для почти одинаковых страниц
+DUPLICATE_THRESHOLD = 0.8
+# Минимальное количество шинглов, у коротких текстов дубли не ищутся
+MIN_SHINGLES = 10
+RANDOM_STATE = 42
+# Простое число Мерсенна для универсального хэширования
+MERSENNE_PRIME: Final[np.uint64] = np.uint64((1 << 61) - 1)
+MAX_HASH: Final[np.uint64] = np.uint64((1 << 32) - 1)
+
+_rng = np.random.default_rng(RANDOM_STATE)
+_PERMUTATIONS: Final[tuple[np.ndarray, np.ndarray]] = (
+    _rng.integers(1, MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64),
+    _rng.integers(0, MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64),
+)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-битные хэши уникальных шинглов из size подряд идущих слов текста"""
+    words = text.lower().split()
+    return np.unique(np.fromiter(
+        (
+            zlib.crc32(" ".join(words[index:index + size]).encode())
+            for index in range(max(len(words) - size + 1, 0))
+        ),
+        dtype=np.uint64,
+    ))
+
+
+def minhash_signature(hashes: np.ndarray) -> np.ndarray:
+    """MinHash сигнатура множества хэшей шинглов.
+    Доля совпадающих значений двух сигнатур оценивает коэффициент Жаккара их множеств.
+    """
+    if not len(hashes):
+        return np.full(NUM_PERMUTATIONS, MAX_HASH, dtype=np.uint32)
+    multipliers, increments = _PERMUTATIONS
+    permuted = (hashes[None, :] * multipliers[:, None] + increments[:, None]) % MERSENNE_PRIME
+    return (permuted & MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """Оценка коэффициента Жаккара по MinHash сигнатурам"""
+    return float(np.mean(signature1 == signature2))
+
+
+class DuplicateMatch(BaseModel):
+    """Страница, почти совпадающая по контенту с проверяемой
+
+    Attributes:
+        key: Ключ (URL адрес) ранее добавленной страницы.
+        similarity: Оценка коэффициента Жаккара шинглов текстов.
+    """
+    key: str
+    similarity: float
+
+
+class DuplicateIndex:
+    """Индекс MinHash сигнатур с LSH корзинами.
+    Сигнатура делится на полосы, страницы с совпадающей полосой становятся
+    кандидатами, поэтому поиск дубля не сравнивает страницу со всеми остальными.
+    Дубль не добавляется в корзины, он привязывается к первой странице кластера.
+
+    Пример использования:
+        duplicates = DuplicateIndex()
+        for url, text in pages:
+            match = duplicates.add(url, text)
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, bands: int = LSH_BANDS) -> None:
+        self.threshold = threshold
+        self._rows = NUM_PERMUTATIONS // bands
+        self._buckets: list[dict[bytes, list[str]]] = [{} for _ in range(bands)]
+        self._signatures: dict[str, np.ndarray] = {}
+        self._clusters: dict[str, list[str]] = {}
+        self._keys: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: np.ndarray) -> Iterable[tuple[dict[bytes, list[str]], bytes]]:
+        for band, buckets in enumerate(self._buckets):
+            yield buckets, signature[band * self._rows:(band + 1) * self._rows].tobytes()
+
+    def find(self, signature: np.ndarray) -> DuplicateMatch | None:
+        """Находит самую похожую страницу индекса с близостью не ниже порога"""
+        candidates = {
+            key for buckets, band_key in self._bands(signature)
+            for key in buckets.get(band_key, ())
+        }
+        best_match: DuplicateMatch | None = None
+        for key in candidates:
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold and (
+                    best_match is None or similarity > best_match.similarity
+            ):
+                best_match = DuplicateMatch(key=key, similarity=similarity)
+        return best_match
+
+    def add(self, key: str, text: str) -> DuplicateMatch | None:
+        """Добавляет страницу в индекс.
+
+        :param key: Ключ страницы, например URL адрес.
+        :param text: Извлечённый текст страницы.
+        :return Ранее добавленная почти одинаковая страница или None.
+            Повторно добавленный ключ (например, два URL с редиректом на одну страницу)
+            пропускается и не считается дублем самого себя.
+        """
+        if key in self._keys:
+            return None
+        self._keys.add(key)
+        hashes = shingle_hashes(text)
+        if len(hashes) < MIN_SHINGLES:
+            return None
+        signature = minhash_signature(hashes)
+        match = self.find(signature)
+        if match is not None:
+            self._clusters[match.key].append(key)
+            return match
+        self._signatures[key] = signature
+        self._clusters[key] = [key]
+        for buckets, band_key in self._bands(signature):
+            buckets.setdefault(band_key, []).append(key)
+        return None
+
+    def clusters(self) -> list[list[str]]:
+        """Кластеры почти одинаковых страниц, первая страница кластера - исходная"""
+        return [keys for keys in self._clusters.values() if len(keys) > 1]
+
+
+def find_duplicate_clusters(
+        texts: dict[str, str], threshold: float = DUPLICATE_THRESHOLD
+) -> list[list[str]]:
+    """Группирует почти одинаковые тексты.
+
+    :param texts: Маппинг ключа (URL адреса) и текста страницы.
+    :param threshold: Минимальная оценка коэффициента Жаккара.
+    :return Кластеры ключей из двух и более страниц.
+    """
+    duplicates = DuplicateIndex(threshold)
+    for key, text in texts.items():
+        duplicates.add(key, text)
+    return duplicates.clusters()
+
+
+def form_duplicate_finding(match: DuplicateMatch) -> PageFinding:
+    """Замечание о странице, контент которой повторяет другую страницу"""
+    return PageFinding(
+        level=FindingLevel.WARNING,
+        message=f"Контент страницы почти полностью совпадает со страницей {match.key}, "
+        f"сходство: {match.similarity * 100:.1f}%",
+        category="duplicates",
+        element="body",
+    )
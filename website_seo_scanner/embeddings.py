@@ -0,0 +1,105 @@
+"""Модели векторных представлений текстов и их кэширование"""
+
+from typing import Literal
+
+import threading
+from collections import OrderedDict
+
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Обёртка над моделью эмбеддингов с LRU кэшем векторов в памяти процесса.
+    Повторные тексты не отправляются в модель, а в одном запросе к модели
+    векторизуются только отсутствующие в кэше тексты.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_size: int) -> None:
+        self._embeddings = embeddings
+        self._max_size = max_size
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, text: str) -> list[float] | None:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+            return vector
+
+    def _put(self, texts: list[str], vectors: list[list[float]]) -> None:
+        with self._lock:
+            for text, vector in zip(texts, vectors, strict=True):
+                self._cache[text] = vector
+                self._cache.move_to_end(text)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = [self._get(text) for text in texts]
+        missing = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors, strict=True) if vector is None
+        ))
+        if missing:
+            missing_vectors = dict(zip(
+                missing, self._embeddings.embed_documents(missing), strict=True
+            ))
+            self._put(missing, list(missing_vectors.values()))
+            vectors = [
+                missing_vectors[text] if vector is None else vector
+                for text, vector in zip(texts, vectors, strict=True)
+            ]
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    def clear(self) -> None:
+        """Очищает кэш векторов"""
+        with self._lock:
+            self._cache.clear()
+
+
+class LocalEmbeddings(Embeddings):
+    """Модель sentence-transformers, загруженная в процесс сканера.
+    SentenceTransformer.encode сортирует тексты по длине перед разбиением на пачки,
+    поэтому короткие тексты не дополняются до длины длинных.
+    """
+
+    def __init__(
+            self,
+            model: str,
+            device: str = "cpu",
+            batch_size: int = 32,
+            threads: int | None = None,
+            backend: Literal["torch", "onnx"] = "torch",
+            onnx_file: str | None = None,
+    ) -> None:
+        import torch  # noqa: PLC0415
+        from sentence_transformers import SentenceTransformer  # noqa: PLC0415
+
+        if threads is not None:
+            torch.set_num_threads(threads)
+        model_kwargs = {"file_name": onnx_file} if backend == "onnx" and onnx_file else None
+        self._model = SentenceTransformer(
+            model, device=device, backend=backend, model_kwargs=model_kwargs
+        )
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        # Модель не рассчитана на одновременные вызовы из нескольких потоков
+        with self._lock:
+            vectors = self._model.encode(
+                texts,
+                batch_size=self._batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
@@ -0,0 +1,151 @@
+"""Извлечение основного текстового контента из HTML разметки страницы"""
+
+from typing import Final
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from enum import StrEnum
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+from pydantic import BaseModel, ConfigDict
+
+from .cleaners import remove_server_code
+from .tracing import traced
+
+# Количество снимков HTML разметки, для которых хранится извлечённый контент
+EXTRACTION_CACHE_SIZE = 16
+# Теги, не содержащие основного контента страницы
+BOILERPLATE_TAGS: Final[list[str]] = [
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "footer", "aside",
+]
+# ARIA роли навигации, подвала и служебных блоков
+BOILERPLATE_ROLES: Final[list[str]] = ["navigation", "contentinfo", "banner", "complementary"]
+HEADING_TAGS: Final[frozenset[str]] = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+LIST_ITEM_TAGS: Final[frozenset[str]] = frozenset({"li", "dt", "dd"})
+# Блочные теги, текст которых выделяется в отдельный блок
+BLOCK_TAGS: Final[frozenset[str]] = HEADING_TAGS | LIST_ITEM_TAGS | frozenset({
+    "p", "div", "section", "article", "main", "header", "body", "blockquote", "pre",
+    "table", "tr", "td", "th", "figure", "figcaption", "address", "details", "summary",
+})
+
+
+class BlockKind(StrEnum):
+    """Тип текстового блока"""
+    HEADING = "heading"
+    PARAGRAPH = "paragraph"
+    LIST_ITEM = "list_item"
+
+
+class TextBlock(BaseModel):
+    """Текстовый блок основного контента
+
+    Attributes:
+        kind: Тип блока.
+        text: Очищенный текст блока.
+        level: Уровень заголовка от 1 до 6, 0 для остальных блоков.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    kind: BlockKind
+    text: str
+    level: int = 0
+
+
+class ExtractedContent(BaseModel):
+    """Основной контент страницы: очищенный текст и его блочная структура"""
+    model_config = ConfigDict(frozen=True)
+
+    text: str
+    blocks: tuple[TextBlock, ...]
+
+    @property
+    def headings(self) -> list[TextBlock]:
+        return [block for block in self.blocks if block.kind == BlockKind.HEADING]
+
+
+# Извлечённый контент по хэшу снимка HTML разметки: сама разметка в кэше не хранится
+_extraction_cache: OrderedDict[bytes, ExtractedContent] = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+
+def extract_content(html: str) -> ExtractedContent:
+    """Извлекает основной контент страницы без навигации, подвала и скриптов.
+    Результат кэшируется по хэшу снимка HTML разметки, поэтому линтинг, формирование
+    страницы и отчёт по одной разметке выполняют преобразование один раз.
+
+    :param html: HTML разметка страницы.
+    :return Очищенный текст и текстовые блоки основного контента.
+    """
+    key = hashlib.blake2b(html.encode(errors="surrogatepass"), digest_size=16).digest()
+    with _extraction_cache_lock:
+        content = _extraction_cache.get(key)
+        if content is not None:
+            _extraction_cache.move_to_end(key)
+            return content
+    content = _extract_content(html)
+    with _extraction_cache_lock:
+        _extraction_cache[key] = content
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+    return content
+
+
+def clear_extraction_cache() -> None:
+    """Очищает кэш извлечённого контента"""
+    with _extraction_cache_lock:
+        _extraction_cache.clear()
+
+
+@traced("page.parse")
+def _extract_content(html: str) -> ExtractedContent:
+    soup = BeautifulSoup(html, "html.parser")
+    body = soup.find("body")
+    if body is None:
+        return ExtractedContent(text="", blocks=())
+    for element in body.find_all(BOILERPLATE_TAGS):
+        element.decompose()
+    for element in body.find_all(attrs={"role": BOILERPLATE_ROLES}):
+        element.decompose()
+    blocks = tuple(_iter_blocks(body))
+    return ExtractedContent(text="\n".join(block.text for block in blocks), blocks=blocks)
+
+
+def _iter_blocks(container: Tag) -> Iterator[TextBlock]:
+    """Группирует строки контейнера по ближайшему блочному тегу в порядке документа"""
+    current_block: Tag | None = None
+    parts: list[str] = []
+    for string in container.descendants:
+        if not isinstance(string, NavigableString) or isinstance(string, PreformattedString):
+            continue
+        block = _find_block(string, container)
+        if block is not current_block:
+            if (text_block := _to_text_block(current_block, parts)) is not None:
+                yield text_block
+            current_block, parts = block, []
+        parts.append(string)
+    if (text_block := _to_text_block(current_block, parts)) is not None:
+        yield text_block
+
+
+def _find_block(string: NavigableString, container: Tag) -> Tag:
+    for parent in string.parents:
+        if parent.name in BLOCK_TAGS or parent is container:
+            return parent
+    return container
+
+
+def _to_text_block(block: Tag | None, parts: list[str]) -> TextBlock | None:
+    if block is None:
+        return None
+    text = remove_server_code(" ".join("".join(parts).split()))
+    if not text:
+        return None
+    if block.name in HEADING_TAGS:
+        return TextBlock(kind=BlockKind.HEADING, text=text, level=int(block.name[1]))
+    if block.name in LIST_ITEM_TAGS:
+        return TextBlock(kind=BlockKind.LIST_ITEM, text=text)
+    return TextBlock(kind=BlockKind.PARAGRAPH, text=text)
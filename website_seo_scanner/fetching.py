@@ -0,0 +1,185 @@
+"""Загрузка HTML страниц без браузера и определение клиентского рендеринга"""
+
+import asyncio
+import logging
+import re
+from collections.abc import AsyncIterator
+from enum import StrEnum
+
+import httpx
+from bs4 import BeautifulSoup, Tag
+from pydantic import BaseModel, HttpUrl, NonNegativeFloat
+
+from .politeness import get_host_scheduler, parse_retry_after
+from .settings import settings
+from .stealth import generate_extra_http_headers, generate_user_agent
+from .tracing import traced
+
+# Минимальная длина видимого текста body для страниц с серверным рендерингом
+MIN_BODY_TEXT_LENGTH = 200
+# Идентификаторы корневых контейнеров SPA приложений
+SPA_ROOT_IDS: tuple[str, ...] = ("root", "app", "__next", "__nuxt", "___gatsby", "svelte")
+# Атрибуты, выдающие клиентский рендеринг
+SPA_ROOT_ATTRIBUTES: tuple[str, ...] = ("ng-app", "ng-version", "data-reactroot", "data-v-app")
+# Подсказки в <noscript> о необходимости JavaScript
+NOSCRIPT_HINTS = re.compile(
+    r"enable javascript|javascript is (required|disabled)|включите javascript|"
+    r"требуется javascript|javascript отключен",
+    flags=re.IGNORECASE,
+)
+# Во сколько раз больше текста требуется от страницы с подсказками в <noscript>
+NOSCRIPT_TEXT_FACTOR = 5
+# Теги, текст которых не учитывается как видимый контент
+INVISIBLE_TAGS: tuple[str, ...] = ("script", "style", "noscript", "template", "svg")
+
+logger = logging.getLogger(__name__)
+
+
+class FetchMode(StrEnum):
+    """Режимы загрузки страниц"""
+    BROWSER = "browser"
+    HTTP = "http"
+    HYBRID = "hybrid"
+
+
+class FetchedPage(BaseModel):
+    """Страница, загруженная HTTP клиентом
+
+    Attributes:
+        url: Запрошенный URL адрес страницы.
+        status: HTTP статус ответа.
+        html: HTML разметка страницы.
+        elapsed: Время получения ответа в секундах.
+    """
+    url: HttpUrl
+    status: int
+    html: str
+    elapsed: NonNegativeFloat
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Создаёт асинхронный HTTP клиент с пулом соединений.
+
+    :return Сконфигурированный HTTP клиент.
+    """
+    headers = generate_extra_http_headers()
+    # Кодировки ответа выбирает сам httpx в зависимости от установленных декодеров
+    headers.pop("Accept-Encoding", None)
+    headers["User-Agent"] = generate_user_agent()
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=settings.fetch.timeout,
+        follow_redirects=True,
+        verify=False,  # noqa: S501
+        limits=httpx.Limits(
+            max_connections=settings.fetch.max_connections,
+            max_keepalive_connections=settings.fetch.max_connections,
+        ),
+    )
+
+
+@traced("page.fetch")
+async def fetch_html(client: httpx.AsyncClient, url: HttpUrl) -> FetchedPage | None:
+    """Загружает HTML разметку страницы с соблюдением ограничений хоста.
+    Запрещённые robots.txt страницы пропускаются, при ответах 429 и 503
+    запрос повторяется после паузы.
+
+    :param client: HTTP клиент.
+    :param url: URL адрес страницы.
+    :return Загруженная страница или None, если ответ не является HTML документом.
+    """
+    host_scheduler = get_host_scheduler()
+    if not await host_scheduler.is_allowed(str(url), client):
+        logger.info("Page %s is disallowed by robots.txt", url)
+        return None
+    for attempt in range(settings.politeness.max_retries + 1):
+        async with host_scheduler.slot(str(url)) as slot:
+            try:
+                response = await client.get(str(url))
+            except httpx.HTTPError:
+                logger.warning("Failed to fetch page %s", url, exc_info=True)
+                slot.record(None, failed=True)
+                return None
+            slot.record(
+                response.status_code, parse_retry_after(response.headers.get("retry-after"))
+            )
+        if not slot.is_throttled or attempt == settings.politeness.max_retries:
+            break
+        logger.info("Page %s responded with %s, retrying", url, response.status_code)
+    if "html" not in response.headers.get("content-type", ""):
+        return None
+    return FetchedPage(
+        url=url,
+        status=response.status_code,
+        html=response.text,
+        elapsed=response.elapsed.total_seconds(),
+    )
+
+
+async def fetch_pages(
+        client: httpx.AsyncClient, urls: list[HttpUrl], max_concurrency: int | None = None
+) -> list[FetchedPage]:
+    """Параллельно загружает HTML разметку страниц.
+
+    :param client: HTTP клиент.
+    :param urls: URL адреса страниц.
+    :param max_concurrency: Максимальное количество одновременных запросов.
+    :return Успешно загруженные страницы.
+    """
+    return [
+        fetched_page
+        async for _, fetched_page in iter_fetched_pages(client, urls, max_concurrency)
+        if fetched_page is not None
+    ]
+
+
+async def iter_fetched_pages(
+        client: httpx.AsyncClient, urls: list[HttpUrl], max_concurrency: int | None = None
+) -> AsyncIterator[tuple[HttpUrl, FetchedPage | None]]:
+    """Параллельно загружает страницы, отдавая их по мере готовности.
+
+    :param client: HTTP клиент.
+    :param urls: URL адреса страниц.
+    :param max_concurrency: Максимальное количество одновременных запросов.
+    :return URL адрес и загруженная страница, None если страницу не удалось загрузить.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.fetch.max_concurrency)
+
+    async def fetch(url: HttpUrl) -> tuple[HttpUrl, FetchedPage | None]:
+        async with semaphore:
+            fetched_page = await fetch_html(client, url)
+        if fetched_page is None or fetched_page.status >= httpx.codes.BAD_REQUEST:
+            return url, None
+        return url, fetched_page
+
+    for future in asyncio.as_completed([fetch(url) for url in urls]):
+        yield await future
+
+
+def _is_empty_spa_root(body: Tag) -> bool:
+    roots = [
+        *(body.find(id=root_id) for root_id in SPA_ROOT_IDS),
+        *(body.find(attrs={attribute: True}) for attribute in SPA_ROOT_ATTRIBUTES),
+    ]
+    return any(root is not None and not root.get_text(strip=True) for root in roots)
+
+
+def requires_rendering(html: str) -> bool:
+    """Проверяет, нужен ли браузер для получения контента страницы.
+    Признаки клиентского рендеринга: пустой body, пустой корневой контейнер SPA,
+    подсказки о необходимости JavaScript в <noscript> при малом количестве текста.
+
+    :param html: HTML разметка, полученная без выполнения JavaScript.
+    :return True если страница рендерится на клиенте.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    body = soup.find("body")
+    if body is None or _is_empty_spa_root(body):
+        return True
+    has_noscript_hint = any(
+        NOSCRIPT_HINTS.search(noscript.get_text()) for noscript in body.find_all("noscript")
+    )
+    for tag in body.find_all(list(INVISIBLE_TAGS)):
+        tag.decompose()
+    min_text_length = MIN_BODY_TEXT_LENGTH * (NOSCRIPT_TEXT_FACTOR if has_noscript_hint else 1)
+    return len(body.get_text(" ", strip=True)) < min_text_length
@@ -0,0 +1,77 @@
+"""Лемматизаторы текстов, загружаемые один раз на процесс"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from functools import cache, lru_cache
+
+from .corpora import CorpusNotFoundError, ensure_corpus
+from .settings import settings
+
+# Максимальное количество запоминаемых лемм
+LEMMA_CACHE_SIZE = 100_000
+# Компоненты spaCy конвейера, не нужные для лемматизации
+SPACY_DISABLED_PIPES: tuple[str, ...] = ("parser", "ner", "senter")
+
+
+class Lemmatizer(ABC):
+    """Лемматизатор очищенных текстов (только буквы и пробелы)"""
+
+    @abstractmethod
+    def lemmatize_texts(self, texts: Iterable[str]) -> Iterator[list[tuple[str, str]]]:
+        """Разбивает тексты на токены и лемматизирует их.
+
+        :param texts: Очищенные тексты.
+        :return Пары (токен, лемма) для каждого текста в исходном порядке.
+        """
+
+
+class WordNetLemmatizer(Lemmatizer):
+    """Лемматизатор NLTK WordNet. Подходит только для английского языка,
+    русские токены возвращаются без изменений.
+    """
+
+    def __init__(self) -> None:
+        from nltk.stem import WordNetLemmatizer as NLTKWordNetLemmatizer  # noqa: PLC0415
+
+        ensure_corpus("wordnet")
+        self._lemmatize = lru_cache(maxsize=LEMMA_CACHE_SIZE)(
+            NLTKWordNetLemmatizer().lemmatize
+        )
+
+    def lemmatize_texts(self, texts: Iterable[str]) -> Iterator[list[tuple[str, str]]]:
+        lemmatize = self._lemmatize
+        for text in texts:
+            yield [(token, lemmatize(token)) for token in text.split()]
+
+
+class SpacyLemmatizer(Lemmatizer):
+    """Лемматизатор spaCy с учётом морфологии русского языка.
+    Тексты обрабатываются пачками через nlp.pipe, при n_process > 1 в нескольких процессах.
+    """
+
+    def __init__(self, model: str, n_process: int = 1, batch_size: int = 256) -> None:
+        import spacy  # noqa: PLC0415
+
+        try:
+            self._nlp = spacy.load(model, exclude=list(SPACY_DISABLED_PIPES))
+        except OSError as exc:
+            raise CorpusNotFoundError(
+                f"spaCy model '{model}' is not installed, "
+                "run 'python -m website_seo_scanner.corpora' to download it"
+            ) from exc
+        self._n_process = n_process
+        self._batch_size = batch_size
+
+    def lemmatize_texts(self, texts: Iterable[str]) -> Iterator[list[tuple[str, str]]]:
+        for doc in self._nlp.pipe(texts, batch_size=self._batch_size, n_process=self._n_process):
+            yield [(token.text, token.lemma_.lower()) for token in doc if not token.is_space]
+
+
+@cache
+def get_lemmatizer() -> Lemmatizer:
+    """Создаёт выбранный в настройках лемматизатор при первом обращении"""
+    if settings.nlp.lemmatizer == "spacy":
+        return SpacyLemmatizer(
+            settings.nlp.spacy_model, settings.nlp.n_process, settings.nlp.batch_size
+        )
+    return WordNetLemmatizer()
@@ -0,0 +1,151 @@
+"""Граф внутренних ссылок сайта: PageRank, глубина клика и страницы-сироты"""
+
+from collections.abc import Iterable
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+from .tree import TreeNode, parse_url_path
+
+# Коэффициент затухания PageRank
+DAMPING_FACTOR = 0.85
+# Точность и максимальное количество итераций степенного метода
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_MAX_ITERATIONS = 100
+
+
+def _get_path_key(url: str) -> str:
+    """Ключ страницы в дереве сайта - путь URL адреса без слэшей по краям"""
+    return "/".join(parse_url_path(url))
+
+
+class LinkGraph:
+    """Граф внутренних ссылок в виде разреженной CSR матрицы смежности.
+    Строка - страница со ссылками, столбец - страница, на которую ссылаются.
+    """
+
+    def __init__(self, urls: list[str], adjacency: sparse.csr_matrix, complete: bool) -> None:
+        self.urls = urls
+        self.adjacency = adjacency
+        self.complete = complete
+        self._index = {url: index for index, url in enumerate(urls)}
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def inlinks(self) -> np.ndarray:
+        """Количество страниц, ссылающихся на каждую страницу"""
+        return np.asarray(self.adjacency.sum(axis=0)).ravel().astype(np.int64)
+
+    def pagerank(
+            self,
+            damping: float = DAMPING_FACTOR,
+            tolerance: float = PAGERANK_TOLERANCE,
+            max_iterations: int = PAGERANK_MAX_ITERATIONS,
+    ) -> np.ndarray:
+        """Внутренний PageRank страниц степенным методом.
+        Вес страниц без исходящих ссылок равномерно распределяется по всем страницам.
+        """
+        size = len(self)
+        if not size:
+            return np.empty(0)
+        out_degree = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        is_dangling = out_degree == 0
+        inverse_degree = np.divide(1, out_degree, out=np.zeros(size), where=~is_dangling)
+        transition = (sparse.diags(inverse_degree) @ self.adjacency).T.tocsr()
+        ranks = np.full(size, 1 / size)
+        for _ in range(max_iterations):
+            dangling_rank = ranks[is_dangling].sum()
+            new_ranks = damping * (transition @ ranks) + (
+                damping * dangling_rank + 1 - damping
+            ) / size
+            converged = np.abs(new_ranks - ranks).sum() < tolerance
+            ranks = new_ranks
+            if converged:
+                break
+        return ranks
+
+    def click_depth(self, home_url: str) -> np.ndarray:
+        """Минимальное количество переходов от главной страницы, inf для недостижимых"""
+        home = self._index.get(home_url)
+        if home is None:
+            return np.full(len(self), np.inf)
+        return shortest_path(self.adjacency, directed=True, unweighted=True, indices=home)
+
+    def annotate_tree(self, tree: TreeNode) -> None:
+        """Записывает PageRank, глубину клика и количество входящих ссылок в узлы дерева.
+        Страницы графа сопоставляются узлам по пути URL адреса. Если граф полный,
+        узлы без страниц в графе получают 0 входящих ссылок.
+        """
+        pageranks = self.pagerank()
+        depths = self.click_depth(self.urls[0]) if self.urls else np.empty(0)
+        inlinks = self.inlinks()
+        pages: dict[str, list[int]] = {}
+        for index, url in enumerate(self.urls):
+            pages.setdefault(_get_path_key(url), []).append(index)
+        for node in tree.iter_nodes():
+            indices = pages.get(_get_path_key(str(node.url)))
+            if indices is None:
+                if self.complete and node is not tree:
+                    node.inlinks = 0
+                continue
+            node.pagerank = float(pageranks[indices].sum())
+            depth = depths[indices].min()
+            node.click_depth = None if np.isinf(depth) else int(depth)
+            node.inlinks = int(inlinks[indices].sum())
+
+
+class LinkGraphBuilder:
+    """Накапливает внутренние ссылки по мере обработки страниц.
+    Первая добавленная страница считается главной.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self._sources: list[int] = []
+        self._targets: list[int] = []
+        self.complete = False
+
+    def _get_index(self, url: str) -> int:
+        return self._index.setdefault(url, len(self._index))
+
+    def add_links(self, url: str, links: Iterable[str]) -> None:
+        """Добавляет ссылки страницы url на страницы links"""
+        source = self._get_index(url)
+        for link in links:
+            target = self._get_index(link)
+            if target != source:
+                self._sources.append(source)
+                self._targets.append(target)
+
+    def build(self) -> LinkGraph:
+        """Формирует CSR матрицу смежности без повторных рёбер"""
+        size = len(self._index)
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(self._sources)), (self._sources, self._targets)), shape=(size, size)
+        )
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1
+        urls = [""] * size
+        for url, index in self._index.items():
+            urls[index] = url
+        return LinkGraph(urls, adjacency, self.complete)
+
+
+def find_unlinked_pages(graph: LinkGraph, urls: Iterable[str]) -> list[str]:
+    """Страницы urls, на которые нет ссылок в графе. Страницы сопоставляются
+    по пути URL адреса, главная страница сайта не учитывается.
+    """
+    inlinks: dict[str, int] = {}
+    for url, count in zip(graph.urls, graph.inlinks(), strict=True):
+        key = _get_path_key(url)
+        inlinks[key] = inlinks.get(key, 0) + int(count)
+    return [url for url in urls if _get_path_key(url) and not inlinks.get(_get_path_key(url))]
+
+
+def find_orphan_pages(tree: TreeNode) -> list[TreeNode]:
+    """Страницы дерева (листья из sitemap.xml), на которые нет внутренних ссылок.
+    Определяются только по дереву, размеченному полным графом ссылок.
+    """
+    return [node for node in tree.iter_leaves() if node.inlinks == 0 and node is not tree]
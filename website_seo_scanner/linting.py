@@ -2,15 +2,15 @@ from typing import Final
 
 import logging
 import re
-from enum import StrEnum
+from collections.abc import Callable
 
-import html2text
 from bs4 import BeautifulSoup
 from playwright.async_api import Page
-from pydantic import BaseModel
 
-from .cleaners import clean
-from .nlp import compare_texts
+from .duplicates import DuplicateIndex, form_duplicate_finding
+from .extraction import ExtractedContent, extract_content
+from .schemas import FindingLevel, PageFinding
+from .tracing import span
 
 OPTIMAL_TITLE_LENGTH = 55
 OPTIMAL_TITLE_DELTA = 10
@@ -25,32 +25,6 @@ GREAT_SEMANTIC_TAG_COUNT = 4
 logger = logging.getLogger(__name__)
 
 
-class FindingLevel(StrEnum):
-    """Уровни значимости замечания"""
-    CRITICAL = "critical"
-    ERROR = "error"
-    WARNING = "warning"
-    INFO = "info"
-    OPTIMAL = "optimal"
-    GOOD = "good"
-    GREAT = "great"
-
-
-class PageFinding(BaseModel):
-    """Проблема на странице
-
-    Attributes:
-        level: Значимость замечания.
-        message: Человеко-читаемое сообщение.
-        category: Категория к которой относится замечание, например: 'heading', 'title', ...
-        element: Элемент страницы к которому относится замечание.
-    """
-    level: FindingLevel
-    message: str
-    category: str
-    element: str
-
-
 def check_title(soup: BeautifulSoup) -> list[PageFinding]:
     """Проверка тега <title>"""
     findings: list[PageFinding] = []
@@ -272,13 +246,19 @@ def check_semantic_structure(soup: BeautifulSoup) -> list[PageFinding]:
     return findings
 
 
-def check_meta_and_body_relevance(soup: BeautifulSoup) -> list[PageFinding]:
-    """Проверяет сематическое соответствие между meta-описанием и контентом на странице"""
+def check_meta_and_body_relevance(
+        soup: BeautifulSoup, content: ExtractedContent
+) -> list[PageFinding]:
+    """Проверяет сематическое соответствие между meta-описанием и контентом на странице.
+
+    :param soup: Разобранная HTML разметка страницы.
+    :param content: Основной контент, извлечённый из той же разметки.
+    """
     findings: list[PageFinding] = []
     meta_description = soup.find("meta", attrs={"name": "description"})
     if not meta_description:
         return findings
-    content = meta_description.get("content", "").strip()
+    description = meta_description.get("content", "").strip()
     body = soup.find("body")
     if body is None:
         return [PageFinding(
@@ -287,8 +267,10 @@ def check_meta_and_body_relevance(soup: BeautifulSoup) -> list[PageFinding]:
             category="semantic",
             element="body"
         )]
-    text = clean(html2text.html2text(str(body)))
-    similarity_score = compare_texts(content, text)
+    # Модуль nlp загружает тяжёлые ML зависимости, поэтому импортируется при первой проверке
+    from .nlp import compare_texts  # noqa: PLC0415
+
+    similarity_score = compare_texts(description, content.text)
     if CRITICAL_RELEVANCE_SCORE < similarity_score < SHORT_RELEVANCE_SCORE:
         findings.append(PageFinding(
             level=FindingLevel.INFO,
@@ -316,20 +298,51 @@ def check_meta_and_body_relevance(soup: BeautifulSoup) -> list[PageFinding]:
     return findings
 
 
-async def lint_page(page: Page) -> list[PageFinding]:
+# Правила линтинга, которым достаточно разобранной HTML разметки
+LINT_RULES: Final[list[Callable[[BeautifulSoup], list[PageFinding]]]] = [
+    check_title,
+    check_meta_description,
+    check_heading,
+    check_images,
+    check_semantic_structure,
+]
+
+
+def lint_html(
+        html: str, url: str | None = None, duplicates: DuplicateIndex | None = None
+) -> list[PageFinding]:
+    """Выполняет SEO линтинг HTML разметки страницы.
+    Для почти полного дубля уже проверенной страницы вместо проверки релевантности,
+    требующей эмбеддингов, добавляется замечание о дублировании контента.
+
+    :param html: HTML разметка страницы.
+    :param url: URL адрес страницы, ключ в индексе дублей.
+    :param duplicates: Индекс страниц сканирования для поиска дублей.
+    :return Список найденных SEO замечаний страницы.
+    """
+    with span("lint.parse"):
+        soup = BeautifulSoup(html, "html.parser")
+    findings: list[PageFinding] = []
+    for check in LINT_RULES:
+        with span(f"lint.{check.__name__}"):
+            findings.extend(check(soup))
+    content = extract_content(html)
+    if duplicates is not None and url is not None:
+        with span("lint.duplicates"):
+            match = duplicates.add(url, content.text)
+        if match is not None:
+            findings.append(form_duplicate_finding(match))
+            return findings
+    with span("lint.check_meta_and_body_relevance"):
+        findings.extend(check_meta_and_body_relevance(soup, content))
+    return findings
+
+
+async def lint_page(page: Page, duplicates: DuplicateIndex | None = None) -> list[PageFinding]:
     """Выполняет SEO линтинг страницы. Возвращает найденные замечания.
 
     :param page: Объект Playwright страницы.
+    :param duplicates: Индекс страниц сканирования для поиска дублей.
     :return Список найденных SEO замечаний страницы.
     """
-    await page.wait_for_selector("body:not(:empty)")
-    content = await page.content()
-    soup = BeautifulSoup(content, "html.parser")
-    return [
-        *check_title(soup),
-        *check_meta_description(soup),
-        *check_heading(soup),
-        *check_images(soup),
-        *check_semantic_structure(soup),
-        *check_meta_and_body_relevance(soup),
-    ]
+    return lint_html(await page.content(), page.url, duplicates)
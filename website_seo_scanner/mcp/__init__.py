@@ -0,0 +1,7 @@
+__all__ = (
+    "ScannerState",
+    "mcp",
+)
+
+from .server import mcp
+from .state import ScannerState
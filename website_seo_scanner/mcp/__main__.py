@@ -0,0 +1,7 @@
+from ..settings import settings
+from .server import mcp
+
+if settings.mcp.transport == "http":
+    mcp.run(transport="http", host=settings.mcp.host, port=settings.mcp.port)
+else:
+    mcp.run(transport="stdio")
@@ -0,0 +1,113 @@
+"""MCP сервер с инструментами SEO сканера"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastmcp import Context, FastMCP
+from pydantic import HttpUrl
+
+from ..browser import BrowserPool
+from ..fetching import create_http_client
+from ..report import PageReport, form_page_report
+from ..schemas import PageFinding, SemanticCore
+from ..tree import PRIORITY_KEYWORDS
+from ..tree import extract_key_pages as select_key_pages
+from .state import ScannerState
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[ScannerState]:  # noqa: ARG001
+    async with BrowserPool() as browser_pool, create_http_client() as http_client:
+        yield ScannerState(browser_pool, http_client)
+
+
+def get_state(ctx: Context) -> ScannerState:
+    return ctx.request_context.lifespan_context
+
+
+mcp = FastMCP(name="Website SEO scanner", lifespan=lifespan)
+
+
+@mcp.tool
+async def build_site_tree(url: HttpUrl, ctx: Context, max_depth: int | None = 3) -> str:
+    """Строит дерево структуры сайта по sitemap.xml.
+
+    :param url: URL адрес сайта.
+    :param max_depth: Максимальная глубина отображаемого дерева.
+    :return Дерево сайта в человеко-читаемом формате.
+    """
+    tree = await get_state(ctx).get_site_tree(url)
+    return tree.to_string(max_depth=max_depth)
+
+
+@mcp.tool
+async def extract_key_pages(url: HttpUrl, ctx: Context, max_result: int = 15) -> list[HttpUrl]:
+    """Извлекает URL адреса ключевых страниц сайта.
+
+    :param url: URL адрес сайта.
+    :param max_result: Максимальное количество страниц.
+    :return URL адреса ключевых страниц.
+    """
+    tree = await get_state(ctx).get_site_tree(url)
+    return select_key_pages(tree, list(PRIORITY_KEYWORDS), max_result=max_result)
+
+
+@mcp.tool
+async def lint_page(url: HttpUrl, ctx: Context) -> list[PageFinding]:
+    """Проверяет страницу на SEO ошибки.
+
+    :param url: URL адрес страницы.
+    :return Найденные замечания.
+    """
+    site_page = await get_state(ctx).get_site_page(url)
+    return site_page.findings
+
+
+@mcp.tool
+async def get_page_report(url: HttpUrl, ctx: Context) -> PageReport:
+    """Формирует SEO отчёт по странице: время рендеринга, замечания
+    и релевантность meta-описания контенту.
+
+    :param url: URL адрес страницы.
+    :return Отчёт по странице.
+    """
+    async with get_state(ctx).browser_pool.page() as page:
+        return await form_page_report(page, str(url))
+
+
+@mcp.tool
+async def get_semantic_core(url: HttpUrl, ctx: Context, top_n: int = 10) -> SemanticCore:
+    """Извлекает семантическое ядро страницы: ключевые слова и фразы.
+
+    :param url: URL адрес страницы.
+    :param top_n: Количество ключевых слов.
+    :return Семантическое ядро страницы.
+    """
+    from ..nlp import extract_keyphrases, extract_keywords  # noqa: PLC0415
+
+    site_page = await get_state(ctx).get_site_page(url)
+    text = site_page.content.text
+    keywords, keyphrases = await asyncio.gather(
+        asyncio.to_thread(extract_keywords, text, top_n),
+        asyncio.to_thread(extract_keyphrases, text),
+    )
+    return SemanticCore(keywords=keywords, keyphrases=keyphrases, thematic_clusters=[])
+
+
+@mcp.tool
+async def get_site_semantic_core(
+        url: HttpUrl, ctx: Context, max_pages: int = 15, top_n: int = 20
+) -> SemanticCore:
+    """Строит семантическое ядро сайта по его ключевым страницам:
+    ключевые слова и фразы сайта и тематические кластеры страниц.
+
+    :param url: URL адрес сайта.
+    :param max_pages: Максимальное количество ключевых страниц.
+    :param top_n: Количество ключевых слов и фраз сайта и каждого кластера.
+    :return Семантическое ядро сайта.
+    """
+    state = get_state(ctx)
+    tree = await state.get_site_tree(url)
+    page_urls = select_key_pages(tree, list(PRIORITY_KEYWORDS), max_result=max_pages)
+    return await state.build_semantic_core(url, page_urls, top_n)
@@ -0,0 +1,112 @@
+"""Общее состояние MCP сервера, сохраняемое между вызовами инструментов"""
+
+from typing import TYPE_CHECKING
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+
+import httpx
+from pydantic import HttpUrl
+
+from ..browser import BrowserPool
+from ..crawler import discover_site_tree
+from ..fetching import fetch_html, requires_rendering
+from ..schemas import SemanticCore, SitePage
+from ..services import form_rendered_site_page, form_static_site_page
+from ..settings import settings
+from ..tree import TreeNode
+
+if TYPE_CHECKING:
+    from ..semantic_core import SemanticCoreBuilder
+
+
+class ScannerState:
+    """Прогретые ресурсы сканера: браузер, HTTP клиент, кэши деревьев сайтов и страниц.
+    Параллельные запросы одного и того же дерева или страницы выполняются один раз.
+    """
+
+    def __init__(self, browser_pool: BrowserPool, http_client: httpx.AsyncClient) -> None:
+        self.browser_pool = browser_pool
+        self.http_client = http_client
+        self._trees: dict[str, tuple[float, TreeNode]] = {}
+        self._pages: OrderedDict[str, SitePage] = OrderedDict()
+        self._semantic_cores: OrderedDict[str, SemanticCoreBuilder] = OrderedDict()
+        # Блокировка существует, пока её удерживают или ожидают
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _get_lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def get_site_tree(self, url: HttpUrl) -> TreeNode:
+        """Получает дерево сайта из кэша или строит его по sitemap.xml либо обходом ссылок"""
+        key = str(url)
+        async with self._get_lock(f"tree:{key}"):
+            cached = self._trees.get(key)
+            if cached is not None and time.monotonic() - cached[0] < settings.mcp.tree_cache_ttl:
+                return cached[1]
+            tree = await discover_site_tree(url, self.http_client)
+            self._trees[key] = (time.monotonic(), tree)
+            return tree
+
+    async def get_site_page(self, url: HttpUrl) -> SitePage:
+        """Получает просканированную страницу из кэша или сканирует её.
+        Браузер используется только для страниц с клиентским рендерингом.
+        """
+        key = str(url)
+        async with self._get_lock(f"page:{key}"):
+            site_page = self._pages.get(key)
+            if site_page is None:
+                site_page = await self._scan_page(url)
+                self._pages[key] = site_page
+                while len(self._pages) > settings.mcp.page_cache_size:
+                    self._pages.popitem(last=False)
+            self._pages.move_to_end(key)
+            return site_page
+
+    async def _scan_page(self, url: HttpUrl) -> SitePage:
+        fetched_page = await fetch_html(self.http_client, url)
+        if (
+            fetched_page is not None
+            and fetched_page.status < httpx.codes.BAD_REQUEST
+            and not requires_rendering(fetched_page.html)
+        ):
+            return form_static_site_page(fetched_page)
+        async with self.browser_pool.page() as page:
+            return await form_rendered_site_page(page, str(url))
+
+    async def build_semantic_core(
+            self, url: HttpUrl, page_urls: list[HttpUrl], top_n: int
+    ) -> SemanticCore:
+        """Строит семантическое ядро сайта. Корпус сайта сохраняется между вызовами,
+        поэтому в него добавляются только страницы, которых там ещё нет.
+        """
+        from ..semantic_core import SemanticCoreBuilder  # noqa: PLC0415
+
+        site_pages = await asyncio.gather(
+            *(self.get_site_page(page_url) for page_url in page_urls)
+        )
+        key = str(url)
+        async with self._get_lock(f"semantic_core:{key}"):
+            builder = self._semantic_cores.get(key)
+            if builder is None:
+                builder = self._semantic_cores[key] = SemanticCoreBuilder()
+                while len(self._semantic_cores) > settings.mcp.semantic_core_cache_size:
+                    self._semantic_cores.popitem(last=False)
+            self._semantic_cores.move_to_end(key)
+            new_pages = [site_page for site_page in site_pages if site_page.url not in builder]
+            if new_pages:
+                await asyncio.to_thread(builder.add_pages, new_pages)
+            return await asyncio.to_thread(builder.build, top_n)
+
+    def clear(self) -> None:
+        """Очищает кэши деревьев сайтов, страниц и корпуса семантических ядер"""
+        self._trees.clear()
+        self._pages.clear()
+        self._semantic_cores.clear()
@@ -0,0 +1,259 @@
+"""Захват сетевых ресурсов страницы и проверки тяжёлых ассетов"""
+
+from typing import Final, Self
+
+import asyncio
+import logging
+from types import TracebackType
+
+import polars as pl
+from playwright.async_api import Error, Page, Request
+
+from .schemas import FindingLevel, PageFinding
+
+# JS скрипт для получения ресурсов, блокирующих рендеринг страницы
+JS_RENDER_BLOCKING_SCRIPT = """
+() => performance
+    .getEntriesByType('resource')
+    .filter(entry => entry.renderBlockingStatus === 'blocking')
+    .map(entry => entry.name)
+"""
+# MIME типы текстовых ресурсов, которые должны передаваться в сжатом виде
+COMPRESSIBLE_MIME_PATTERN = (
+    r"^(text/|application/(javascript|x-javascript|json|ld\+json|xml|manifest\+json)|image/svg\+xml)"
+)
+COMPRESSION_ENCODINGS: tuple[str, ...] = ("gzip", "br", "deflate", "zstd")
+# Минимальный размер ресурса в байтах, начиная с которого имеет смысл сжатие
+MIN_COMPRESSIBLE_SIZE = 1024
+# Максимальный допустимый размер изображения в байтах
+MAX_IMAGE_SIZE = 200 * 1024
+# Максимальный допустимый вес страницы со всеми ресурсами в байтах
+MAX_PAGE_WEIGHT = 3 * 1024 * 1024
+# Типы ресурсов, для которых ожидаются заголовки кэширования
+CACHEABLE_RESOURCE_TYPES: tuple[str, ...] = ("stylesheet", "script", "image", "font")
+# Количество примеров URL в сообщении замечания
+MAX_EXAMPLES = 5
+# Схема колоночной таблицы ресурсов страницы
+RESOURCE_SCHEMA: Final[dict[str, pl.DataType]] = {
+    "url": pl.String(),
+    "resource_type": pl.Categorical(),
+    "status": pl.UInt16(),
+    "mime_type": pl.Categorical(),
+    "transfer_size": pl.UInt64(),
+    "content_encoding": pl.String(),
+    "cache_control": pl.String(),
+    "expires": pl.String(),
+    "start_time": pl.Float64(),
+    "duration": pl.Float64(),
+    "render_blocking": pl.Boolean(),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceCapture:
+    """Записывает все запросы и ответы страницы в колоночную таблицу.
+    Записываются только запросы, завершившиеся внутри блока: отложенно загружаемые
+    ресурсы попадают в таблицу, если блок охватывает и работу со страницей после загрузки.
+
+    Пример использования:
+        async with ResourceCapture(page) as capture:
+            await page.goto(url)
+        findings = lint_resources(capture.resources)
+    """
+
+    def __init__(self, page: Page) -> None:
+        self._page = page
+        self._records: list[tuple[object, ...]] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._resources: pl.DataFrame = pl.DataFrame(schema=RESOURCE_SCHEMA)
+
+    @property
+    def resources(self) -> pl.DataFrame:
+        """Таблица ресурсов, загруженных страницей"""
+        return self._resources
+
+    async def __aenter__(self) -> Self:
+        self._records.clear()
+        self._page.on("requestfinished", self._on_request_finished)
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self._page.remove_listener("requestfinished", self._on_request_finished)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if exc_type is not None:
+            return
+        try:
+            render_blocking_urls = set(await self._page.evaluate(JS_RENDER_BLOCKING_SCRIPT))
+        except Error:
+            logger.warning("Failed to collect render blocking resources of %s", self._page.url)
+            render_blocking_urls = set()
+        self._resources = self._build_frame(render_blocking_urls)
+
+    def _on_request_finished(self, request: Request) -> None:
+        task = asyncio.create_task(self._record(request))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_record_done)
+
+    def _on_record_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and (error := task.exception()) is not None:
+            logger.warning("Failed to record resource of %s: %s", self._page.url, error)
+
+    async def _record(self, request: Request) -> None:
+        response = await request.response()
+        if response is None:
+            return
+        sizes = await request.sizes()
+        headers = await response.all_headers()
+        timing = request.timing
+        self._records.append((
+            request.url,
+            request.resource_type,
+            response.status,
+            headers.get("content-type", "").split(";")[0].strip().lower(),
+            sizes["responseBodySize"] + sizes["responseHeadersSize"],
+            headers.get("content-encoding"),
+            headers.get("cache-control"),
+            headers.get("expires"),
+            timing["startTime"],
+            max(timing["responseEnd"], 0),
+        ))
+
+    def _build_frame(self, render_blocking_urls: set[str]) -> pl.DataFrame:
+        columns = list(RESOURCE_SCHEMA)[:-1]
+        frame = pl.DataFrame(
+            self._records,
+            schema={column: RESOURCE_SCHEMA[column] for column in columns},
+            orient="row",
+        )
+        return frame.with_columns(
+            (pl.col("start_time") - pl.col("start_time").min()).alias("start_time"),
+            pl.col("url").is_in(list(render_blocking_urls)).alias("render_blocking"),
+        ).sort("start_time")
+
+
+def _format_examples(urls: list[str]) -> str:
+    examples = ", ".join(urls[:MAX_EXAMPLES])
+    return f"{examples} и ещё {len(urls) - MAX_EXAMPLES}" if len(urls) > MAX_EXAMPLES else examples
+
+
+def _successful(resources: pl.DataFrame) -> pl.DataFrame:
+    return resources.filter(pl.col("status").is_between(200, 299))
+
+
+def check_compression(resources: pl.DataFrame) -> list[PageFinding]:
+    """Проверка сжатия текстовых ресурсов"""
+    uncompressed = _successful(resources).filter(
+        pl.col("mime_type").cast(pl.String).str.contains(COMPRESSIBLE_MIME_PATTERN),
+        pl.col("transfer_size") >= MIN_COMPRESSIBLE_SIZE,
+        ~pl.col("content_encoding").fill_null("").is_in(COMPRESSION_ENCODINGS),
+    )
+    if uncompressed.is_empty():
+        return [PageFinding(
+            level=FindingLevel.GOOD,
+            message="Все текстовые ресурсы передаются в сжатом виде",
+            category="network",
+            element="resource"
+        )]
+    return [PageFinding(
+        level=FindingLevel.WARNING,
+        message=f"Найдено {uncompressed.height} несжатых текстовых ресурсов "
+        f"({uncompressed["transfer_size"].sum() / 1024:.1f} КБ): "
+        f"{_format_examples(uncompressed["url"].to_list())}",
+        category="network",
+        element="resource"
+    )]
+
+
+def check_image_sizes(resources: pl.DataFrame) -> list[PageFinding]:
+    """Проверка размера загружаемых изображений"""
+    heavy_images = _successful(resources).filter(
+        pl.col("resource_type") == "image", pl.col("transfer_size") > MAX_IMAGE_SIZE
+    ).sort("transfer_size", descending=True)
+    if heavy_images.is_empty():
+        return []
+    return [PageFinding(
+        level=FindingLevel.WARNING,
+        message=f"Найдено {heavy_images.height} изображений тяжелее "
+        f"{MAX_IMAGE_SIZE // 1024} КБ: {_format_examples(heavy_images["url"].to_list())}",
+        category="network",
+        element="img"
+    )]
+
+
+def check_cache_headers(resources: pl.DataFrame) -> list[PageFinding]:
+    """Проверка заголовков кэширования статических ресурсов"""
+    not_cached = _successful(resources).filter(
+        pl.col("resource_type").cast(pl.String).is_in(CACHEABLE_RESOURCE_TYPES),
+        pl.col("cache_control").is_null(),
+        pl.col("expires").is_null(),
+    )
+    if not_cached.is_empty():
+        return []
+    return [PageFinding(
+        level=FindingLevel.WARNING,
+        message=f"У {not_cached.height} статических ресурсов отсутствуют заголовки "
+        f"Cache-Control и Expires: {_format_examples(not_cached["url"].to_list())}",
+        category="network",
+        element="resource"
+    )]
+
+
+def check_render_blocking_scripts(resources: pl.DataFrame) -> list[PageFinding]:
+    """Проверка скриптов, блокирующих рендеринг страницы"""
+    blocking_scripts = resources.filter(
+        pl.col("resource_type") == "script", pl.col("render_blocking")
+    )
+    if blocking_scripts.is_empty():
+        return []
+    return [PageFinding(
+        level=FindingLevel.WARNING,
+        message=f"Найдено {blocking_scripts.height} скриптов, блокирующих рендеринг. "
+        "Используйте атрибуты async или defer: "
+        f"{_format_examples(blocking_scripts["url"].to_list())}",
+        category="network",
+        element="script"
+    )]
+
+
+def check_page_weight(resources: pl.DataFrame) -> list[PageFinding]:
+    """Проверка общего веса страницы"""
+    page_weight = resources["transfer_size"].sum()
+    if page_weight > MAX_PAGE_WEIGHT:
+        return [PageFinding(
+            level=FindingLevel.ERROR,
+            message=f"Слишком большой вес страницы ({page_weight / 1024 / 1024:.1f} МБ)! "
+            f"Рекомендуется не более {MAX_PAGE_WEIGHT / 1024 / 1024:.0f} МБ.",
+            category="network",
+            element="page"
+        )]
+    return [PageFinding(
+        level=FindingLevel.GOOD,
+        message=f"Оптимальный вес страницы ({page_weight / 1024:.0f} КБ, "
+        f"{resources.height} ресурсов)",
+        category="network",
+        element="page"
+    )]
+
+
+def lint_resources(resources: pl.DataFrame) -> list[PageFinding]:
+    """Выполняет проверки загруженных страницей ресурсов.
+
+    :param resources: Таблица ресурсов, полученная с помощью ResourceCapture.
+    :return Список найденных замечаний.
+    """
+    if resources.is_empty():
+        return []
+    return [
+        *check_compression(resources),
+        *check_image_sizes(resources),
+        *check_cache_headers(resources),
+        *check_render_blocking_scripts(resources),
+        *check_page_weight(resources),
+    ]
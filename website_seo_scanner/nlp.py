@@ -1,36 +1,85 @@
-from typing import Final, Literal
+from typing import Literal
 
 import re
+from collections import Counter
+from collections.abc import Iterable
+from functools import cache
 
-import nltk
 import numpy as np
 import polars as pl
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
 from sklearn.cluster import HDBSCAN
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from .depends import embeddings
-
-nltk.download("stopwords")
-nltk.download("wordnet")
+from .clustering import (
+    LINK_SIMILARITY,
+    ClusterCentroids,
+    build_neighbor_graph,
+    cluster_neighbor_graph,
+    embed_texts,
+    normalize_vectors,
+    reduce_dimensions,
+)
+from .corpora import ensure_corpus
+from .depends import get_embeddings
+from .lemmatizers import get_lemmatizer
+from .schemas import ThematicCluster
+from .tracing import span, traced
 
 CHUNK_SIZE, CHUNK_OVERLAP = 1024, 10
 # Минимальное число кластеров
 MIN_CLUSTER_SIZE = 2
 # Ключевая метрика для кластеризации
 HDBSCAN_METRIC = "euclidian"
+# Количество текстов, начиная с которого используется кластеризация по графу соседей
+SCALABLE_CLUSTERING_THRESHOLD = 5000
+# Размерность векторов после снижения размерности
+REDUCED_DIMENSIONS = 128
 
 RANDOM_STATE = 42
 # Минимальное значение токена для пред обработки текста
 MIN_TOKEN = 2
 # Минимальная длина предложения для извлечения ключевых слов
 MIN_SENTENCE_LENGTH = 10
-# Загрузка стоп-слов для русского языка (слова несущие малую смысловую нагрузку)
-STOPWORDS: Final[list[str]] = list(set(stopwords.words("russian")))
+# Максимальное количество уникальных фрагментов текста при сравнении текстов
+MAX_COMPARED_CHUNKS = 256
+# Максимальное количество кандидатов в ключевые фразы, для которых вычисляются эмбеддинги
+MAX_KEYPHRASE_CANDIDATES = 50
+# Доля общих слов, начиная с которой N-граммы считаются почти одинаковыми
+CANDIDATE_DEDUPE_THRESHOLD = 0.6
+# Вес разнообразия ключевых фраз в MMR
+KEYPHRASE_DIVERSITY = 0.5
+# Символы, не являющиеся буквами или пробелами
+NON_LETTERS_PATTERN = re.compile(r"[^а-яёa-z\s]")
+# Границы предложений
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"[.!?]")
+
+
+@cache
+def get_stopwords() -> frozenset[str]:
+    """Загружает стоп-слова русского языка (слова несущие малую смысловую нагрузку)"""
+    ensure_corpus("stopwords")
+    return frozenset(stopwords.words("russian"))
+
+
+def preprocess_texts(texts: Iterable[str]) -> list[str]:
+    """Пакетная предобработка текстов: очистка, лемматизация, удаление стоп-слов.
+    Тексты лемматизируются пачкой лемматизатором, выбранным в настройках.
+
+    :param texts: Тексты для обработки.
+    :return Пред обработанные тексты в исходном порядке.
+    """
+    stopwords_set, substitute_non_letters = get_stopwords(), NON_LETTERS_PATTERN.sub
+    cleaned_texts = (substitute_non_letters(" ", text.lower()) for text in texts)
+    return [
+        " ".join(
+            lemma
+            for token, lemma in tokens
+            if len(token) > MIN_TOKEN and token not in stopwords_set
+        )
+        for tokens in get_lemmatizer().lemmatize_texts(cleaned_texts)
+    ]
 
 
 def preprocess_text(text: str) -> str:
@@ -39,21 +88,7 @@ def preprocess_text(text: str) -> str:
     :param text: Текст для обработки.
     :return Пред обработанный текст.
     """
-    lemmatizer = WordNetLemmatizer()
-    text = text.lower()
-    text = re.sub(r"[^а-яёa-z\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    tokens = word_tokenize(text)
-    processed_tokens: list[str] = [
-        lemmatizer.lemmatize(token)
-        for token in tokens
-        if token not in STOPWORDS and len(token) > MIN_TOKEN
-    ]
-    return " ".join(processed_tokens)
-
-
-def _is_text_large(text: str) -> bool:
-    return text > ...
+    return preprocess_texts([text])[0]
 
 
 def split_text(
@@ -65,30 +100,89 @@ def split_text(
     return splitter.split_text(text)
 
 
+def split_unique_chunks(
+        text: str, max_chunks: int = MAX_COMPARED_CHUNKS
+) -> tuple[list[str], np.ndarray]:
+    """Разбивает текст на уникальные фрагменты с количеством их повторов.
+    Повторяющиеся фрагменты (шаблонные блоки страницы) векторизуются один раз,
+    а их количество учитывается как вес. Для очень длинных текстов берётся
+    равномерная выборка из max_chunks фрагментов.
+
+    :param text: Текст для разбиения.
+    :param max_chunks: Максимальное количество уникальных фрагментов.
+    :return Уникальные фрагменты и их веса.
+    """
+    chunk_counts = Counter(split_text(text)) if text else Counter()
+    chunks = list(chunk_counts)
+    if len(chunks) > max_chunks:
+        sample = np.linspace(0, len(chunks) - 1, max_chunks).astype(int)
+        chunks = [chunks[index] for index in sample]
+    return chunks, np.array([chunk_counts[chunk] for chunk in chunks], dtype=np.float64)
+
+
+def _weighted_median(values: np.ndarray, weights: np.ndarray) -> float:
+    """Медиана значений с целыми весами, совпадающая с np.median развёрнутого массива"""
+    order = np.argsort(values, kind="stable")
+    values, cumulative_weights = values[order], np.cumsum(weights[order])
+    total = int(cumulative_weights[-1])
+    lower = values[np.searchsorted(cumulative_weights, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative_weights, total // 2, side="right")]
+    return float((lower + upper) / 2)
+
+
+@traced("nlp.compare_texts")
 def compare_texts(
         text1: str,
         text2: str,
-        similarity_strategy: Literal["max", "mean", "median", "std"] = "mean"
+        similarity_strategy: Literal["max", "mean", "median", "std"] = "mean",
+        max_chunks: int = MAX_COMPARED_CHUNKS,
 ) -> float:
-    """Сравнивает семантическую релевантность двух текстов"""
-    chunks1, chunks2 = split_text(text1), split_text(text2)
-    vectors = embeddings.embed_documents(chunks1 + chunks2)
+    """Сравнивает семантическую релевантность двух текстов.
+    Каждый уникальный фрагмент векторизуется один раз. Средняя близость всех пар
+    фрагментов равна скалярному произведению взвешенных сумм нормированных векторов,
+    поэтому для 'mean' матрица близости не строится.
+
+    :param text1: Первый текст.
+    :param text2: Второй текст.
+    :param similarity_strategy: Агрегация косинусной близости пар фрагментов.
+    :param max_chunks: Максимальное количество уникальных фрагментов каждого текста.
+    :return Оценка близости, 0 если один из текстов пустой.
+    """
+    chunks1, weights1 = split_unique_chunks(text1, max_chunks)
+    chunks2, weights2 = split_unique_chunks(text2, max_chunks)
+    if not chunks1 or not chunks2:
+        return 0.0
+    with span("nlp.embeddings"):
+        vectors = normalize_vectors(get_embeddings().embed_documents(chunks1 + chunks2))
     vectors1, vectors2 = vectors[:len(chunks1)], vectors[len(chunks1):]
-    similarity_matrix = cosine_similarity(vectors1, vectors2)
+    if similarity_strategy == "mean":
+        return float(
+            (weights1 @ vectors1) @ (weights2 @ vectors2) / (weights1.sum() * weights2.sum())
+        )
+    similarity_matrix = vectors1 @ vectors2.T
+    pair_weights = np.outer(weights1, weights2)
     match similarity_strategy:
         case "max":
             similarity_score = np.max(similarity_matrix)
-        case "mean":
-            similarity_score = np.mean(similarity_matrix)
         case "median":
-            similarity_score = np.median(similarity_matrix)
+            similarity_score = _weighted_median(similarity_matrix.ravel(), pair_weights.ravel())
         case "std":
-            similarity_score = np.std(similarity_matrix)
+            similarity_score = np.sqrt(np.cov(
+                similarity_matrix.ravel(), fweights=pair_weights.ravel().astype(int), ddof=0
+            ))
         case _:
             similarity_score = np.nan
     return float(similarity_score)
 
 
+def _split_sentences(text: str) -> list[str]:
+    return [
+        sentence.strip()
+        for sentence in SENTENCE_BOUNDARY_PATTERN.split(text)
+        if len(sentence.strip()) > MIN_SENTENCE_LENGTH
+    ]
+
+
 def extract_keywords(text: str, top_n: int = 10) -> list[str]:
     """Извлечение ключевых слов используя TF-IDF алгоритм.
 
@@ -96,14 +190,8 @@ def extract_keywords(text: str, top_n: int = 10) -> list[str]:
     :param top_n: Количество возвращаемых ключевых слов.
     :return Список ключевых слов.
     """
-    sentences = re.split(r"[.!?]", text)  # Создание корпуса текста
-    # из его предложений
-    sentences = [
-        sentence.strip()
-        for sentence in sentences
-        if len(sentence.strip()) > MIN_SENTENCE_LENGTH
-    ]
-    processed_sentences = [preprocess_text(sentence) for sentence in sentences]
+    # Создание корпуса текста из его предложений
+    processed_sentences = preprocess_texts(_split_sentences(text))
     vectorizer = TfidfVectorizer(max_features=top_n * 2, ngram_range=(1, 2))
     tfidf_matrix = vectorizer.fit_transform(processed_sentences)
     # Суммируем TF-IDF scores по всем документам
@@ -115,45 +203,165 @@ def extract_keywords(text: str, top_n: int = 10) -> list[str]:
     }).sort("scores", descending=True).head(top_n)["keywords"].to_list()
 
 
+def _shortlist_candidates(
+        text: str, ngram_range: tuple[int, int], max_candidates: int
+) -> list[str]:
+    """Отбирает кандидатов в ключевые фразы без эмбеддингов.
+    Оценка N-граммы - её частота в тексте, умноженная на средний IDF её слов
+    по предложениям текста. Почти одинаковые N-граммы (сдвинутые окна,
+    перестановки слов) отбрасываются в пользу более высоко оценённой.
+    """
+    preprocessed_text = preprocess_text(text)
+    count_vectorizer = CountVectorizer(ngram_range=ngram_range)
+    try:
+        count_matrix = count_vectorizer.fit_transform([preprocessed_text])
+    except ValueError:  # Текст короче N-граммы
+        return []
+    counts = np.asarray(count_matrix.sum(axis=0)).ravel()
+    candidates = count_vectorizer.get_feature_names_out()
+    idf: dict[str, float] = {}
+    processed_sentences = [
+        sentence for sentence in preprocess_texts(_split_sentences(text)) if sentence
+    ]
+    if processed_sentences:
+        idf_vectorizer = TfidfVectorizer().fit(processed_sentences)
+        idf = dict(zip(idf_vectorizer.get_feature_names_out(), idf_vectorizer.idf_, strict=True))
+    scores = counts * np.fromiter(
+        (np.mean([idf.get(token, 1) for token in candidate.split()]) for candidate in candidates),
+        dtype=np.float32,
+        count=len(candidates),
+    )
+    shortlist: list[str] = []
+    shortlist_tokens: list[frozenset[str]] = []
+    for index in np.argsort(-scores, kind="stable"):
+        tokens = frozenset(candidates[index].split())
+        if any(
+            len(tokens & kept) / len(tokens | kept) >= CANDIDATE_DEDUPE_THRESHOLD
+            for kept in shortlist_tokens
+        ):
+            continue
+        shortlist.append(candidates[index])
+        shortlist_tokens.append(tokens)
+        if len(shortlist) >= max_candidates:
+            break
+    return shortlist
+
+
+def maximal_marginal_relevance(
+        query_vector: np.ndarray, candidate_vectors: np.ndarray, top_n: int, diversity: float
+) -> list[int]:
+    """Выбор релевантных и непохожих друг на друга кандидатов (MMR).
+    Векторы должны быть нормированы, тогда косинусная близость - скалярное произведение.
+
+    :param query_vector: Вектор текста.
+    :param candidate_vectors: Матрица векторов кандидатов.
+    :param top_n: Количество выбираемых кандидатов.
+    :param diversity: Вес разнообразия от 0 (только релевантность) до 1.
+    :return Индексы выбранных кандидатов в порядке выбора.
+    """
+    relevance = candidate_vectors @ query_vector
+    max_similarity = np.full(len(candidate_vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidate_vectors), dtype=bool)
+    selected: list[int] = []
+    for _ in range(min(top_n, len(candidate_vectors))):
+        redundancy = np.where(np.isinf(max_similarity), 0, max_similarity)
+        scores = (1 - diversity) * relevance - diversity * redundancy
+        index = int(np.argmax(np.where(available, scores, -np.inf)))
+        selected.append(index)
+        available[index] = False
+        max_similarity = np.maximum(max_similarity, candidate_vectors @ candidate_vectors[index])
+    return selected
+
+
+@traced("nlp.keyphrases")
 def extract_keyphrases(
-        text: str, top_n: int = 5, ngram_range: tuple[int, int] = (5, 5)
+        text: str,
+        top_n: int = 5,
+        ngram_range: tuple[int, int] = (5, 5),
+        diversity: float = KEYPHRASE_DIVERSITY,
+        max_candidates: int = MAX_KEYPHRASE_CANDIDATES,
 ) -> list[str]:
     """Извлечение ключевых фраз из текста.
+    Эмбеддинги вычисляются одним запросом только для ограниченного списка кандидатов,
+    отобранных по частоте и IDF, а итоговые фразы выбираются с учётом разнообразия (MMR).
 
     :param text: Входной текст.
     :param top_n: Количество возвращаемых ключевых фраз.
     :param ngram_range: Размер Н-граммы.
-    :return Извлечённые ключевые фразы.
+    :param diversity: Вес разнообразия фраз от 0 до 1.
+    :param max_candidates: Максимальное количество кандидатов для векторизации.
+    :return Извлечённые ключевые фразы в порядке убывания значимости.
     """
-    preprocessed_text = preprocess_text(text)
-    count_vectorizer = CountVectorizer(ngram_range=ngram_range, stop_words=STOPWORDS)
-    count_vectorizer.fit([preprocessed_text])
-    candidates = count_vectorizer.get_feature_names_out()
-    text_embedding = embeddings.embed_documents([text])
-    candidate_embeddings = embeddings.embed_documents(candidates)
-    distances = cosine_similarity(text_embedding, candidate_embeddings)
-    return [candidates[index] for index in distances.argsort()[0][-top_n:]]
+    candidates = _shortlist_candidates(text, ngram_range, max_candidates)
+    if not candidates:
+        return []
+    with span("nlp.embeddings"):
+        vectors = normalize_vectors(get_embeddings().embed_documents([text, *candidates]))
+    selected = maximal_marginal_relevance(vectors[0], vectors[1:], top_n, diversity)
+    return [candidates[index] for index in selected]
 
 
-def get_semantic_clusters(texts: list[str]) -> dict[int, list[str]]:
+@traced("nlp.semantic_clusters")
+def get_semantic_clusters(
+        texts: list[str],
+        method: Literal["hdbscan", "graph"] | None = None,
+        reduction: Literal["pca", "random"] | None = None,
+        n_components: int = REDUCED_DIMENSIONS,
+) -> dict[int, list[str]]:
     """Получает семантические кластеры для текстов.
-    Использует transformers для векторизации и HDBSCAN для кластеризации.
+    Тексты векторизуются пачками в нормированные float32 векторы. Для небольших
+    корпусов используется HDBSCAN, для больших - связные компоненты приближённого
+    графа ближайших соседей (LSH), память которого растёт линейно.
 
     :param texts: Тексты, которые нужно кластеризовать.
+    :param method: Метод кластеризации, по умолчанию выбирается по количеству текстов.
+    :param reduction: Снижение размерности векторов перед кластеризацией.
+    :param n_components: Размерность векторов после снижения.
     :return Маппинг индекса кластера и сгруппированных текстов.
-    (cluster -> list[texts])
+    (cluster -> list[texts], -1 для текстов вне кластеров)
     """
-    vectors = embeddings.embed_documents(texts)
-    hdbscan = HDBSCAN(
-        min_cluster_size=MIN_CLUSTER_SIZE,
-        min_samples=None,
-        metric="euclidean",
-        cluster_selection_method="eom",
-    )
-    clusters = hdbscan.fit_predict(vectors)
+    if not texts:
+        return {}
+    with span("nlp.embeddings"):
+        vectors = embed_texts(get_embeddings().embed_documents, texts)
+    if reduction is not None:
+        vectors = reduce_dimensions(vectors, reduction, n_components)
+    method = method or ("graph" if len(texts) > SCALABLE_CLUSTERING_THRESHOLD else "hdbscan")
+    if method == "graph":
+        clusters = cluster_neighbor_graph(build_neighbor_graph(vectors), MIN_CLUSTER_SIZE)
+    else:
+        hdbscan = HDBSCAN(
+            min_cluster_size=MIN_CLUSTER_SIZE,
+            min_samples=None,
+            metric="euclidean",
+            cluster_selection_method="eom",
+        )
+        clusters = hdbscan.fit_predict(vectors)
     groups: dict[int, list[str]] = {}
-    for _, (text, cluster) in enumerate(zip(texts, clusters, strict=False)):
-        if cluster not in groups:
-            groups[int(cluster)] = []
-        groups[cluster].append(text)
+    for text, cluster in zip(texts, clusters, strict=True):
+        groups.setdefault(int(cluster), []).append(text)
     return groups
+
+
+@traced("nlp.cluster_assignment")
+def assign_thematic_clusters(
+        texts: list[str],
+        clusters: list[ThematicCluster],
+        min_similarity: float = LINK_SIMILARITY,
+) -> list[str | None]:
+    """Назначает новые тексты существующим тематическим кластерам без повторной
+    кластеризации: тексты сравниваются с центроидами кластеров пачками.
+
+    :param texts: Новые тексты.
+    :param clusters: Тематические кластеры, например из семантического ядра сайта.
+    :param min_similarity: Минимальная косинусная близость к центроиду кластера.
+    :return Названия кластеров в порядке текстов, None для текстов вне кластеров.
+    """
+    if not texts or not clusters:
+        return [None] * len(texts)
+    embed_documents = get_embeddings().embed_documents
+    centroids = ClusterCentroids.from_thematic_clusters(clusters, embed_documents)
+    with span("nlp.embeddings"):
+        vectors = embed_texts(embed_documents, texts)
+    labels, _ = centroids.assign(vectors, min_similarity)
+    return [None if label < 0 else centroids.names[label] for label in labels]
@@ -1,19 +1,23 @@
 import logging
 
+from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page
-from pydantic import BaseModel
+from pydantic import BaseModel, NonNegativeFloat
+
+from .readiness import navigate
 
 logger = logging.getLogger(__name__)
 
-# JS скрипт для анализа производительности рендеринга страницы
+# JS скрипт для анализа производительности рендеринга страницы.
+# Ещё не наступившие события дают 0, а не отрицательное время.
 JS_PERFORMANCE_SCRIPT = """
 () => {
     const perf = window.performance;
     const timing = perf.timing;
 
     return {
-        'dom_content_loaded': timing.domContentLoadedEventEnd - timing.navigationStart,
-        'load_event': timing.loadEventEnd - timing.navigationStart,
+        'dom_content_loaded': Math.max(0, timing.domContentLoadedEventEnd - timing.navigationStart),
+        'load_event': Math.max(0, timing.loadEventEnd - timing.navigationStart),
         'first_paint': perf.getEntriesByName('first-paint')[0]?.startTime || 0,
         'first_contentful_paint': perf.getEntriesByName('first-contentful-paint')[0]?.startTime || 0,
         'largest_contentful_paint': perf.getEntriesByType('largest-contentful-paint')[0]?.renderTime || 0,
@@ -21,8 +25,6 @@ JS_PERFORMANCE_SCRIPT = """
     };
 }
 """  # noqa: E501
-# Таймаут по умолчанию в секундах
-TIMEOUT = 10
 
 
 class PageRenderingInfo(BaseModel):
@@ -32,10 +34,12 @@ class PageRenderingInfo(BaseModel):
         dom_content_loaded: Время до полной загрузки HTML DOM в ms.
         load_event: Время до полной загрузки страницы со всеми ресурсами в мс.
         first_paint: Первое отображение элемента на экране в мс.
+        ready: Страница стала готова до дедлайна, иначе метрики нулевые.
     """
-    dom_content_loaded: float
-    load_event: float
-    first_paint: float
+    dom_content_loaded: NonNegativeFloat = 0
+    load_event: NonNegativeFloat = 0
+    first_paint: NonNegativeFloat = 0
+    ready: bool = True
 
 
 async def measure_page_rendering_time(page: Page, url: str) -> PageRenderingInfo:
@@ -43,9 +47,15 @@ async def measure_page_rendering_time(page: Page, url: str) -> PageRenderingInfo
 `
     :param page: Текущая playwright страница.
     :param url: URL адрес страницы.
-    :return информация о рендеринге страницы.
+    :return информация о рендеринге страницы, нулевые метрики если страница не готова.
     """
-    await page.goto(url, wait_until="domcontentloaded")
-    response = await page.evaluate(JS_PERFORMANCE_SCRIPT)
+    if not await navigate(page, url):
+        return PageRenderingInfo(ready=False)
+    try:
+        response = await page.evaluate(JS_PERFORMANCE_SCRIPT)
+    except PlaywrightError:
+        # Контекст выполнения уничтожен, например клиентским редиректом
+        logger.warning("Failed to measure rendering time of page %s", url, exc_info=True)
+        return PageRenderingInfo(ready=False)
     logger.info("Measured rendering time of page %s", url, extra=response)
     return PageRenderingInfo.model_validate(response)
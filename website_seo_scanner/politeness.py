@@ -0,0 +1,309 @@
+"""Вежливый обход сайтов: ограничение нагрузки на каждый хост"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from pydantic import HttpUrl
+from usp.web_client.abstract_client import (
+    RETRYABLE_HTTP_STATUS_CODES,
+    AbstractWebClient,
+    AbstractWebClientResponse,
+    AbstractWebClientSuccessResponse,
+    WebClientErrorResponse,
+)
+
+from .settings import settings
+
+# Статусы ответа, означающие перегрузку или ограничение частоты запросов
+THROTTLING_STATUSES: frozenset[int] = frozenset({
+    httpx.codes.TOO_MANY_REQUESTS, httpx.codes.SERVICE_UNAVAILABLE
+})
+# Базовая пауза для хоста после ошибки в секундах
+BASE_BACKOFF = 1
+# Вес последнего измерения в скользящем среднем времени ответа
+LATENCY_SMOOTHING = 0.3
+# Множитель снижения нагрузки при медленных ответах и при ошибках
+SLOW_DECREASE_FACTOR, ERROR_DECREASE_FACTOR = 0.75, 0.5
+# Таймаут загрузки robots.txt в секундах
+ROBOTS_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+
+def get_host(url: str) -> str:
+    """Получает хост из URL адреса"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Разбирает заголовок Retry-After в секундах (поддерживается только числовой формат)"""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return None
+
+
+class HostSlot:
+    """Слот запроса к хосту. Через него сообщается результат запроса"""
+
+    def __init__(self) -> None:
+        self.status: int | None = None
+        self.retry_after: float | None = None
+        self.failed = False
+
+    def record(
+            self, status: int | None, retry_after: float | None = None, failed: bool = False
+    ) -> None:
+        """Сохраняет результат запроса"""
+        self.status, self.retry_after, self.failed = status, retry_after, failed
+
+    @property
+    def is_throttled(self) -> bool:
+        return self.failed or self.status in THROTTLING_STATUSES
+
+
+class _HostState:
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.inflight = 0
+        self.crawl_delay = 0.0
+        self.next_request_at = 0.0
+        self.latency: float | None = None
+        self.failures = 0
+        self.condition = asyncio.Condition()
+        self.robots: RobotFileParser | None = None
+        self.robots_lock = asyncio.Lock()
+
+
+class HostScheduler:
+    """Планировщик запросов по хостам.
+    Ограничивает количество одновременных запросов к хосту, соблюдает Crawl-delay
+    из robots.txt и адаптирует допустимую нагрузку (AIMD): плавно увеличивает её
+    при быстрых ответах и снижает при медленных ответах, 429/503 и ошибках.
+
+    Пример использования:
+        async with host_scheduler.slot(url) as slot:
+            response = await client.get(url)
+            slot.record(response.status_code)
+    """
+
+    def __init__(
+            self,
+            max_per_host: int | None = None,
+            min_per_host: int | None = None,
+            respect_robots: bool | None = None,
+    ) -> None:
+        politeness = settings.politeness
+        self._max_per_host = max_per_host or politeness.max_per_host
+        self._min_per_host = min_per_host or politeness.min_per_host
+        self._respect_robots = (
+            politeness.respect_robots if respect_robots is None else respect_robots
+        )
+        self._hosts: dict[str, _HostState] = {}
+
+    def _get_state(self, url: str) -> _HostState:
+        host = get_host(url)
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(float(self._max_per_host))
+        return self._hosts[host]
+
+    def get_limit(self, url: str) -> int:
+        """Текущее допустимое количество одновременных запросов к хосту"""
+        return int(self._get_state(url).limit)
+
+    async def _load_robots(self, url: str, client: httpx.AsyncClient | None) -> RobotFileParser:
+        state = self._get_state(url)
+        async with state.robots_lock:
+            if state.robots is not None:
+                return state.robots
+            parsed = urlparse(url)
+            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+            robots = RobotFileParser(robots_url)
+            try:
+                if client is None:
+                    async with httpx.AsyncClient(
+                        timeout=ROBOTS_TIMEOUT, follow_redirects=True
+                    ) as robots_client:
+                        response = await robots_client.get(robots_url)
+                else:
+                    response = await client.get(robots_url)
+            except httpx.HTTPError:
+                logger.warning("Failed to fetch %s", robots_url)
+                response = None
+            if response is not None and response.is_success:
+                robots.parse(response.text.splitlines())
+            else:
+                # Отсутствующий robots.txt разрешает всё
+                robots.parse([])
+            crawl_delay = robots.crawl_delay(settings.politeness.user_agent)
+            state.crawl_delay = float(crawl_delay or 0)
+            state.robots = robots
+            return robots
+
+    async def get_crawl_delay(self, url: str, client: httpx.AsyncClient | None = None) -> float:
+        """Получает Crawl-delay хоста из robots.txt в секундах"""
+        if not self._respect_robots:
+            return 0
+        await self._load_robots(url, client)
+        return self._get_state(url).crawl_delay
+
+    async def is_allowed(self, url: str, client: httpx.AsyncClient | None = None) -> bool:
+        """Проверяет, разрешён ли обход URL правилами robots.txt"""
+        if not self._respect_robots:
+            return True
+        robots = await self._load_robots(url, client)
+        return robots.can_fetch(settings.politeness.user_agent, url)
+
+    async def filter_allowed(
+            self, urls: list[HttpUrl], client: httpx.AsyncClient | None = None
+    ) -> list[HttpUrl]:
+        """Оставляет только разрешённые robots.txt URL адреса"""
+        return [url for url in urls if await self.is_allowed(str(url), client)]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostSlot]:
+        """Ожидает свободный слот для запроса к хосту.
+        Время выполнения блока учитывается как время ответа хоста.
+        """
+        state = self._get_state(url)
+        await self._acquire(state)
+        slot = HostSlot()
+        started_at = time.monotonic()
+        try:
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            await self._release(state, slot, time.monotonic() - started_at)
+
+    @staticmethod
+    async def _acquire(state: _HostState) -> None:
+        async with state.condition:
+            while True:
+                now = time.monotonic()
+                if state.inflight < int(state.limit) and now >= state.next_request_at:
+                    state.inflight += 1
+                    state.next_request_at = now + state.crawl_delay
+                    return
+                timeout = state.next_request_at - now if now < state.next_request_at else None
+                try:
+                    await asyncio.wait_for(state.condition.wait(), timeout=timeout)
+                except TimeoutError:
+                    continue
+
+    async def _release(self, state: _HostState, slot: HostSlot, latency: float) -> None:
+        async with state.condition:
+            state.inflight -= 1
+            self._adapt(state, slot, latency)
+            state.condition.notify_all()
+
+    def _adapt(self, state: _HostState, slot: HostSlot, latency: float) -> None:
+        if slot.is_throttled:
+            state.limit = max(float(self._min_per_host), state.limit * ERROR_DECREASE_FACTOR)
+            backoff = slot.retry_after
+            if backoff is None:
+                backoff = BASE_BACKOFF * 2 ** state.failures
+            backoff = min(backoff, settings.politeness.max_backoff)
+            state.failures += 1
+            state.next_request_at = max(state.next_request_at, time.monotonic() + backoff)
+            logger.info("Host backoff for %.1f seconds, limit %.2f", backoff, state.limit)
+            return
+        state.failures = 0
+        state.latency = latency if state.latency is None else (
+            LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * state.latency
+        )
+        if state.latency > settings.politeness.target_latency:
+            state.limit = max(float(self._min_per_host), state.limit * SLOW_DECREASE_FACTOR)
+        else:
+            state.limit = min(float(self._max_per_host), state.limit + 1 / state.limit)
+
+
+class _SitemapResponse(AbstractWebClientSuccessResponse):
+    def __init__(self, response: httpx.Response, max_length: int | None) -> None:
+        self._response = response
+        self._max_length = max_length
+
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    def status_message(self) -> str:
+        return self._response.reason_phrase
+
+    def header(self, case_insensitive_name: str) -> str | None:
+        return self._response.headers.get(case_insensitive_name)
+
+    def raw_data(self) -> bytes:
+        return self._response.content[:self._max_length]
+
+    def url(self) -> str:
+        return str(self._response.url)
+
+
+class SitemapWebClient(AbstractWebClient):
+    """Клиент загрузки robots.txt и sitemap.xml для ultimate-sitemap-parser,
+    выполняющий запросы через слоты планировщика хостов.
+    Парсер sitemap блокирующий и работает в отдельном потоке, поэтому запросы
+    передаются в событийный цикл, которому принадлежат клиент и планировщик.
+
+    Пример использования:
+        web_client = SitemapWebClient(client, get_host_scheduler())
+        tree = await asyncio.to_thread(build_site_tree, url, web_client)
+    """
+
+    def __init__(self, client: httpx.AsyncClient, host_scheduler: HostScheduler) -> None:
+        self._client = client
+        self._host_scheduler = host_scheduler
+        self._loop = asyncio.get_running_loop()
+        self._max_length: int | None = None
+
+    def set_max_response_data_length(self, max_response_data_length: int | None) -> None:
+        self._max_length = max_response_data_length
+
+    def get(self, url: str) -> AbstractWebClientResponse:
+        return asyncio.run_coroutine_threadsafe(self._get(url), self._loop).result()
+
+    async def _get(self, url: str) -> AbstractWebClientResponse:
+        async with self._host_scheduler.slot(url) as slot:
+            try:
+                response = await self._client.get(url)
+            except httpx.HTTPError as error:
+                slot.record(None, failed=True)
+                return WebClientErrorResponse(
+                    str(error), retryable=isinstance(error, httpx.TimeoutException)
+                )
+            slot.record(
+                response.status_code, parse_retry_after(response.headers.get("retry-after"))
+            )
+        if response.is_success:
+            return _SitemapResponse(response, self._max_length)
+        return WebClientErrorResponse(
+            f"{response.status_code} {response.reason_phrase}",
+            retryable=response.status_code in RETRYABLE_HTTP_STATUS_CODES,
+        )
+
+
+# Планировщики событийных циклов: примитивы asyncio привязаны к циклу, в котором созданы
+_host_schedulers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostScheduler] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_host_scheduler() -> HostScheduler:
+    """Общий для событийного цикла планировщик, чтобы параллельные сканирования
+    одного сайта делили ограничения хоста. Вызывается только внутри работающего цикла.
+    """
+    loop = asyncio.get_running_loop()
+    scheduler = _host_schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _host_schedulers[loop] = HostScheduler()
+    return scheduler
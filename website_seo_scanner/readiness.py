@@ -0,0 +1,160 @@
+"""Ожидание готовности страницы с единым дедлайном"""
+
+from typing import Self
+
+import asyncio
+import logging
+from enum import StrEnum
+from types import TracebackType
+
+from playwright.async_api import Page, Request
+
+from .politeness import get_host_scheduler
+from .settings import ReadinessSettings, settings
+from .tracing import span
+
+# Инжектируемый JS probe готовности страницы. Проверяет состояние навигации,
+# а для стратегии 'domquiet' устанавливает MutationObserver при первом вызове
+# и ждёт, пока в DOM quietTime мс не добавляются и не удаляются узлы. Атрибуты
+# и текст не отслеживаются: анимации и карусели меняют их непрерывно.
+JS_READINESS_PROBE = """
+({ strategy, quietTime }) => {
+    const navigation = performance.getEntriesByType('navigation')[0];
+    if (!navigation || navigation.domContentLoadedEventEnd <= 0) return false;
+    if (strategy === 'load' && navigation.loadEventEnd <= 0) return false;
+    if (strategy !== 'domquiet') return true;
+    window.__seoReadinessProbe ??= (() => {
+        const probe = { lastMutation: performance.now() };
+        new MutationObserver(() => { probe.lastMutation = performance.now(); }).observe(
+            document, { childList: true, subtree: true }
+        );
+        return probe;
+    })();
+    const body = document.body;
+    return !!body && body.childElementCount > 0
+        && performance.now() - window.__seoReadinessProbe.lastMutation >= quietTime;
+}
+"""
+# Интервал опроса probe в мс
+PROBE_POLLING_INTERVAL = 100
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessStrategy(StrEnum):
+    """Стратегии готовности страницы"""
+    DOM_CONTENT_LOADED = "domcontentloaded"
+    LOAD = "load"
+    NETWORK_IDLE = "networkidle"
+    DOM_QUIET = "domquiet"
+
+
+class NetworkIdleTracker:
+    """Отслеживает незавершённые запросы страницы по событиям Playwright"""
+
+    def __init__(self, page: Page, max_inflight: int = 0) -> None:
+        self._page = page
+        self._max_inflight = max_inflight
+        self._inflight: set[Request] = set()
+        self._changed = asyncio.Event()
+
+    async def __aenter__(self) -> Self:
+        self._page.on("request", self._on_request_started)
+        self._page.on("requestfinished", self._on_request_done)
+        self._page.on("requestfailed", self._on_request_done)
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self._page.remove_listener("request", self._on_request_started)
+        self._page.remove_listener("requestfinished", self._on_request_done)
+        self._page.remove_listener("requestfailed", self._on_request_done)
+
+    def _on_request_started(self, request: Request) -> None:
+        self._inflight.add(request)
+        self._changed.set()
+
+    def _on_request_done(self, request: Request) -> None:
+        self._inflight.discard(request)
+        self._changed.set()
+
+    async def wait_for_idle(self, idle_time: float) -> None:
+        """Ожидает, пока количество незавершённых запросов не превышает
+        допустимое в течение idle_time секунд.
+        """
+        while True:
+            self._changed.clear()
+            if len(self._inflight) > self._max_inflight:
+                await self._changed.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=idle_time)
+            except TimeoutError:
+                return
+
+
+async def _run_probe(
+        page: Page, config: ReadinessSettings, tracker: NetworkIdleTracker
+) -> None:
+    strategy = ReadinessStrategy(config.strategy)
+    await page.wait_for_function(
+        JS_READINESS_PROBE,
+        arg={"strategy": strategy.value, "quietTime": config.quiet_time * 1000},
+        polling=PROBE_POLLING_INTERVAL,
+        timeout=0,
+    )
+    if strategy == ReadinessStrategy.NETWORK_IDLE:
+        await tracker.wait_for_idle(config.idle_time)
+
+
+async def _goto(page: Page, url: str) -> None:
+    """Слот хоста занимается только до получения ответа сервера: ожидание готовности
+    на стороне клиента (анимации, отложенные скрипты) не говорит о перегрузке хоста.
+    """
+    async with get_host_scheduler().slot(url) as slot:
+        with span("page.navigation"):
+            response = await page.goto(url, wait_until="commit", timeout=0)
+        if response is not None:
+            slot.record(response.status)
+
+
+async def _await_readiness(page: Page, config: ReadinessSettings, url: str | None = None) -> bool:
+    try:
+        async with (
+            asyncio.timeout(config.timeout),
+            NetworkIdleTracker(page, config.max_inflight) as tracker,
+        ):
+            if url is not None:
+                await _goto(page, url)
+            with span("page.readiness"):
+                await _run_probe(page, config, tracker)
+    except TimeoutError:
+        logger.warning("Page %s is not ready after %s seconds", url or page.url, config.timeout)
+        return False
+    return True
+
+
+async def wait_until_ready(page: Page, config: ReadinessSettings | None = None) -> bool:
+    """Ожидает готовности уже открытой страницы в пределах единого дедлайна.
+
+    :param page: Текущая Playwright страница.
+    :param config: Настройки готовности, по умолчанию из settings.
+    :return True если страница готова, False если истёк дедлайн.
+    """
+    return await _await_readiness(page, config or settings.readiness)
+
+
+async def navigate(page: Page, url: str, config: ReadinessSettings | None = None) -> bool:
+    """Переходит на страницу и ожидает её готовности.
+    Навигация и ожидание ограничены одним общим дедлайном.
+
+    :param page: Текущая Playwright страница.
+    :param url: URL адрес страницы.
+    :param config: Настройки готовности, по умолчанию из settings.
+    :return True если страница готова, False если истёк дедлайн.
+    """
+    return await _await_readiness(page, config or settings.readiness, url)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import AsyncIterator, Iterable
 
 from playwright.async_api import Page
 from pydantic import BaseModel, HttpUrl, NonNegativeFloat, NonNegativeInt
 
+from .link_graph import LinkGraphBuilder, find_unlinked_pages
 from .linting import FindingLevel, PageFinding, lint_page
-from .nlp import compare_texts
 from .performance import measure_page_rendering_time
+from .schemas import SitePage
+from .tracing import StageTiming, traced
 from .utils import extract_page_text
 
 # Оптимальное время рендеринга страницы в секундах
@@ -34,6 +37,85 @@ class PageReport(BaseModel):
     levels: ReportLevels
 
 
+class ScanSummary(BaseModel):
+    """Итоговая сводка по сканированию сайта
+
+    Attributes:
+        url: URL адрес сайта.
+        pages: Количество просканированных страниц.
+        average_rendering_time: Среднее время рендеринга страницы в секундах.
+        levels: Количество замечаний по уровням значимости.
+        categories: Количество замечаний по категориям.
+        timings: Разбивка времени сканирования по этапам.
+        orphan_pages: Просканированные страницы, на которые не ссылается
+            ни одна другая просканированная страница.
+    """
+    url: HttpUrl
+    pages: NonNegativeInt
+    average_rendering_time: NonNegativeFloat
+    levels: ReportLevels
+    categories: dict[str, NonNegativeInt]
+    timings: dict[str, StageTiming] = {}
+    orphan_pages: list[HttpUrl] = []
+
+
+def count_levels(findings: Iterable[PageFinding]) -> ReportLevels:
+    """Подсчитывает количество замечаний по уровням значимости"""
+    return _to_report_levels(Counter(finding.level for finding in findings))
+
+
+def _to_report_levels(finding_level_counts: Counter[FindingLevel]) -> ReportLevels:
+    return ReportLevels(
+        critical=finding_level_counts[FindingLevel.CRITICAL],
+        errors=finding_level_counts[FindingLevel.ERROR],
+        warnings=finding_level_counts[FindingLevel.WARNING],
+        infos=finding_level_counts[FindingLevel.INFO],
+        good=finding_level_counts[FindingLevel.GOOD],
+        great=finding_level_counts[FindingLevel.GREAT],
+    )
+
+
+class ScanSummaryBuilder:
+    """Накапливает сводку по сканированию по мере обработки страниц.
+    Хранит счётчики и граф внутренних ссылок страниц без их контента.
+    """
+
+    def __init__(self, url: HttpUrl) -> None:
+        self._url = url
+        self._pages = 0
+        self._total_rendering_time = 0.0
+        self._levels: Counter[FindingLevel] = Counter()
+        self._categories: Counter[str] = Counter()
+        self._links = LinkGraphBuilder()
+        self._urls: dict[str, None] = {}
+
+    def add(self, site_page: SitePage) -> None:
+        """Учитывает страницу в сводке"""
+        self._pages += 1
+        self._urls[str(site_page.url)] = None
+        self._links.add_links(str(site_page.url), site_page.content.links)
+        self._total_rendering_time += site_page.rendering_time
+        for finding in site_page.findings:
+            self._levels[finding.level] += 1
+            self._categories[finding.category] += 1
+
+    @traced("report.summary")
+    def build(self, timings: dict[str, StageTiming] | None = None) -> ScanSummary:
+        """Формирует итоговую сводку.
+
+        :param timings: Разбивка времени сканирования по этапам.
+        """
+        return ScanSummary(
+            url=self._url,
+            pages=self._pages,
+            average_rendering_time=self._total_rendering_time / self._pages if self._pages else 0,
+            levels=_to_report_levels(self._levels),
+            categories=dict(self._categories),
+            timings=timings or {},
+            orphan_pages=find_unlinked_pages(self._links.build(), self._urls),
+        )
+
+
 async def get_meta_relevance_score(page: Page) -> float:
     """Получает оценку релевантности meta-описания и контента на странице
 
@@ -44,11 +126,14 @@ async def get_meta_relevance_score(page: Page) -> float:
         const meta = document.querySelector('meta[name="description"]');
         return meta ? meta.content : null;
     }""")
+    from .nlp import compare_texts  # noqa: PLC0415
+
     content = await extract_page_text(page)
     similarity_score = compare_texts(meta_description, content)
     return round(similarity_score, 2) * 100
 
 
+@traced("report.page_report")
 async def form_page_report(page: Page, url: str) -> PageReport:
     """Формирует отчет по странице сайта.
 
@@ -56,22 +141,29 @@ async def form_page_report(page: Page, url: str) -> PageReport:
     :param url: URL страницы сайта по которой нужно сформировать отчет.
     :return Отчет по странице.
     """
-    rendering_info = await measure_page_rendering_time(page, url)
-    findings = await lint_page(page)
+    from .network import ResourceCapture, lint_resources  # noqa: PLC0415
+
+    async with ResourceCapture(page) as capture:
+        rendering_info = await measure_page_rendering_time(page, url)
+        findings = await lint_page(page)
+    findings.extend(lint_resources(capture.resources))
     meta_relevance_score = await get_meta_relevance_score(page)
     rendering_time = rendering_info.dom_content_loaded / 1000
-    finding_level_counts = Counter(finding.level for finding in findings)
     return PageReport(
         url=HttpUrl(url),
         rendering_time=rendering_time,
         meta_relevance_score=meta_relevance_score,
         findings=findings,
-        levels=ReportLevels(
-            critical=finding_level_counts[FindingLevel.CRITICAL],
-            errors=finding_level_counts[FindingLevel.ERROR],
-            warnings=finding_level_counts[FindingLevel.WARNING],
-            infos=finding_level_counts[FindingLevel.INFO],
-            good=finding_level_counts[FindingLevel.GOOD],
-            great=finding_level_counts[FindingLevel.GREAT],
-        )
+        levels=count_levels(findings),
     )
+
+
+async def iter_page_reports(page: Page, urls: Iterable[str]) -> AsyncIterator[PageReport]:
+    """Формирует отчёты по страницам сайта, отдавая каждый отчёт сразу после формирования.
+
+    :param page: Текущая Playwright страница.
+    :param urls: URL страниц сайта.
+    :return Отчёт по странице.
+    """
+    for url in urls:
+        yield await form_page_report(page, url)
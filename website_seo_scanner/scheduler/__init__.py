@@ -0,0 +1,12 @@
+__all__ = (
+    "MongoTaskQueue",
+    "SQLiteTaskQueue",
+    "Task",
+    "TaskKind",
+    "TaskQueue",
+    "TaskStatus",
+)
+
+from .base import Task, TaskKind, TaskQueue, TaskStatus
+from .mongo import MongoTaskQueue
+from .sqlite import SQLiteTaskQueue
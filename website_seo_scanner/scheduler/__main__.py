@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import logging
+
+from ..depends import create_task_queue
+from .worker import get_scan_summary, run_workers, submit_site_scan
+
+logger = logging.getLogger(__name__)
+
+
+async def submit(url: str) -> None:
+    queue = create_task_queue()
+    await queue.setup()
+    try:
+        scan = await submit_site_scan(queue, url)
+    finally:
+        await queue.close()
+    logger.info("Scan %s of %s submitted", scan.id, url)
+
+
+async def status(scan_id: str) -> None:
+    queue = create_task_queue()
+    try:
+        counts = await queue.count_tasks(scan_id)
+        summary = await get_scan_summary(queue, scan_id)
+    finally:
+        await queue.close()
+    logger.info("Scan %s tasks: %s", scan_id, {str(key): value for key, value in counts.items()})
+    if summary is not None:
+        logger.info("Scan %s summary: %s", scan_id, summary.model_dump_json())
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Распределённое сканирование сайтов")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    work_parser = subparsers.add_parser("work", help="Запустить процессы-обработчики")
+    work_parser.add_argument("--processes", type=int, default=None)
+    submit_parser = subparsers.add_parser("submit", help="Поставить сканирование сайта")
+    submit_parser.add_argument("url")
+    status_parser = subparsers.add_parser("status", help="Прогресс сканирования")
+    status_parser.add_argument("scan_id")
+    args = parser.parse_args()
+    match args.command:
+        case "work":
+            run_workers(args.processes)
+        case "submit":
+            asyncio.run(submit(args.url))
+        case "status":
+            asyncio.run(status(args.scan_id))
+
+
+if __name__ == "__main__":
+    main()
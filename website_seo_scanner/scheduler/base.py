@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Any
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from enum import StrEnum
+from hashlib import sha1
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from ..settings import settings
+
+
+class TaskKind(StrEnum):
+    """Стадии сканирования сайта"""
+    BUILD_TREE = "build_tree"
+    SELECT_PAGES = "select_pages"
+    SCAN_PAGE = "scan_page"
+    AGGREGATE = "aggregate"
+
+
+class TaskStatus(StrEnum):
+    """Статусы задачи"""
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    DEAD = "dead"
+
+
+class Task(BaseModel):
+    """Задача сканирования в очереди
+
+    Attributes:
+        key: Уникальный ключ задачи, повторная постановка задачи с тем же ключом игнорируется.
+        scan_id: Идентификатор сканирования.
+        kind: Стадия сканирования.
+        payload: Входные данные задачи.
+        status: Статус задачи.
+        attempts: Количество выполненных попыток.
+        max_attempts: Максимальное количество попыток.
+        blocked_by: Количество незавершённых дочерних задач, до завершения которых
+        задача не выдаётся обработчикам.
+        parent: Ключ задачи, которую разблокирует завершение текущей.
+        available_at: Время, начиная с которого задачу можно выдать обработчику.
+        lease_until: Время окончания аренды задачи обработчиком.
+        worker_id: Идентификатор обработчика, арендовавшего задачу.
+        result: Результат выполнения задачи.
+        error: Последняя ошибка выполнения.
+    """
+    key: str
+    scan_id: str
+    kind: TaskKind
+    payload: dict[str, Any] = Field(default_factory=dict)
+    status: TaskStatus = TaskStatus.PENDING
+    attempts: NonNegativeInt = 0
+    max_attempts: NonNegativeInt = Field(default_factory=lambda: settings.scheduler.max_attempts)
+    blocked_by: NonNegativeInt = 0
+    parent: str | None = None
+    available_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    lease_until: datetime | None = None
+    worker_id: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+    @classmethod
+    def create(
+            cls, scan_id: str, kind: TaskKind, suffix: str = "", **kwargs: Any
+    ) -> Task:
+        """Создаёт задачу с детерминированным ключом вида '<scan_id>:<kind>[:<hash>]'"""
+        key = f"{scan_id}:{kind}"
+        if suffix:
+            key = f"{key}:{sha1(suffix.encode(), usedforsecurity=False).hexdigest()[:16]}"
+        return cls(key=key, scan_id=scan_id, kind=kind, **kwargs)
+
+
+class TaskQueue(ABC):
+    """Очередь задач с арендой, повторными попытками и зависимостями между задачами"""
+
+    @abstractmethod
+    async def setup(self) -> None:
+        """Создаёт коллекции/таблицы и индексы"""
+
+    @abstractmethod
+    async def enqueue(self, tasks: Sequence[Task]) -> None:
+        """Ставит задачи в очередь, задачи с уже существующими ключами игнорируются"""
+
+    @abstractmethod
+    async def lease(self, worker_id: str, lease_time: float) -> Task | None:
+        """Атомарно арендует доступную задачу.
+        Доступны незаблокированные задачи в ожидании и задачи с истёкшей арендой.
+
+        :param worker_id: Идентификатор обработчика.
+        :param lease_time: Время аренды в секундах.
+        :return Арендованная задача или None, если доступных задач нет.
+        """
+
+    @abstractmethod
+    async def extend_lease(self, task: Task, worker_id: str, lease_time: float) -> bool:
+        """Продлевает аренду задачи. Возвращает False, если аренда уже потеряна"""
+
+    @abstractmethod
+    async def complete(
+            self, task: Task, worker_id: str, result: dict[str, Any] | None = None
+    ) -> bool:
+        """Завершает задачу и разблокирует родительскую.
+        Возвращает False, если задача уже не принадлежит обработчику.
+        """
+
+    @abstractmethod
+    async def fail(self, task: Task, worker_id: str, error: str, retry_delay: float) -> None:
+        """Возвращает задачу в очередь с задержкой или помечает её мёртвой,
+        если попытки исчерпаны.
+        """
+
+    @abstractmethod
+    async def reap_expired(self) -> int:
+        """Помечает мёртвыми задачи с истёкшей арендой и исчерпанными попытками.
+
+        :return Количество помеченных задач.
+        """
+
+    @abstractmethod
+    async def get_task(self, key: str) -> Task | None:
+        """Получает задачу по ключу"""
+
+    @abstractmethod
+    async def count_tasks(self, scan_id: str) -> dict[TaskStatus, int]:
+        """Подсчитывает задачи сканирования по статусам"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Закрывает соединение с очередью"""
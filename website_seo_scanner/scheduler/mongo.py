@@ -0,0 +1,148 @@
+from typing import Any
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from pymongo import ASCENDING, AsyncMongoClient, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError
+
+from .base import Task, TaskQueue, TaskStatus
+
+TASKS_COLLECTION = "tasks"
+# Код ошибки MongoDB при нарушении уникального индекса
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _to_task(document: dict[str, Any]) -> Task:
+    return Task.model_validate({**document, "key": document["_id"]})
+
+
+class MongoTaskQueue(TaskQueue):
+    """Очередь задач в MongoDB, общая для обработчиков на разных машинах"""
+
+    def __init__(self, url: str, database: str) -> None:
+        self._client: AsyncMongoClient[dict[str, Any]] = AsyncMongoClient(url, tz_aware=True)
+        self._tasks = self._client[database][TASKS_COLLECTION]
+
+    async def setup(self) -> None:
+        await self._tasks.create_indexes([
+            IndexModel([
+                ("status", ASCENDING), ("blocked_by", ASCENDING), ("available_at", ASCENDING)
+            ]),
+            IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)]),
+            IndexModel([("scan_id", ASCENDING), ("status", ASCENDING)]),
+        ])
+
+    async def enqueue(self, tasks: Sequence[Task]) -> None:
+        if not tasks:
+            return
+        documents = [
+            {"_id": task.key, **task.model_dump(exclude={"key"})}
+            for task in tasks
+        ]
+        try:
+            await self._tasks.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Повторно поставленные задачи с существующими ключами игнорируются
+            if any(error["code"] != DUPLICATE_KEY_ERROR for error in e.details["writeErrors"]):
+                raise
+
+    async def lease(self, worker_id: str, lease_time: float) -> Task | None:
+        now = datetime.now(UTC)
+        document = await self._tasks.find_one_and_update(
+            {"$or": [
+                {"status": TaskStatus.PENDING, "available_at": {"$lte": now}, "blocked_by": 0},
+                {
+                    "status": TaskStatus.LEASED,
+                    "lease_until": {"$lt": now},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                },
+            ]},
+            {
+                "$set": {
+                    "status": TaskStatus.LEASED,
+                    "worker_id": worker_id,
+                    "lease_until": now + timedelta(seconds=lease_time),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return None if document is None else _to_task(document)
+
+    async def extend_lease(self, task: Task, worker_id: str, lease_time: float) -> bool:
+        result = await self._tasks.update_one(
+            {"_id": task.key, "status": TaskStatus.LEASED, "worker_id": worker_id},
+            {"$set": {"lease_until": datetime.now(UTC) + timedelta(seconds=lease_time)}},
+        )
+        return result.modified_count > 0
+
+    async def complete(
+            self, task: Task, worker_id: str, result: dict[str, Any] | None = None
+    ) -> bool:
+        return await self._finish(task, worker_id, TaskStatus.DONE, result=result)
+
+    async def fail(self, task: Task, worker_id: str, error: str, retry_delay: float) -> None:
+        if task.attempts >= task.max_attempts:
+            await self._finish(task, worker_id, TaskStatus.DEAD, error=error)
+            return
+        await self._tasks.update_one(
+            {"_id": task.key, "status": TaskStatus.LEASED, "worker_id": worker_id},
+            {"$set": {
+                "status": TaskStatus.PENDING,
+                "worker_id": None,
+                "lease_until": None,
+                "available_at": datetime.now(UTC) + timedelta(seconds=retry_delay),
+                "error": error,
+            }},
+        )
+
+    async def reap_expired(self) -> int:
+        cursor = self._tasks.find({
+            "status": TaskStatus.LEASED,
+            "lease_until": {"$lt": datetime.now(UTC)},
+            "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+        })
+        reaped = 0
+        async for document in cursor:
+            task = _to_task(document)
+            reaped += await self._finish(
+                task, task.worker_id, TaskStatus.DEAD, error="Lease expired"
+            )
+        return reaped
+
+    async def get_task(self, key: str) -> Task | None:
+        document = await self._tasks.find_one({"_id": key})
+        return None if document is None else _to_task(document)
+
+    async def count_tasks(self, scan_id: str) -> dict[TaskStatus, int]:
+        cursor = await self._tasks.aggregate([
+            {"$match": {"scan_id": scan_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ])
+        return {TaskStatus(document["_id"]): document["count"] async for document in cursor}
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def _finish(
+            self,
+            task: Task,
+            worker_id: str | None,
+            status: TaskStatus,
+            result: dict[str, Any] | None = None,
+            error: str | None = None,
+    ) -> bool:
+        """Переводит арендованную задачу в конечный статус и разблокирует родительскую"""
+        finished = await self._tasks.update_one(
+            {"_id": task.key, "status": TaskStatus.LEASED, "worker_id": worker_id},
+            {"$set": {"status": status, "lease_until": None, "result": result, "error": error}},
+        )
+        if finished.modified_count == 0:
+            return False
+        if task.parent is not None:
+            await self._tasks.update_one(
+                {"_id": task.parent, "blocked_by": {"$gt": 0}}, {"$inc": {"blocked_by": -1}}
+            )
+        return True
@@ -0,0 +1,234 @@
+from typing import Any
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text, and_, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from .base import Task, TaskQueue, TaskStatus
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class TaskModel(Base):
+    __tablename__ = "tasks"
+
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    scan_id: Mapped[str] = mapped_column(String(32), index=True)
+    kind: Mapped[str] = mapped_column(String(32))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(16), index=True)
+    attempts: Mapped[int] = mapped_column(Integer)
+    max_attempts: Mapped[int] = mapped_column(Integer)
+    blocked_by: Mapped[int] = mapped_column(Integer)
+    parent: Mapped[str | None] = mapped_column(String(128))
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    worker_id: Mapped[str | None] = mapped_column(String(64))
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+
+
+def _to_task(model: TaskModel) -> Task:
+    return Task.model_validate({
+        column.key: getattr(model, column.key) for column in TaskModel.__table__.columns
+    })
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """SQLite хранит время без часового пояса, поэтому всё время приводится к UTC"""
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """Локальная очередь задач в SQLite.
+    Подходит для тестов и нескольких процессов на одной машине.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._engine = create_async_engine(
+            f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 30}
+        )
+        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+
+    async def setup(self) -> None:
+        async with self._engine.begin() as connection:
+            await connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def enqueue(self, tasks: Sequence[Task]) -> None:
+        if not tasks:
+            return
+        values = [
+            {
+                **task.model_dump(mode="json"),
+                "available_at": _as_naive_utc(task.available_at),
+                "lease_until": None,
+            }
+            for task in tasks
+        ]
+        async with self._sessionmaker() as session:
+            await session.execute(insert(TaskModel).on_conflict_do_nothing(), values)
+            await session.commit()
+
+    async def lease(self, worker_id: str, lease_time: float) -> Task | None:
+        now = _as_naive_utc(datetime.now(UTC))
+        candidate = (
+            select(TaskModel.key)
+            .where(or_(
+                and_(
+                    TaskModel.status == TaskStatus.PENDING,
+                    TaskModel.available_at <= now,
+                    TaskModel.blocked_by == 0,
+                ),
+                and_(
+                    TaskModel.status == TaskStatus.LEASED,
+                    TaskModel.lease_until < now,
+                    TaskModel.attempts < TaskModel.max_attempts,
+                ),
+            ))
+            .order_by(TaskModel.available_at)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(TaskModel)
+            .where(TaskModel.key == candidate)
+            .values(
+                status=TaskStatus.LEASED,
+                worker_id=worker_id,
+                lease_until=now + timedelta(seconds=lease_time),
+                attempts=TaskModel.attempts + 1,
+            )
+            .returning(TaskModel)
+        )
+        async with self._sessionmaker() as session:
+            model = (await session.scalars(stmt)).one_or_none()
+            await session.commit()
+        return None if model is None else _to_task(model)
+
+    async def extend_lease(self, task: Task, worker_id: str, lease_time: float) -> bool:
+        lease_until = _as_naive_utc(datetime.now(UTC) + timedelta(seconds=lease_time))
+        async with self._sessionmaker() as session:
+            result = await session.execute(
+                update(TaskModel)
+                .where(
+                    TaskModel.key == task.key,
+                    TaskModel.status == TaskStatus.LEASED,
+                    TaskModel.worker_id == worker_id,
+                )
+                .values(lease_until=lease_until)
+            )
+            await session.commit()
+        return result.rowcount > 0
+
+    async def complete(
+            self, task: Task, worker_id: str, result: dict[str, Any] | None = None
+    ) -> bool:
+        async with self._sessionmaker() as session:
+            completed = await self._finish(
+                session, task, worker_id, status=TaskStatus.DONE, result=result, error=None
+            )
+            await session.commit()
+        return completed
+
+    async def fail(self, task: Task, worker_id: str, error: str, retry_delay: float) -> None:
+        async with self._sessionmaker() as session:
+            if task.attempts >= task.max_attempts:
+                await self._finish(
+                    session, task, worker_id, status=TaskStatus.DEAD, result=None, error=error
+                )
+            else:
+                await session.execute(
+                    update(TaskModel)
+                    .where(
+                        TaskModel.key == task.key,
+                        TaskModel.status == TaskStatus.LEASED,
+                        TaskModel.worker_id == worker_id,
+                    )
+                    .values(
+                        status=TaskStatus.PENDING,
+                        worker_id=None,
+                        lease_until=None,
+                        available_at=_as_naive_utc(
+                            datetime.now(UTC) + timedelta(seconds=retry_delay)
+                        ),
+                        error=error,
+                    )
+                )
+            await session.commit()
+
+    async def reap_expired(self) -> int:
+        now = _as_naive_utc(datetime.now(UTC))
+        async with self._sessionmaker() as session:
+            expired = (await session.scalars(
+                select(TaskModel).where(
+                    TaskModel.status == TaskStatus.LEASED,
+                    TaskModel.lease_until < now,
+                    TaskModel.attempts >= TaskModel.max_attempts,
+                )
+            )).all()
+            reaped = 0
+            for model in expired:
+                reaped += await self._finish(
+                    session,
+                    _to_task(model),
+                    model.worker_id,
+                    status=TaskStatus.DEAD,
+                    result=None,
+                    error="Lease expired",
+                )
+            await session.commit()
+        return reaped
+
+    async def get_task(self, key: str) -> Task | None:
+        async with self._sessionmaker() as session:
+            model = await session.get(TaskModel, key)
+        return None if model is None else _to_task(model)
+
+    async def count_tasks(self, scan_id: str) -> dict[TaskStatus, int]:
+        stmt = (
+            select(TaskModel.status, func.count())
+            .where(TaskModel.scan_id == scan_id)
+            .group_by(TaskModel.status)
+        )
+        async with self._sessionmaker() as session:
+            rows = (await session.execute(stmt)).all()
+        return {TaskStatus(status): count for status, count in rows}
+
+    async def close(self) -> None:
+        await self._engine.dispose()
+
+    @staticmethod
+    async def _finish(
+            session: AsyncSession,
+            task: Task,
+            worker_id: str | None,
+            status: TaskStatus,
+            result: dict[str, Any] | None,
+            error: str | None,
+    ) -> bool:
+        """Переводит арендованную задачу в конечный статус и разблокирует родительскую"""
+        finished = await session.execute(
+            update(TaskModel)
+            .where(
+                TaskModel.key == task.key,
+                TaskModel.status == TaskStatus.LEASED,
+                TaskModel.worker_id == worker_id,
+            )
+            .values(status=status, lease_until=None, result=result, error=error)
+        )
+        if finished.rowcount == 0:
+            return False
+        if task.parent is not None:
+            await session.execute(
+                update(TaskModel)
+                .where(TaskModel.key == task.parent, TaskModel.blocked_by > 0)
+                .values(blocked_by=TaskModel.blocked_by - 1)
+            )
+        return True
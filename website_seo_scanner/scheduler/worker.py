@@ -0,0 +1,249 @@
+"""Обработчики задач сканирования, работающие в отдельных процессах"""
+
+from typing import Any
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import socket
+from collections.abc import Awaitable, Callable
+
+from pydantic import HttpUrl
+
+from ..browser import BrowserPool
+from ..crawler import discover_site_tree
+from ..depends import create_scan_repository, create_task_queue
+from ..fetching import FetchMode, create_http_client, fetch_html, requires_rendering
+from ..politeness import get_host_scheduler
+from ..report import ScanSummary, ScanSummaryBuilder
+from ..schemas import PageFinding, SitePage
+from ..services import form_rendered_site_page, form_static_site_page
+from ..settings import settings
+from ..storage import Scan, ScanRepository
+from ..tree import PRIORITY_KEYWORDS, TreeNode, extract_key_pages
+from .base import Task, TaskKind, TaskQueue
+
+# Максимальное количество ключевых страниц сайта
+MAX_KEY_PAGES = 15
+# Максимальное количество замечаний одного сканирования при агрегации
+MAX_SCAN_FINDINGS = 100_000
+
+logger = logging.getLogger(__name__)
+
+
+async def submit_site_scan(
+        queue: TaskQueue, url: HttpUrl, fetch_mode: FetchMode | None = None
+) -> Scan:
+    """Ставит сканирование сайта в очередь задач.
+
+    :param queue: Очередь задач.
+    :param url: URL адрес сайта.
+    :param fetch_mode: Режим загрузки страниц.
+    :return Созданное сканирование.
+    """
+    scan = Scan.for_url(url)
+    await queue.enqueue([Task.create(
+        scan.id,
+        TaskKind.BUILD_TREE,
+        payload={
+            "scan": scan.model_dump(mode="json"),
+            "fetch_mode": fetch_mode or settings.fetch.mode,
+        },
+    )])
+    return scan
+
+
+async def get_scan_summary(queue: TaskQueue, scan_id: str) -> ScanSummary | None:
+    """Получает итоговую сводку сканирования, если агрегация уже выполнена"""
+    task = await queue.get_task(Task.create(scan_id, TaskKind.AGGREGATE).key)
+    if task is None or task.result is None:
+        return None
+    return ScanSummary.model_validate(task.result)
+
+
+class Worker:
+    """Обработчик задач сканирования.
+    Арендует задачи из очереди, продлевает аренду во время выполнения
+    и идемпотентно записывает результаты в хранилище.
+    """
+
+    def __init__(
+            self,
+            queue: TaskQueue,
+            repository: ScanRepository,
+            browser_pool: BrowserPool,
+            worker_id: str | None = None,
+    ) -> None:
+        self.queue = queue
+        self.repository = repository
+        self.browser_pool = browser_pool
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: dict[TaskKind, Callable[[Task], Awaitable[dict[str, Any] | None]]] = {
+            TaskKind.BUILD_TREE: self.build_tree,
+            TaskKind.SELECT_PAGES: self.select_pages,
+            TaskKind.SCAN_PAGE: self.scan_page,
+            TaskKind.AGGREGATE: self.aggregate,
+        }
+
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        """Обрабатывает задачи до установки stop_event"""
+        stop_event = stop_event or asyncio.Event()
+        logger.info("Worker %s started", self.worker_id)
+        while not stop_event.is_set():
+            task = await self.queue.lease(self.worker_id, settings.scheduler.lease_time)
+            if task is None:
+                await self.queue.reap_expired()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        stop_event.wait(), timeout=settings.scheduler.poll_interval
+                    )
+                continue
+            await self.process(task)
+        logger.info("Worker %s stopped", self.worker_id)
+
+    async def process(self, task: Task) -> None:
+        """Выполняет задачу, продлевая её аренду до завершения"""
+        heartbeat = asyncio.create_task(self._keep_lease(task))
+        try:
+            result = await self._handlers[task.kind](task)
+        except Exception as e:
+            logger.exception("Task %s failed on attempt %s", task.key, task.attempts)
+            retry_delay = settings.scheduler.retry_delay * 2 ** (task.attempts - 1)
+            await self.queue.fail(task, self.worker_id, str(e), retry_delay)
+            return
+        finally:
+            heartbeat.cancel()
+        if not await self.queue.complete(task, self.worker_id, result):
+            logger.warning("Task %s lease was lost before completion", task.key)
+
+    async def _keep_lease(self, task: Task) -> None:
+        lease_time = settings.scheduler.lease_time
+        while True:
+            await asyncio.sleep(lease_time / 3)
+            if not await self.queue.extend_lease(task, self.worker_id, lease_time):
+                logger.warning("Task %s lease was lost", task.key)
+                return
+
+    async def build_tree(self, task: Task) -> None:
+        """Строит дерево сайта и ставит задачу выбора страниц"""
+        scan = Scan.model_validate(task.payload["scan"])
+        await self.repository.create_scan(scan)
+        tree = await discover_site_tree(scan.url)
+        await self.queue.enqueue([Task.create(
+            scan.id,
+            TaskKind.SELECT_PAGES,
+            payload={**task.payload, "tree": tree.model_dump(mode="json")},
+        )])
+
+    async def select_pages(self, task: Task) -> dict[str, Any]:
+        """Выбирает ключевые страницы и ставит задачи их сканирования и агрегации.
+        Агрегация заблокирована до завершения сканирования всех страниц.
+        """
+        scan = Scan.model_validate(task.payload["scan"])
+        tree = TreeNode.model_validate(task.payload["tree"])
+        urls = await get_host_scheduler().filter_allowed(
+            extract_key_pages(tree, list(PRIORITY_KEYWORDS), max_result=MAX_KEY_PAGES)
+        )
+        aggregate_task = Task.create(
+            scan.id,
+            TaskKind.AGGREGATE,
+            payload={"scan": task.payload["scan"]},
+            blocked_by=len(urls),
+        )
+        page_tasks = [
+            Task.create(
+                scan.id,
+                TaskKind.SCAN_PAGE,
+                suffix=str(url),
+                payload={
+                    "scan": task.payload["scan"],
+                    "fetch_mode": task.payload["fetch_mode"],
+                    "url": str(url),
+                },
+                parent=aggregate_task.key,
+            )
+            for url in urls
+        ]
+        # Агрегация ставится первой, чтобы завершение страниц всегда её разблокировало
+        await self.queue.enqueue([aggregate_task])
+        await self.queue.enqueue(page_tasks)
+        return {"urls": [str(url) for url in urls]}
+
+    async def scan_page(self, task: Task) -> None:
+        """Сканирует страницу и записывает результат в хранилище"""
+        scan = Scan.model_validate(task.payload["scan"])
+        fetch_mode = FetchMode(task.payload["fetch_mode"])
+        url = HttpUrl(task.payload["url"])
+        site_page: SitePage | None = None
+        if fetch_mode != FetchMode.BROWSER:
+            async with create_http_client() as client:
+                fetched_page = await fetch_html(client, url)
+            if fetched_page is not None and (
+                    fetch_mode == FetchMode.HTTP or not requires_rendering(fetched_page.html)
+            ):
+                site_page = form_static_site_page(fetched_page)
+        if site_page is None and fetch_mode != FetchMode.HTTP:
+            async with self.browser_pool.page() as page:
+                site_page = await form_rendered_site_page(page, str(url))
+        if site_page is not None:
+            await self.repository.add_pages(scan, [site_page])
+
+    async def aggregate(self, task: Task) -> dict[str, Any]:
+        """Формирует итоговую сводку по сохранённым страницам сканирования"""
+        scan = Scan.model_validate(task.payload["scan"])
+        page_records = await self.repository.get_pages(scan.id)
+        finding_records = await self.repository.find_findings(
+            scan_id=scan.id, limit=MAX_SCAN_FINDINGS
+        )
+        findings: dict[str, list[PageFinding]] = {}
+        for finding_record in finding_records:
+            findings.setdefault(str(finding_record.url), []).append(PageFinding(
+                level=finding_record.level,
+                message=finding_record.message,
+                category=finding_record.category,
+                element=finding_record.element,
+            ))
+        summary_builder = ScanSummaryBuilder(scan.url)
+        for page_record in page_records:
+            summary_builder.add(SitePage(
+                url=page_record.url,
+                rendering_time=page_record.rendering_time,
+                findings=findings.get(str(page_record.url), []),
+                content=page_record.content,
+            ))
+        return summary_builder.build().model_dump(mode="json")
+
+
+async def _run_worker() -> None:
+    queue, repository = create_task_queue(), create_scan_repository()
+    await queue.setup()
+    await repository.setup()
+    try:
+        async with BrowserPool() as browser_pool:
+            await Worker(queue, repository, browser_pool).run()
+    finally:
+        await queue.close()
+        await repository.close()
+
+
+def _worker_main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_worker())
+
+
+def run_workers(processes: int | None = None) -> None:
+    """Запускает процессы-обработчики, у каждого свой браузер и цикл событий.
+
+    :param processes: Количество процессов, по умолчанию из settings.
+    """
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker_main, name=f"scan-worker-{index}")
+        for index in range(processes or settings.scheduler.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
@@ -12,8 +12,16 @@ class PageMeta(BaseModel):
 
 
 class PageContent(BaseModel):
+    """Контент страницы
+
+    Attributes:
+        meta: Мета-данные страницы.
+        text: Текст основного контента.
+        links: Внутренние ссылки страницы на другие страницы сайта.
+    """
     meta: PageMeta
     text: str = ""
+    links: list[str] = []
 
 
 class SitePage(BaseModel):
@@ -0,0 +1,213 @@
+"""Построение семантического ядра сайта по всем просканированным страницам"""
+
+from collections.abc import Iterable
+
+import numpy as np
+from pydantic import HttpUrl
+from scipy import sparse
+from sklearn.cluster import HDBSCAN
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from .clustering import NOISE_LABEL
+from .nlp import preprocess_texts
+from .schemas import SemanticCore, SitePage, ThematicCluster
+
+# Размер N-грамм словаря: униграммы - ключевые слова, остальные - ключевые фразы
+NGRAM_RANGE = (1, 3)
+# Минимальный размер тематического кластера
+MIN_CLUSTER_SIZE = 2
+# Количество ключевых слов в названии кластера
+CLUSTER_NAME_KEYWORDS = 3
+# Доля удалённых строк матрицы, после которой они вычищаются из корпуса
+REMOVED_ROWS_COMPACTION_RATIO = 0.25
+
+
+class SemanticCoreBuilder:
+    """Строит семантическое ядро сайта по корпусу всех его страниц.
+    Хранит разреженную матрицу документ-термин с растущим словарём и частотами
+    документов, поэтому добавление новых страниц обрабатывает только их тексты,
+    а IDF пересчитывается по накопленным частотам без повторного обучения.
+
+    Пример использования:
+        builder = SemanticCoreBuilder()
+        builder.add_pages(site_pages)
+        semantic_core = builder.build()
+    """
+
+    def __init__(self, ngram_range: tuple[int, int] = NGRAM_RANGE) -> None:
+        self._analyzer = CountVectorizer(ngram_range=ngram_range).build_analyzer()
+        self._vocabulary: dict[str, int] = {}
+        self._document_frequency: list[int] = []
+        self._indptr: list[int] = [0]
+        self._indices: list[int] = []
+        self._counts: list[int] = []
+        self._urls: list[HttpUrl] = []
+        self._rows: dict[str, int] = {}
+        self._removed: set[int] = set()
+        self._matrix: sparse.csr_matrix | None = None
+
+    @property
+    def urls(self) -> list[HttpUrl]:
+        """URL адреса страниц корпуса в порядке строк матрицы"""
+        return [url for row, url in enumerate(self._urls) if row not in self._removed]
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """Термины корпуса в порядке столбцов матрицы"""
+        terms = [""] * len(self._vocabulary)
+        for term, column in self._vocabulary.items():
+            terms[column] = term
+        return terms
+
+    def __contains__(self, url: object) -> bool:
+        return str(url) in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add_pages(self, site_pages: Iterable[SitePage]) -> None:
+        """Добавляет страницы в корпус. Повторно просканированная страница
+        заменяет свою прежнюю версию.
+        """
+        site_pages = list(site_pages)
+        processed_texts = preprocess_texts(site_page.content.text for site_page in site_pages)
+        for site_page, processed_text in zip(site_pages, processed_texts, strict=True):
+            self._remove(str(site_page.url))
+            self._append(site_page.url, processed_text)
+        if len(self._removed) > len(self._urls) * REMOVED_ROWS_COMPACTION_RATIO:
+            self._compact()
+        self._matrix = None
+
+    def _remove(self, url: str) -> None:
+        row = self._rows.pop(url, None)
+        if row is None:
+            return
+        for column in self._indices[self._indptr[row]:self._indptr[row + 1]]:
+            self._document_frequency[column] -= 1
+        self._removed.add(row)
+
+    def _compact(self) -> None:
+        """Вычищает строки удалённых версий страниц из матрицы корпуса"""
+        indptr, indices, counts, urls = [0], [], [], []
+        for row, url in enumerate(self._urls):
+            if row in self._removed:
+                continue
+            start, end = self._indptr[row], self._indptr[row + 1]
+            indices.extend(self._indices[start:end])
+            counts.extend(self._counts[start:end])
+            indptr.append(len(indices))
+            urls.append(url)
+        self._indptr, self._indices, self._counts, self._urls = indptr, indices, counts, urls
+        self._rows = {str(url): row for row, url in enumerate(urls)}
+        self._removed.clear()
+
+    def _append(self, url: HttpUrl, processed_text: str) -> None:
+        term_counts: dict[int, int] = {}
+        for term in self._analyzer(processed_text):
+            column = self._vocabulary.setdefault(term, len(self._vocabulary))
+            if column == len(self._document_frequency):
+                self._document_frequency.append(0)
+            term_counts[column] = term_counts.get(column, 0) + 1
+        for column in term_counts:
+            self._document_frequency[column] += 1
+        self._indices.extend(term_counts)
+        self._counts.extend(term_counts.values())
+        self._indptr.append(len(self._indices))
+        self._rows[str(url)] = len(self._urls)
+        self._urls.append(url)
+
+    @property
+    def document_term_matrix(self) -> sparse.csr_matrix:
+        """Разреженная матрица количества терминов в страницах корпуса"""
+        if self._matrix is None:
+            matrix = sparse.csr_matrix(
+                (
+                    np.asarray(self._counts, dtype=np.float32),
+                    np.asarray(self._indices, dtype=np.int32),
+                    np.asarray(self._indptr, dtype=np.int64),
+                ),
+                shape=(len(self._urls), len(self._vocabulary)),
+            )
+            if self._removed:
+                active_rows = [row for row in range(len(self._urls)) if row not in self._removed]
+                matrix = matrix[active_rows]
+            self._matrix = matrix
+        return self._matrix
+
+    def idf(self) -> np.ndarray:
+        """Сглаженный IDF терминов по частотам документов корпуса (как в sklearn)"""
+        document_frequency = np.asarray(self._document_frequency, dtype=np.float32)
+        return np.log((1 + len(self)) / (1 + document_frequency)) + 1
+
+    def tfidf_matrix(self) -> sparse.csr_matrix:
+        """Нормированная TF-IDF матрица страниц корпуса"""
+        return normalize(self.document_term_matrix @ sparse.diags(self.idf()))
+
+    def build(self, top_n: int = 20) -> SemanticCore:
+        """Формирует семантическое ядро сайта и его тематические кластеры.
+
+        :param top_n: Количество ключевых слов и фраз сайта и каждого кластера.
+        :return Семантическое ядро сайта.
+        """
+        if not len(self):
+            return SemanticCore(keywords=[], keyphrases=[], thematic_clusters=[])
+        tfidf_matrix = self.tfidf_matrix()
+        terms = np.asarray(self.vocabulary, dtype=object)
+        is_phrase = np.fromiter((" " in term for term in terms), dtype=bool, count=len(terms))
+        keywords, keyphrases = _top_terms(tfidf_matrix, terms, is_phrase, top_n)
+        urls = self.urls
+        thematic_clusters: list[ThematicCluster] = []
+        for rows in _cluster_rows(tfidf_matrix):
+            cluster_matrix = tfidf_matrix[rows]
+            cluster_keywords, cluster_keyphrases = _top_terms(
+                cluster_matrix, terms, is_phrase, top_n
+            )
+            thematic_clusters.append(ThematicCluster(
+                name=", ".join(cluster_keywords[:CLUSTER_NAME_KEYWORDS]),
+                keywords=cluster_keywords,
+                keyphrases=cluster_keyphrases,
+                relevance_score=_cohesion(cluster_matrix),
+                pages=[urls[row] for row in rows],
+            ))
+        thematic_clusters.sort(key=lambda cluster: len(cluster.pages), reverse=True)
+        return SemanticCore(
+            keywords=keywords, keyphrases=keyphrases, thematic_clusters=thematic_clusters
+        )
+
+
+def _top_terms(
+        tfidf_matrix: sparse.csr_matrix, terms: np.ndarray, is_phrase: np.ndarray, top_n: int
+) -> tuple[list[str], list[str]]:
+    """Ключевые слова и фразы с наибольшим суммарным TF-IDF"""
+    scores = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+    order = np.argsort(-scores, kind="stable")
+    order = order[scores[order] > 0]
+    keywords = terms[order[~is_phrase[order]][:top_n]].tolist()
+    keyphrases = terms[order[is_phrase[order]][:top_n]].tolist()
+    return keywords, keyphrases
+
+
+def _cluster_rows(tfidf_matrix: sparse.csr_matrix) -> list[list[int]]:
+    """Группирует страницы по косинусному расстоянию TF-IDF векторов.
+    Страницы вне кластеров (шум HDBSCAN) в тематические кластеры не попадают.
+    """
+    if tfidf_matrix.shape[0] < MIN_CLUSTER_SIZE * 2:
+        return [list(range(tfidf_matrix.shape[0]))]
+    distances = np.clip(1 - cosine_similarity(tfidf_matrix), 0, None)
+    labels = HDBSCAN(
+        min_cluster_size=MIN_CLUSTER_SIZE, metric="precomputed", copy=False
+    ).fit_predict(distances)
+    groups: dict[int, list[int]] = {}
+    for row, label in enumerate(labels):
+        if label == NOISE_LABEL:
+            continue
+        groups.setdefault(int(label), []).append(row)
+    return list(groups.values())
+
+
+def _cohesion(cluster_matrix: sparse.csr_matrix) -> float:
+    """Средняя косинусная близость страниц кластера к его центроиду"""
+    centroid = normalize(np.asarray(cluster_matrix.mean(axis=0)))
+    return float(np.clip(cosine_similarity(cluster_matrix, centroid).mean(), 0, 1))
@@ -1,28 +1,161 @@
-from playwright.async_api import async_playwright
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+
+from playwright.async_api import Page
 from pydantic import HttpUrl
 
-from .linting import lint_page
+from .browser import BrowserPool
+from .crawler import discover_site_tree, extract_links
+from .duplicates import DuplicateIndex
+from .fetching import (
+    FetchedPage,
+    FetchMode,
+    create_http_client,
+    iter_fetched_pages,
+    requires_rendering,
+)
+from .linting import lint_html, lint_page
 from .performance import measure_page_rendering_time
+from .politeness import get_host_scheduler
 from .schemas import PageContent, SitePage
-from .tree import PRIORITY_KEYWORDS, build_site_tree, extract_key_pages
-from .utils import extract_page_meta, extract_page_text, iter_pages
-
-
-async def get_site_pages(url: HttpUrl) -> list[SitePage]:
-    tree = build_site_tree(url)
-    urls = extract_key_pages(tree, list(PRIORITY_KEYWORDS), max_result=15)
-    site_pages: list[SitePage] = []
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=False)
-        async for page in iter_pages(browser, urls):
-            rendering_info = await measure_page_rendering_time(page, page.url)
-            findings = await lint_page(page)
-            meta = await extract_page_meta(page)
-            text = await extract_page_text(page)
-            site_pages.append(SitePage(
-                url=HttpUrl(page.url),
-                rendering_time=rendering_info.dom_content_loaded / 100,
-                findings=findings,
-                content=PageContent(meta=meta, text=text),
-            ))
-    return site_pages
+from .settings import settings
+from .storage import Scan, ScanRepository, ScanWriter
+from .tracing import span, traced
+from .tree import PRIORITY_KEYWORDS, extract_key_pages
+from .utils import (
+    extract_meta_from_html,
+    extract_page_meta,
+    extract_page_text,
+    extract_text_from_html,
+)
+
+
+@traced("services.static_page")
+def form_static_site_page(
+        fetched_page: FetchedPage, duplicates: DuplicateIndex | None = None
+) -> SitePage:
+    """Формирует страницу сайта по HTML разметке, загруженной без браузера.
+
+    :param fetched_page: Страница, загруженная HTTP клиентом.
+    :param duplicates: Индекс страниц сканирования для поиска дублей.
+    :return Страница сайта.
+    """
+    with span("page.lint"):
+        findings = lint_html(fetched_page.html, str(fetched_page.url), duplicates)
+    return SitePage(
+        url=fetched_page.url,
+        rendering_time=fetched_page.elapsed,
+        findings=findings,
+        content=PageContent(
+            meta=extract_meta_from_html(fetched_page.html),
+            text=extract_text_from_html(fetched_page.html),
+            links=extract_links(fetched_page.html, str(fetched_page.url)),
+        ),
+    )
+
+
+@traced("services.rendered_page")
+async def form_rendered_site_page(
+        page: Page, url: str, duplicates: DuplicateIndex | None = None
+) -> SitePage:
+    """Формирует страницу сайта, отрендеренную в браузере.
+
+    :param page: Playwright страница, на которой открывается URL.
+    :param url: URL адрес страницы.
+    :param duplicates: Индекс страниц сканирования для поиска дублей.
+    :return Страница сайта.
+    """
+    # polars нужен только страницам, отрендеренным в браузере
+    from .network import ResourceCapture, lint_resources  # noqa: PLC0415
+
+    # Ресурсы записываются и во время линтинга, чтобы попали отложенные изображения
+    async with ResourceCapture(page) as capture:
+        rendering_info = await measure_page_rendering_time(page, url)
+        with span("page.lint"):
+            findings = await lint_page(page, duplicates)
+    findings.extend(lint_resources(capture.resources))
+    meta = await extract_page_meta(page)
+    text = await extract_page_text(page)
+    links = extract_links(await page.content(), page.url)
+    return SitePage(
+        url=HttpUrl(page.url),
+        rendering_time=rendering_info.dom_content_loaded / 1000,
+        findings=findings,
+        content=PageContent(meta=meta, text=text, links=links),
+    )
+
+
+async def get_site_pages(
+        url: HttpUrl,
+        fetch_mode: FetchMode | None = None,
+        repository: ScanRepository | None = None,
+        browser_pool: BrowserPool | None = None,
+) -> list[SitePage]:
+    """Сканирует ключевые страницы сайта.
+
+    :param url: URL адрес сайта.
+    :param fetch_mode: Режим загрузки страниц, по умолчанию из settings.
+    :param repository: Хранилище, в которое пачками записываются готовые страницы.
+    :param browser_pool: Общий пул браузера, по умолчанию запускается собственный браузер.
+    :return Просканированные страницы сайта.
+    """
+    return [
+        site_page
+        async for site_page in iter_site_pages(url, fetch_mode, repository, browser_pool)
+    ]
+
+
+async def iter_site_pages(
+        url: HttpUrl,
+        fetch_mode: FetchMode | None = None,
+        repository: ScanRepository | None = None,
+        browser_pool: BrowserPool | None = None,
+) -> AsyncIterator[SitePage]:
+    """Сканирует ключевые страницы сайта, отдавая каждую страницу сразу после обработки.
+    В памяти одновременно находится только текущая страница.
+
+    :param url: URL адрес сайта.
+    :param fetch_mode: Режим загрузки страниц, по умолчанию из settings.
+    :param repository: Хранилище, в которое пачками записываются готовые страницы.
+    :param browser_pool: Общий пул браузера, по умолчанию запускается собственный браузер.
+    :return Просканированная страница сайта.
+    """
+    async with AsyncExitStack() as stack:
+        writer = None if repository is None else await stack.enter_async_context(
+            ScanWriter(repository, Scan.for_url(url), settings.storage.batch_size)
+        )
+        async for site_page in _scan_site_pages(url, fetch_mode, browser_pool):
+            if writer is not None:
+                await writer.add(site_page)
+            yield site_page
+
+
+async def _scan_site_pages(
+        url: HttpUrl, fetch_mode: FetchMode | None = None, browser_pool: BrowserPool | None = None
+) -> AsyncIterator[SitePage]:
+    fetch_mode = fetch_mode or FetchMode(settings.fetch.mode)
+    duplicates = DuplicateIndex()
+    tree = await discover_site_tree(url)
+    urls = await get_host_scheduler().filter_allowed(
+        extract_key_pages(tree, list(PRIORITY_KEYWORDS), max_result=15)
+    )
+    if fetch_mode != FetchMode.BROWSER:
+        rendering_urls: list[HttpUrl] = []
+        async with create_http_client() as client:
+            async for page_url, fetched_page in iter_fetched_pages(client, urls):
+                if fetch_mode == FetchMode.HTTP and fetched_page is not None:
+                    yield form_static_site_page(fetched_page, duplicates)
+                elif fetch_mode == FetchMode.HYBRID:
+                    if fetched_page is None or requires_rendering(fetched_page.html):
+                        rendering_urls.append(page_url)
+                    else:
+                        yield form_static_site_page(fetched_page, duplicates)
+        urls = rendering_urls
+    if not urls:
+        return
+    async with AsyncExitStack() as stack:
+        if browser_pool is None:
+            browser_pool = await stack.enter_async_context(BrowserPool(max_contexts=1))
+        async with browser_pool.page() as page:
+            for page_url in urls:
+                yield await form_rendered_site_page(page, str(page_url), duplicates)
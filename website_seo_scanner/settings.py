@@ -1,4 +1,4 @@
-from typing import Final
+from typing import Final, Literal
 
 from pathlib import Path
 
@@ -12,13 +12,305 @@ load_dotenv(ENV_PATH)
 
 
 class EmbeddingsSettings(BaseSettings):
+    """Настройки модели эмбеддингов.
+
+    Attributes:
+        backend: 'remote' - HTTP сервис эмбеддингов, 'local' - модель в процессе сканера.
+        base_url: URL адрес сервиса эмбеддингов.
+        cache_size: Максимальное количество векторов в кэше процесса.
+        model: Модель sentence-transformers для локального backend.
+        device: Устройство для локальной модели.
+        batch_size: Размер пачки текстов локальной модели.
+        threads: Количество потоков torch, по умолчанию все ядра.
+        runtime: Среда выполнения локальной модели.
+        onnx_file: Файл ONNX модели в репозитории модели, например квантованной
+            'onnx/model_qint8_avx512_vnni.onnx'.
+    """
+    backend: Literal["remote", "local"] = "remote"
     base_url: str = "http://127.0.0.1:8000"
+    cache_size: int = 10_000
+    model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    device: str = "cpu"
+    batch_size: int = 32
+    threads: int | None = None
+    runtime: Literal["torch", "onnx"] = "torch"
+    onnx_file: str | None = None
 
     model_config = SettingsConfigDict(env_prefix="EMBEDDINGS_")
 
 
+class NLPSettings(BaseSettings):
+    """Настройки обработки текстов.
+
+    Attributes:
+        data_dir: Каталог с корпусами NLTK, по умолчанию стандартные каталоги NLTK.
+        lemmatizer: Лемматизатор текстов. 'spacy' учитывает морфологию русского языка,
+            но требует модель spacy_model, которая загружается отдельно:
+            python -m website_seo_scanner.corpora.
+        spacy_model: Модель spaCy для лемматизатора 'spacy'.
+        n_process: Количество процессов spaCy при лемматизации.
+        batch_size: Количество текстов в пачке spaCy.
+    """
+    data_dir: Path | None = None
+    lemmatizer: Literal["wordnet", "spacy"] = "wordnet"
+    spacy_model: str = "ru_core_news_sm"
+    n_process: int = 1
+    batch_size: int = 256
+
+    model_config = SettingsConfigDict(env_prefix="NLP_")
+
+
+class ReadinessSettings(BaseSettings):
+    """Настройки ожидания готовности страницы после навигации.
+
+    Attributes:
+        strategy: Стратегия готовности страницы.
+        timeout: Общий дедлайн навигации и ожидания в секундах.
+        max_inflight: Допустимое количество незавершённых запросов для 'networkidle'.
+        idle_time: Время без сетевой активности в секундах для 'networkidle'.
+        quiet_time: Время без изменений DOM в секундах для 'domquiet'.
+    """
+    strategy: Literal["domcontentloaded", "load", "networkidle", "domquiet"] = "domquiet"
+    timeout: float = 15
+    max_inflight: int = 2
+    idle_time: float = 0.5
+    quiet_time: float = 0.5
+
+    model_config = SettingsConfigDict(env_prefix="READINESS_")
+
+
+class FetchSettings(BaseSettings):
+    """Настройки загрузки страниц.
+
+    Attributes:
+        mode: Режим загрузки: 'browser' - только Playwright, 'http' - только HTTP клиент,
+        'hybrid' - HTTP клиент, а страницы с клиентским рендерингом через Playwright.
+        timeout: Таймаут HTTP запроса в секундах.
+        max_connections: Размер пула соединений HTTP клиента.
+        max_concurrency: Максимальное количество одновременных HTTP запросов.
+    """
+    mode: Literal["browser", "http", "hybrid"] = "hybrid"
+    timeout: float = 15
+    max_connections: int = 20
+    max_concurrency: int = 10
+
+    model_config = SettingsConfigDict(env_prefix="FETCH_")
+
+
+class CrawlSettings(BaseSettings):
+    """Настройки обхода ссылок для сайтов без sitemap.xml.
+
+    Attributes:
+        enabled: Обходить ссылки, если по sitemap.xml построен только корень дерева.
+        max_pages: Максимальное количество загружаемых страниц.
+        max_depth: Максимальная глубина перехода по ссылкам от главной страницы.
+        bloom_filter: Хранить посещённые URL в фильтре Блума вместо множества.
+        bloom_capacity: Ожидаемое количество URL в фильтре Блума.
+        bloom_error_rate: Допустимая доля ложных срабатываний фильтра Блума.
+    """
+    enabled: bool = True
+    max_pages: int = 300
+    max_depth: int = 4
+    bloom_filter: bool = False
+    bloom_capacity: int = 1_000_000
+    bloom_error_rate: float = 0.001
+
+    model_config = SettingsConfigDict(env_prefix="CRAWL_")
+
+
+class LinkGraphSettings(BaseSettings):
+    """Настройки графа внутренних ссылок.
+
+    Attributes:
+        enabled: Строить граф ссылок и учитывать PageRank при выборе ключевых страниц.
+        max_pages: Максимальное количество страниц, загружаемых для графа сайтов с sitemap.xml.
+            По умолчанию загружается только главная страница: PageRank и глубину клика
+            получают страницы, на которые она ссылается. 0 - граф строится только
+            при обходе ссылок сайтов без sitemap.xml.
+        max_depth: Максимальная глубина перехода по ссылкам при построении графа.
+    """
+    enabled: bool = True
+    max_pages: int = 1
+    max_depth: int = 2
+
+    model_config = SettingsConfigDict(env_prefix="LINK_GRAPH_")
+
+
+class PolitenessSettings(BaseSettings):
+    """Настройки вежливого обхода сайтов.
+
+    Attributes:
+        max_per_host: Максимальное количество одновременных запросов к одному хосту.
+        min_per_host: Минимальное количество одновременных запросов к одному хосту.
+        respect_robots: Учитывать robots.txt (запреты, Crawl-delay и sitemap).
+        target_latency: Время ответа в секундах, выше которого нагрузка на хост снижается.
+        max_backoff: Максимальная пауза для хоста после ошибок в секундах.
+        max_retries: Количество повторных запросов при ответах 429 и 503.
+        user_agent: User-agent для правил robots.txt.
+    """
+    max_per_host: int = 4
+    min_per_host: int = 1
+    respect_robots: bool = True
+    target_latency: float = 2
+    max_backoff: float = 60
+    max_retries: int = 2
+    user_agent: str = "*"
+
+    model_config = SettingsConfigDict(env_prefix="POLITENESS_")
+
+
+class BrowserSettings(BaseSettings):
+    """Настройки браузера.
+
+    Attributes:
+        headless: Запускать браузер без графического интерфейса.
+        max_contexts: Максимальное количество одновременно открытых контекстов.
+    """
+    headless: bool = False
+    max_contexts: int = 4
+
+    model_config = SettingsConfigDict(env_prefix="BROWSER_")
+
+
+class JobsSettings(BaseSettings):
+    """Настройки очереди задач сканирования.
+
+    Attributes:
+        max_concurrency: Максимальное количество одновременно выполняемых сканирований.
+        tenant_concurrency: Максимальное количество одновременных сканирований одного клиента.
+    """
+    max_concurrency: int = 8
+    tenant_concurrency: int = 2
+
+    model_config = SettingsConfigDict(env_prefix="JOBS_")
+
+
+class MongoSettings(BaseSettings):
+    host: str = "localhost"
+    port: int = 27017
+    username: str = ""
+    password: str = ""
+    database: str = "website_seo_scanner"
+
+    model_config = SettingsConfigDict(env_prefix="MONGO_")
+
+    @property
+    def url(self) -> str:
+        if not self.username:
+            return f"mongodb://{self.host}:{self.port}"
+        return f"mongodb://{self.username}:{self.password}@{self.host}:{self.port}"
+
+
+class LLMSettings(BaseSettings):
+    """Настройки вызовов LLM.
+
+    Attributes:
+        cache_enabled: Сохранять ответы LLM и не повторять одинаковые запросы.
+        cache_path: Путь до файла базы данных SQLite с ответами LLM.
+        cache_ttl: Время жизни ответа в кэше в секундах, None - без ограничения.
+        max_concurrency: Максимальное количество одновременных запросов пачки.
+    """
+    cache_enabled: bool = True
+    cache_path: Path = BASE_DIR / "llm_cache.db"
+    cache_ttl: float | None = 7 * 24 * 60 * 60
+    max_concurrency: int = 4
+
+    model_config = SettingsConfigDict(env_prefix="LLM_")
+
+
+class StorageSettings(BaseSettings):
+    """Настройки хранилища результатов сканирования.
+
+    Attributes:
+        enabled: Сохранять результаты сканирований, запущенных через API.
+        backend: Используемое хранилище.
+        sqlite_path: Путь до файла базы данных SQLite.
+        batch_size: Количество страниц в одной пачке записи.
+    """
+    enabled: bool = False
+    backend: Literal["mongo", "sqlite"] = "mongo"
+    sqlite_path: Path = BASE_DIR / "scans.db"
+    batch_size: int = 5
+
+    model_config = SettingsConfigDict(env_prefix="STORAGE_")
+
+
+class SchedulerSettings(BaseSettings):
+    """Настройки распределённого планировщика сканирований.
+
+    Attributes:
+        backend: Очередь задач: 'sqlite' - локальная, 'mongo' - общая для нескольких машин.
+        sqlite_path: Путь до файла локальной очереди задач.
+        workers: Количество процессов-обработчиков.
+        lease_time: Время аренды задачи обработчиком в секундах.
+        poll_interval: Интервал опроса пустой очереди в секундах.
+        max_attempts: Максимальное количество попыток выполнения задачи.
+        retry_delay: Базовая задержка перед повторной попыткой в секундах.
+    """
+    backend: Literal["mongo", "sqlite"] = "sqlite"
+    sqlite_path: Path = BASE_DIR / "tasks.db"
+    workers: int = 2
+    lease_time: float = 120
+    poll_interval: float = 1
+    max_attempts: int = 3
+    retry_delay: float = 5
+
+    model_config = SettingsConfigDict(env_prefix="SCHEDULER_")
+
+
+class MCPSettings(BaseSettings):
+    """Настройки MCP сервера.
+
+    Attributes:
+        transport: Транспорт MCP сервера.
+        host: Адрес для HTTP транспорта.
+        port: Порт для HTTP транспорта.
+        tree_cache_ttl: Время жизни дерева сайта в кэше в секундах.
+        page_cache_size: Максимальное количество страниц в кэше.
+        semantic_core_cache_size: Максимальное количество сайтов в кэше корпусов
+            семантических ядер.
+    """
+    transport: Literal["stdio", "http"] = "stdio"
+    host: str = "127.0.0.1"
+    port: int = 8090
+    tree_cache_ttl: float = 3600
+    page_cache_size: int = 128
+    semantic_core_cache_size: int = 16
+
+    model_config = SettingsConfigDict(env_prefix="MCP_")
+
+
+class TracingSettings(BaseSettings):
+    """Настройки трассировки этапов сканирования.
+
+    Attributes:
+        enabled: Измерять длительность этапов.
+        buckets: Границы корзин гистограмм длительности в секундах.
+        opentelemetry: Дублировать спаны в OpenTelemetry (нужен пакет opentelemetry-api).
+    """
+    enabled: bool = True
+    buckets: list[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+    opentelemetry: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="TRACING_")
+
+
 class Settings(BaseSettings):
     embeddings: EmbeddingsSettings = EmbeddingsSettings()
+    nlp: NLPSettings = NLPSettings()
+    readiness: ReadinessSettings = ReadinessSettings()
+    fetch: FetchSettings = FetchSettings()
+    crawl: CrawlSettings = CrawlSettings()
+    link_graph: LinkGraphSettings = LinkGraphSettings()
+    politeness: PolitenessSettings = PolitenessSettings()
+    browser: BrowserSettings = BrowserSettings()
+    jobs: JobsSettings = JobsSettings()
+    mongo: MongoSettings = MongoSettings()
+    storage: StorageSettings = StorageSettings()
+    llm: LLMSettings = LLMSettings()
+    scheduler: SchedulerSettings = SchedulerSettings()
+    mcp: MCPSettings = MCPSettings()
+    tracing: TracingSettings = TracingSettings()
 
 
 settings: Final[Settings] = Settings()
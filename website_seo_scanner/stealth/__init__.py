@@ -1,5 +1,11 @@
 __all__ = (
     "create_new_stealth_context",
+    "generate_extra_http_headers",
+    "generate_user_agent",
 )
 
-from .fingerprint import create_new_stealth_context
+from .fingerprint import (
+    create_new_stealth_context,
+    generate_extra_http_headers,
+    generate_user_agent,
+)
@@ -0,0 +1,13 @@
+__all__ = (
+    "FindingRecord",
+    "MongoScanRepository",
+    "PageRecord",
+    "SQLiteScanRepository",
+    "Scan",
+    "ScanRepository",
+    "ScanWriter",
+)
+
+from .base import FindingRecord, PageRecord, Scan, ScanRepository, ScanWriter
+from .mongo import MongoScanRepository
+from .sqlite import SQLiteScanRepository
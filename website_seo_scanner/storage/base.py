@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Self
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from types import TracebackType
+from urllib.parse import urlparse
+from uuid import uuid4
+
+from pydantic import BaseModel, Field, HttpUrl, NonNegativeFloat
+
+from ..schemas import FindingLevel, PageContent, SitePage
+
+# Размер пачки страниц для записи по умолчанию
+DEFAULT_BATCH_SIZE = 5
+# Максимальное количество замечаний в выборке по умолчанию
+DEFAULT_FINDINGS_LIMIT = 100
+
+
+class Scan(BaseModel):
+    """Запуск сканирования сайта
+
+    Attributes:
+        id: Уникальный идентификатор сканирования.
+        domain: Домен сканируемого сайта.
+        url: URL адрес сайта.
+        started_at: Время начала сканирования.
+    """
+    id: str = Field(default_factory=lambda: uuid4().hex)
+    domain: str
+    url: HttpUrl
+    started_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    @classmethod
+    def for_url(cls, url: HttpUrl) -> Scan:
+        """Создаёт новое сканирование для сайта"""
+        return cls(domain=urlparse(str(url)).netloc, url=url)
+
+
+class PageRecord(BaseModel):
+    """Сохранённая страница сайта"""
+    scan_id: str
+    domain: str
+    url: HttpUrl
+    scanned_at: datetime
+    rendering_time: NonNegativeFloat
+    content: PageContent
+
+
+class FindingRecord(BaseModel):
+    """Сохранённое замечание страницы"""
+    scan_id: str
+    domain: str
+    url: HttpUrl
+    scanned_at: datetime
+    level: FindingLevel
+    category: str
+    message: str
+    element: str
+
+
+def to_records(
+        scan: Scan, pages: Sequence[SitePage]
+) -> tuple[list[PageRecord], list[FindingRecord]]:
+    """Раскладывает страницы сканирования на записи страниц и замечаний.
+    Из страниц с одинаковым URL (например, после редиректа) остаётся последняя,
+    как и при повторной записи страницы следующей пачкой.
+    """
+    scanned_at = datetime.now(UTC)
+    page_records: list[PageRecord] = []
+    finding_records: list[FindingRecord] = []
+    unique_pages = {str(page.url): page for page in pages}
+    for page in unique_pages.values():
+        page_records.append(PageRecord(
+            scan_id=scan.id,
+            domain=scan.domain,
+            url=page.url,
+            scanned_at=scanned_at,
+            rendering_time=page.rendering_time,
+            content=page.content,
+        ))
+        finding_records.extend(
+            FindingRecord(
+                scan_id=scan.id,
+                domain=scan.domain,
+                url=page.url,
+                scanned_at=scanned_at,
+                **finding.model_dump(),
+            )
+            for finding in page.findings
+        )
+    return page_records, finding_records
+
+
+class ScanRepository(ABC):
+    """Хранилище результатов сканирования"""
+
+    @abstractmethod
+    async def setup(self) -> None:
+        """Создаёт коллекции/таблицы и индексы"""
+
+    @abstractmethod
+    async def create_scan(self, scan: Scan) -> None:
+        """Сохраняет запуск сканирования. Повторное сохранение перезаписывает запуск"""
+
+    @abstractmethod
+    async def add_pages(self, scan: Scan, pages: Sequence[SitePage]) -> None:
+        """Пакетно сохраняет страницы сканирования и их замечания.
+        Повторное сохранение страницы заменяет её предыдущую версию и замечания.
+        """
+
+    @abstractmethod
+    async def get_scans(self, domain: str) -> list[Scan]:
+        """Получает сканирования сайта, начиная с последнего"""
+
+    @abstractmethod
+    async def get_pages(self, scan_id: str) -> list[PageRecord]:
+        """Получает страницы сканирования"""
+
+    @abstractmethod
+    async def find_findings(
+            self,
+            domain: str | None = None,
+            levels: Sequence[FindingLevel] | None = None,
+            categories: Sequence[str] | None = None,
+            since: datetime | None = None,
+            limit: int = DEFAULT_FINDINGS_LIMIT,
+            *,
+            scan_id: str | None = None,
+    ) -> list[FindingRecord]:
+        """Ищет замечания по всем сканированиям.
+
+        :param domain: Домен сайта.
+        :param levels: Уровни значимости замечаний.
+        :param categories: Категории замечаний.
+        :param since: Время, начиная с которого ищутся замечания.
+        :param limit: Максимальное количество замечаний.
+        :param scan_id: Идентификатор сканирования.
+        :return Найденные замечания, начиная с последних.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Закрывает соединение с хранилищем"""
+
+
+class ScanWriter:
+    """Пакетная запись страниц сканирования по мере их готовности.
+
+    Пример использования:
+        async with ScanWriter(repository, Scan.for_url(url)) as writer:
+            async for site_page in ...:
+                await writer.add(site_page)
+    """
+
+    def __init__(
+            self, repository: ScanRepository, scan: Scan, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> None:
+        self.repository = repository
+        self.scan = scan
+        self._batch_size = batch_size
+        self._buffer: list[SitePage] = []
+
+    async def __aenter__(self) -> Self:
+        await self.repository.create_scan(self.scan)
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.flush()
+
+    async def add(self, page: SitePage) -> None:
+        """Добавляет страницу в буфер, записывая пачку при его заполнении"""
+        self._buffer.append(page)
+        if len(self._buffer) >= self._batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленные страницы"""
+        if not self._buffer:
+            return
+        pages, self._buffer = self._buffer, []
+        await self.repository.add_pages(self.scan, pages)
@@ -0,0 +1,118 @@
+from typing import Any
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient, IndexModel, ReplaceOne
+
+from ..schemas import FindingLevel, SitePage
+from .base import (
+    DEFAULT_FINDINGS_LIMIT,
+    FindingRecord,
+    PageRecord,
+    Scan,
+    ScanRepository,
+    to_records,
+)
+
+SCANS_COLLECTION, PAGES_COLLECTION, FINDINGS_COLLECTION = "scans", "pages", "findings"
+
+
+class MongoScanRepository(ScanRepository):
+    """Хранилище результатов сканирования в MongoDB"""
+
+    def __init__(self, url: str, database: str) -> None:
+        self._client: AsyncMongoClient[dict[str, Any]] = AsyncMongoClient(url, tz_aware=True)
+        self._database = self._client[database]
+
+    async def setup(self) -> None:
+        await self._database[SCANS_COLLECTION].create_indexes([
+            IndexModel([("domain", ASCENDING), ("started_at", DESCENDING)]),
+        ])
+        await self._database[PAGES_COLLECTION].create_indexes([
+            IndexModel([("scan_id", ASCENDING), ("url", ASCENDING)], unique=True),
+            IndexModel([("domain", ASCENDING), ("url", ASCENDING), ("scanned_at", DESCENDING)]),
+        ])
+        await self._database[FINDINGS_COLLECTION].create_indexes([
+            IndexModel([("scan_id", ASCENDING), ("url", ASCENDING)]),
+            IndexModel([("domain", ASCENDING), ("url", ASCENDING), ("scanned_at", DESCENDING)]),
+            IndexModel([
+                ("level", ASCENDING), ("category", ASCENDING), ("scanned_at", DESCENDING)
+            ]),
+        ])
+
+    async def create_scan(self, scan: Scan) -> None:
+        document = scan.model_dump(mode="json", exclude={"id", "started_at"})
+        await self._database[SCANS_COLLECTION].replace_one(
+            {"_id": scan.id}, {"started_at": scan.started_at, **document}, upsert=True
+        )
+
+    async def add_pages(self, scan: Scan, pages: Sequence[SitePage]) -> None:
+        page_records, finding_records = to_records(scan, pages)
+        if not page_records:
+            return
+        await self._database[PAGES_COLLECTION].bulk_write([
+            ReplaceOne(
+                {"scan_id": scan.id, "url": str(record.url)}, _to_document(record), upsert=True
+            )
+            for record in page_records
+        ], ordered=False)
+        await self._database[FINDINGS_COLLECTION].delete_many({
+            "scan_id": scan.id, "url": {"$in": [str(record.url) for record in page_records]}
+        })
+        if finding_records:
+            await self._database[FINDINGS_COLLECTION].insert_many(
+                [_to_document(record) for record in finding_records], ordered=False
+            )
+
+    async def get_scans(self, domain: str) -> list[Scan]:
+        cursor = (
+            self._database[SCANS_COLLECTION]
+            .find({"domain": domain})
+            .sort("started_at", DESCENDING)
+        )
+        return [
+            Scan.model_validate({**document, "id": document.pop("_id")})
+            async for document in cursor
+        ]
+
+    async def get_pages(self, scan_id: str) -> list[PageRecord]:
+        cursor = self._database[PAGES_COLLECTION].find({"scan_id": scan_id}, {"_id": False})
+        return [PageRecord.model_validate(document) async for document in cursor]
+
+    async def find_findings(
+            self,
+            domain: str | None = None,
+            levels: Sequence[FindingLevel] | None = None,
+            categories: Sequence[str] | None = None,
+            since: datetime | None = None,
+            limit: int = DEFAULT_FINDINGS_LIMIT,
+            *,
+            scan_id: str | None = None,
+    ) -> list[FindingRecord]:
+        query: dict[str, Any] = {}
+        if scan_id is not None:
+            query["scan_id"] = scan_id
+        if domain is not None:
+            query["domain"] = domain
+        if levels:
+            query["level"] = {"$in": list(levels)}
+        if categories:
+            query["category"] = {"$in": list(categories)}
+        if since is not None:
+            query["scanned_at"] = {"$gte": since}
+        cursor = (
+            self._database[FINDINGS_COLLECTION]
+            .find(query, {"_id": False})
+            .sort("scanned_at", DESCENDING)
+            .limit(limit)
+        )
+        return [FindingRecord.model_validate(document) async for document in cursor]
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+def _to_document(record: PageRecord | FindingRecord) -> dict[str, Any]:
+    """Сериализует запись, сохраняя время в нативном для MongoDB формате"""
+    return {**record.model_dump(mode="json"), "scanned_at": record.scanned_at}
@@ -0,0 +1,199 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    delete,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from ..schemas import FindingLevel, SitePage
+from .base import (
+    DEFAULT_FINDINGS_LIMIT,
+    FindingRecord,
+    PageRecord,
+    Scan,
+    ScanRepository,
+    to_records,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ScanModel(Base):
+    __tablename__ = "scans"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    domain: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(Text)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (Index("ix_scans_domain_started_at", "domain", "started_at"),)
+
+
+class PageModel(Base):
+    __tablename__ = "pages"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    scan_id: Mapped[str] = mapped_column(ForeignKey("scans.id", ondelete="CASCADE"))
+    domain: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(Text)
+    scanned_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    rendering_time: Mapped[float] = mapped_column(Float)
+    content: Mapped[dict[str, object]] = mapped_column(JSON)
+
+    __table_args__ = (
+        Index("ix_pages_scan_id_url", "scan_id", "url", unique=True),
+        Index("ix_pages_domain_url_scanned_at", "domain", "url", "scanned_at"),
+    )
+
+
+class FindingModel(Base):
+    __tablename__ = "findings"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    scan_id: Mapped[str] = mapped_column(ForeignKey("scans.id", ondelete="CASCADE"))
+    domain: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(Text)
+    scanned_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    level: Mapped[str] = mapped_column(String(16))
+    category: Mapped[str] = mapped_column(String(64))
+    message: Mapped[str] = mapped_column(Text)
+    element: Mapped[str] = mapped_column(Text)
+
+    __table_args__ = (
+        Index("ix_findings_scan_id_url", "scan_id", "url"),
+        Index("ix_findings_domain_url_scanned_at", "domain", "url", "scanned_at"),
+        Index("ix_findings_level_category_scanned_at", "level", "category", "scanned_at"),
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite не хранит часовой пояс, поэтому время приводится к UTC при чтении"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+class SQLiteScanRepository(ScanRepository):
+    """Хранилище результатов сканирования в SQLite"""
+
+    def __init__(self, path: str) -> None:
+        self._engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+
+    async def setup(self) -> None:
+        async with self._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def create_scan(self, scan: Scan) -> None:
+        async with self._sessionmaker() as session:
+            await session.merge(ScanModel(
+                id=scan.id, domain=scan.domain, url=str(scan.url), started_at=scan.started_at
+            ))
+            await session.commit()
+
+    async def add_pages(self, scan: Scan, pages: Sequence[SitePage]) -> None:
+        page_records, finding_records = to_records(scan, pages)
+        if not page_records:
+            return
+        urls = [str(record.url) for record in page_records]
+        async with self._sessionmaker() as session:
+            for model in (PageModel, FindingModel):
+                await session.execute(
+                    delete(model).where(model.scan_id == scan.id, model.url.in_(urls))
+                )
+            await session.execute(insert(PageModel), [
+                {**record.model_dump(mode="json"), "scanned_at": record.scanned_at}
+                for record in page_records
+            ])
+            if finding_records:
+                await session.execute(insert(FindingModel), [
+                    {**record.model_dump(mode="json"), "scanned_at": record.scanned_at}
+                    for record in finding_records
+                ])
+            await session.commit()
+
+    async def get_scans(self, domain: str) -> list[Scan]:
+        stmt = (
+            select(ScanModel)
+            .where(ScanModel.domain == domain)
+            .order_by(ScanModel.started_at.desc())
+        )
+        async with self._sessionmaker() as session:
+            results = (await session.scalars(stmt)).all()
+        return [
+            Scan(
+                id=model.id,
+                domain=model.domain,
+                url=model.url,
+                started_at=_as_utc(model.started_at),
+            )
+            for model in results
+        ]
+
+    async def get_pages(self, scan_id: str) -> list[PageRecord]:
+        stmt = select(PageModel).where(PageModel.scan_id == scan_id).order_by(PageModel.id)
+        async with self._sessionmaker() as session:
+            results = (await session.scalars(stmt)).all()
+        return [
+            PageRecord(
+                scan_id=model.scan_id,
+                domain=model.domain,
+                url=model.url,
+                scanned_at=_as_utc(model.scanned_at),
+                rendering_time=model.rendering_time,
+                content=model.content,
+            )
+            for model in results
+        ]
+
+    async def find_findings(
+            self,
+            domain: str | None = None,
+            levels: Sequence[FindingLevel] | None = None,
+            categories: Sequence[str] | None = None,
+            since: datetime | None = None,
+            limit: int = DEFAULT_FINDINGS_LIMIT,
+            *,
+            scan_id: str | None = None,
+    ) -> list[FindingRecord]:
+        stmt = select(FindingModel)
+        if scan_id is not None:
+            stmt = stmt.where(FindingModel.scan_id == scan_id)
+        if domain is not None:
+            stmt = stmt.where(FindingModel.domain == domain)
+        if levels:
+            stmt = stmt.where(FindingModel.level.in_([str(level) for level in levels]))
+        if categories:
+            stmt = stmt.where(FindingModel.category.in_(categories))
+        if since is not None:
+            stmt = stmt.where(FindingModel.scanned_at >= since.astimezone(UTC))
+        stmt = stmt.order_by(FindingModel.scanned_at.desc()).limit(limit)
+        async with self._sessionmaker() as session:
+            results = (await session.scalars(stmt)).all()
+        return [
+            FindingRecord(
+                scan_id=model.scan_id,
+                domain=model.domain,
+                url=model.url,
+                scanned_at=_as_utc(model.scanned_at),
+                level=model.level,
+                category=model.category,
+                message=model.message,
+                element=model.element,
+            )
+            for model in results
+        ]
+
+    async def close(self) -> None:
+        await self._engine.dispose()
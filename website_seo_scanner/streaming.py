@@ -0,0 +1,81 @@
+"""Потоковая выдача результатов сканирования в формате NDJSON"""
+
+from typing import Final, TextIO
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+from pydantic import BaseModel, HttpUrl
+
+from .browser import BrowserPool
+from .fetching import FetchMode
+from .report import PageReport, ScanSummary, ScanSummaryBuilder
+from .schemas import SitePage
+from .services import iter_site_pages
+from .storage import ScanRepository
+from .tracing import collect_timings
+
+# Типы записей NDJSON потока
+RECORD_TYPES: Final[dict[type[BaseModel], str]] = {
+    SitePage: "page",
+    PageReport: "report",
+    ScanSummary: "summary",
+}
+
+
+async def stream_site_scan(
+        url: HttpUrl,
+        fetch_mode: FetchMode | None = None,
+        repository: ScanRepository | None = None,
+        browser_pool: BrowserPool | None = None,
+) -> AsyncIterator[SitePage | ScanSummary]:
+    """Сканирует сайт, отдавая страницы по мере готовности
+    и итоговую сводку с разбивкой времени по этапам последней записью.
+
+    :param url: URL адрес сайта.
+    :param fetch_mode: Режим загрузки страниц, по умолчанию из settings.
+    :param repository: Хранилище, в которое пачками записываются готовые страницы.
+    :param browser_pool: Общий пул браузера, по умолчанию запускается собственный браузер.
+    :return Страница сайта или итоговая сводка.
+    """
+    summary_builder = ScanSummaryBuilder(url)
+    with collect_timings() as breakdown:
+        async for site_page in iter_site_pages(url, fetch_mode, repository, browser_pool):
+            summary_builder.add(site_page)
+            yield site_page
+    yield summary_builder.build(breakdown.to_timings())
+
+
+def to_ndjson_line(record: BaseModel) -> str:
+    """Сериализует запись в строку NDJSON вида {"type": ..., "data": ...}"""
+    data = record.model_dump(mode="json")
+    return json.dumps(
+        {"type": RECORD_TYPES.get(type(record), "record"), "data": data}, ensure_ascii=False
+    ) + "\n"
+
+
+def to_sse_event(record: BaseModel) -> str:
+    """Сериализует запись в событие Server-Sent Events"""
+    data = record.model_dump_json()
+    return f"event: {RECORD_TYPES.get(type(record), "record")}\ndata: {data}\n\n"
+
+
+async def iter_ndjson(records: AsyncIterable[BaseModel]) -> AsyncIterator[str]:
+    """Преобразует поток записей в поток строк NDJSON"""
+    async for record in records:
+        yield to_ndjson_line(record)
+
+
+async def write_ndjson(records: AsyncIterable[BaseModel], file: TextIO) -> int:
+    """Записывает поток записей в файл в формате NDJSON.
+
+    :param records: Асинхронный поток записей.
+    :param file: Текстовый файл для записи.
+    :return Количество записанных записей.
+    """
+    count = 0
+    async for line in iter_ndjson(records):
+        file.write(line)
+        file.flush()
+        count += 1
+    return count
@@ -0,0 +1,199 @@
+"""Трассировка этапов сканирования: спаны, гистограммы длительности и разбивка времени"""
+
+from typing import Any, Final
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext, suppress
+from contextvars import ContextVar
+from functools import cache
+
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt
+
+from .settings import settings
+
+# Имя метрики длительности этапов в формате Prometheus
+STAGE_DURATION_METRIC: Final[str] = "scan_stage_duration_seconds"
+
+
+class StageTiming(BaseModel):
+    """Длительность этапа за время сканирования
+
+    Attributes:
+        count: Количество выполнений этапа.
+        total: Суммарная длительность в секундах.
+        longest: Самое долгое выполнение в секундах.
+    """
+    count: NonNegativeInt
+    total: NonNegativeFloat
+    longest: NonNegativeFloat
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными границами корзин"""
+
+    def __init__(self, buckets: list[float]) -> None:
+        self.buckets = sorted(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Гистограммы длительности этапов всех сканирований процесса"""
+
+    def __init__(self, buckets: list[float]) -> None:
+        self._buckets = buckets
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def render(self) -> str:
+        """Гистограммы в текстовом формате экспозиции Prometheus"""
+        lines = [
+            f"# HELP {STAGE_DURATION_METRIC} Duration of scan stages in seconds.",
+            f"# TYPE {STAGE_DURATION_METRIC} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative_count = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts, strict=True):
+                    cumulative_count += count
+                    lines.append(
+                        f'{STAGE_DURATION_METRIC}_bucket{{stage="{stage}",le="{bound}"}} '
+                        f"{cumulative_count}"
+                    )
+                lines.extend((
+                    f'{STAGE_DURATION_METRIC}_bucket{{stage="{stage}",le="+Inf"}} '
+                    f"{histogram.count}",
+                    f'{STAGE_DURATION_METRIC}_sum{{stage="{stage}"}} {histogram.sum}',
+                    f'{STAGE_DURATION_METRIC}_count{{stage="{stage}"}} {histogram.count}',
+                ))
+        return "\n".join(lines) + "\n"
+
+
+class TimingBreakdown:
+    """Разбивка времени одного сканирования по этапам.
+    Вложенные этапы учитываются и в собственной строке, и во времени внешнего этапа.
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def to_timings(self) -> dict[str, StageTiming]:
+        with self._lock:
+            return {
+                stage: StageTiming(count=int(count), total=total, longest=longest)
+                for stage, (count, total, longest) in self._stages.items()
+            }
+
+
+# Разбивка времени текущего сканирования, потоки asyncio.to_thread получают её копией контекста
+_current_breakdown: ContextVar[TimingBreakdown | None] = ContextVar(
+    "current_breakdown", default=None
+)
+
+
+@cache
+def get_metrics_registry() -> MetricsRegistry:
+    return MetricsRegistry(settings.tracing.buckets)
+
+
+@cache
+def _get_opentelemetry_tracer() -> Any:
+    from opentelemetry import trace  # noqa: PLC0415
+
+    return trace.get_tracer("website_seo_scanner")
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Измеряет длительность этапа, записывая её в гистограмму процесса
+    и в разбивку текущего сканирования.
+
+    Пример использования:
+        with span("tree.sitemap"):
+            tree = build_site_tree(url)
+    """
+    if not settings.tracing.enabled:
+        yield
+        return
+    opentelemetry_span: AbstractContextManager[Any] = (
+        _get_opentelemetry_tracer().start_as_current_span(stage)
+        if settings.tracing.opentelemetry else nullcontext()
+    )
+    started_at = time.perf_counter()
+    try:
+        with opentelemetry_span:
+            yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        get_metrics_registry().observe(stage, elapsed)
+        breakdown = _current_breakdown.get()
+        if breakdown is not None:
+            breakdown.add(stage, elapsed)
+
+
+def traced[**P, R](stage: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Декоратор, оборачивающий вызов функции или корутины в span"""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                with span(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_timings() -> Iterator[TimingBreakdown]:
+    """Собирает разбивку времени по этапам для кода внутри блока"""
+    breakdown = TimingBreakdown()
+    token = _current_breakdown.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        # Асинхронный генератор может быть закрыт в другом контексте
+        with suppress(ValueError):
+            _current_breakdown.reset(token)
+
+
+def render_metrics() -> str:
+    """Метрики процесса в текстовом формате Prometheus"""
+    return get_metrics_registry().render()
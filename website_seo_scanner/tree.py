@@ -9,6 +9,10 @@ from urllib.parse import urlparse
 from pydantic import BaseModel, Field, HttpUrl
 from usp.objects.page import SitemapPage
 from usp.tree import sitemap_tree_for_homepage
+from usp.web_client.abstract_client import AbstractWebClient
+
+from .settings import settings
+from .tracing import traced
 
 PRIORITY_KEYWORDS: tuple[str, ...] = (
     "product",
@@ -54,6 +58,10 @@ class TreeNode(BaseModel):
     url: HttpUrl
     priority: float | None = None
     last_modified: datetime | None = None
+    # Показатели графа внутренних ссылок, None если граф не строился
+    pagerank: float | None = None
+    click_depth: int | None = None
+    inlinks: int | None = None
     children: list[TreeNode] = Field(default_factory=list)
 
     @property
@@ -200,20 +208,30 @@ def add_page_to_tree(
     add_page_to_tree(base_url, node, page, segments, current_depth + 1)
 
 
-def build_site_tree(url: HttpUrl) -> TreeNode:
+def get_root_name(url: HttpUrl) -> str:
+    """Имя корневого узла дерева - адрес сайта без схемы и слэшей"""
+    return (
+        str(url)
+        .replace("http://", "")
+        .replace("https://", "")
+        .replace("/", "")
+    )
+
+
+@traced("tree.sitemap")
+def build_site_tree(url: HttpUrl, web_client: AbstractWebClient | None = None) -> TreeNode:
     """Рекурсивно строит дерево сайта по страницам из sitemap.xml.
+    Sitemap из robots.txt учитываются, если включено соблюдение robots.txt.
 
     :param url: URL адрес сайта.
+    :param web_client: Клиент загрузки sitemap, например SitemapWebClient
+        с ограничениями хоста. По умолчанию клиент ultimate-sitemap-parser.
     :return Построенное дерево структуры сайта.
     """
-    name = (
-        str(url)
-        .replace("http://", "")
-        .replace("https://", "")
-        .replace("/", "")
+    root = TreeNode(name=get_root_name(url), url=url)
+    sitemap = sitemap_tree_for_homepage(
+        str(url), web_client=web_client, use_robots=settings.politeness.respect_robots
     )
-    root = TreeNode(name=name, url=url)
-    sitemap = sitemap_tree_for_homepage(str(url), use_robots=False)
     for page in sitemap.all_pages():
         segments = parse_url_path(page.url)
         add_page_to_tree(url, root, page, segments)
@@ -251,18 +269,25 @@ def _is_denied_url(url: HttpUrl) -> bool:
     )
 
 
-def _get_node_sort_key(node: TreeNode) -> tuple[float, float, float]:
+def _get_node_sort_key(node: TreeNode) -> tuple[float, float, float, float]:
     """Сортировка узлов
      - Высокий приоритет из sitemap.xml (если есть)
+     - Внутренний PageRank (страницы, на которые чаще ссылаются, сначала)
      - Дата изменения (сначала новые)
-     - Глубина узла (малая глубина сначала)
+     - Глубина клика от главной, а без графа ссылок - глубина узла (малая глубина сначала)
     """
     priority_score = node.priority if node.priority is not None else 0.5
+    pagerank_score = node.pagerank or 0
     date_score = node.last_modified.timestamp() if node.last_modified else 0
-    depth_penalty = len(_get_path_segments(node.url)) * 0.01
-    return -priority_score, -date_score, depth_penalty
+    depth = (
+        node.click_depth if node.click_depth is not None
+        else len(_get_path_segments(node.url))
+    )
+    depth_penalty = depth * 0.01
+    return -priority_score, -pagerank_score, -date_score, depth_penalty
 
 
+@traced("tree.page_selection")
 def extract_key_pages(  # noqa: C901
         tree: TreeNode, key_segments: list[str], max_result: int = 15
 ) -> list[HttpUrl]:
@@ -1,17 +1,17 @@
 import logging
 from collections.abc import AsyncIterator
 
-import html_to_markdown
 from bs4 import BeautifulSoup
 from ddgs import DDGS
 from playwright.async_api import Browser, Page
 from pydantic import BaseModel, HttpUrl
 
-from .cleaners import clean
+from .extraction import extract_content
+from .readiness import navigate, wait_until_ready
 from .schemas import PageMeta
+from .settings import ReadinessSettings
 from .stealth import create_new_stealth_context
-
-TIMEOUT = 600
+from .tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -30,58 +30,14 @@ class SearchResult(BaseModel):
         return self.url == other.url
 
 
-async def wait_for_full_page_load(page: Page, timeout: int = TIMEOUT) -> None:
+async def wait_for_full_page_load(page: Page, config: ReadinessSettings | None = None) -> bool:
     """Ожидает полной загрузки страницы.
 
     :param page: Текущая страница.
-    :param timeout: ...
+    :param config: Настройки готовности страницы, по умолчанию из settings.
+    :return True если страница загрузилась до истечения дедлайна.
     """
-    await page.wait_for_load_state("domcontentloaded", timeout=timeout)
-    await page.wait_for_load_state("load", timeout=timeout)
-    # Ожидание появления body и head
-    await page.wait_for_selector("body", state="attached", timeout=timeout)
-    await page.wait_for_selector("head", state="attached", timeout=timeout)
-    # Проверяем наличие элементов через JavaScript
-    await page.wait_for_function("""
-            () => {
-                // Проверяем head
-                const head = document.head;
-                const hasHead = !!head;
-
-                // Проверяем body (даже если скрыт)
-                const body = document.body;
-                const hasBody = !!body;
-
-                // Проверяем базовую структуру
-                const hasHtml = !!document.documentElement;
-                const hasDoctype = !!document.doctype;
-
-                return hasHead && hasBody && hasHtml;
-            }
-        """, timeout=timeout)
-
-    # Дополнительная проверка, что контент загружен
-    await page.wait_for_function("""
-            () => {
-                const body = document.body;
-                if (!body) return false;
-
-                // Проверяем различными способами
-                const checks = [
-                    // Проверяем детей body
-                    body.children.length > 0,
-                    // Проверяем текстовый контент
-                    body.textContent && body.textContent.trim().length > 0,
-                    // Проверяем innerHTML
-                    body.innerHTML && body.innerHTML.trim().length > 0,
-                    // Проверяем готовность DOM
-                    document.readyState === 'complete'
-                ];
-
-                // Достаточно одного true
-                return checks.some(check => check === true);
-            }
-        """, timeout=timeout)
+    return await wait_until_ready(page, config)
 
 
 async def get_current_page(browser: Browser) -> Page:
@@ -100,21 +56,41 @@ async def get_current_page(browser: Browser) -> Page:
     return context.pages[-1]
 
 
+@traced("page.extract_text")
+def extract_text_from_html(html: str) -> str:
+    """Извлекает текст основного контента из body HTML разметки.
+
+    :param html: HTML разметка страницы.
+    :return Текстовый контент страницы.
+    """
+    return extract_content(html).text
+
+
+@traced("page.extract_meta")
+def extract_meta_from_html(html: str) -> PageMeta:
+    """Извлекает мета-данные из HTML разметки страницы.
+
+    :param html: HTML разметка страницы.
+    :return Извлечённые мета-данные страницы.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text().strip() if soup.title is not None else ""
+    description_element = soup.find("meta", attrs={"name": "description"})
+    if description_element is None:
+        return PageMeta(title=title, description="")
+    return PageMeta(title=title, description=description_element.get("content", ""))
+
+
 async def extract_page_text(page: Page) -> str:
-    """Извлекает весь текст с текущей страницы из body.
+    """Извлекает текст основного контента с текущей страницы из body.
 
     :param page: Текущая Playwright страница.
     :return Текстовый контент страницы.
     """
-    content = await page.content()
-    soup = BeautifulSoup(content, "html.parser")
-    body = soup.find("body")
-    if body is None:
-        return ""
-    md_text = html_to_markdown.convert(str(body))
-    return clean(md_text)
+    return extract_text_from_html(await page.content())
 
 
+@traced("page.extract_meta")
 async def extract_page_meta(page: Page) -> PageMeta:
     """Извлекает мета-данные страницы.
 
@@ -152,5 +128,5 @@ async def iter_pages(browser: Browser, urls: list[HttpUrl]) -> AsyncIterator[Pag
     """
     for url in urls:
         page = await get_current_page(browser)
-        await page.goto(str(url))
+        await navigate(page, str(url))
         yield page